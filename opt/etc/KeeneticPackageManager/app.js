@@ -2,8 +2,24 @@
 let currentPath = '/opt';
 let currentFile = null;
 let currentServiceProto = 'tcp';
-let allPackages = [];
+let packageQuery = '';
+let packageInstalledFilter = '';
+let packageOffset = 0;
+let packageTotal = 0;
+let packagesLoaded = false;
+let packageRequestSeq = 0;
+let packageSearchTimer = null;
+let currentJobId = null;
+let selectedPackages = new Map();  // paket adı -> yüklü mü
+let currentJobSource = null;
+let metricsSource = null;
+let historyMetric = 'cpu';
+let historyRange = 3600;
+let metricsPollTimer = null;
 let allProcesses = [];
+let processSort = 'cpu';
+let conntrackProto = '';
+let conntrackOffset = 0;
 let contextMenuItem = null;
 let selectedFiles = new Set();
 let clipboardHasItems = false;
@@ -22,6 +38,7 @@ document.querySelectorAll('.tab').forEach(tab => {
         // Tab değişince ilgili veriyi yükle
         if (tabName === 'dashboard') {
             loadDashboard();
+            loadHistory();
         } else if (tabName === 'network') {
             loadNetworkInterfaces();
         } else if (tabName === 'storage') {
@@ -31,8 +48,11 @@ document.querySelectorAll('.tab').forEach(tab => {
             loadProcesses();
         } else if (tabName === 'services') {
             loadServices();
-        } else if (tabName === 'packages' && allPackages.length === 0) {
-            loadPackages();
+        } else if (tabName === 'conntrack') {
+            loadConntrack();
+        } else if (tabName === 'packages') {
+            loadFeedInfo();
+            if (!packagesLoaded) loadPackages();
         } else if (tabName === 'files') {
             loadFiles(currentPath);
         }
@@ -50,164 +70,344 @@ function showNotification(message, type = 'success') {
     }, 3000);
 }
 
-// Stats güncelleme
+// Sütunlu (format=columnar) liste cevabını nesne dizisine çevir
+function fromColumnar(payload) {
+    if (Array.isArray(payload)) return payload;
+    
+    const {fields, columns, dictionaries, count} = payload;
+    const items = new Array(count);
+    
+    for (let i = 0; i < count; i++) {
+        const item = {};
+        for (const field of fields) {
+            const value = columns[field][i];
+            item[field] = dictionaries[field] ? dictionaries[field][value] : value;
+        }
+        items[i] = item;
+    }
+    
+    return items;
+}
+
+// Stats güncelleme (tek istekte CPU, RAM, uptime, load)
 async function updateStats() {
     try {
-        const response = await fetch('/api/stats');
+        const response = await fetch('/api/dashboard?fields=cpu,mem,uptime,load');
         const data = await response.json();
         
         if (data.success) {
-            document.getElementById('cpuValue').textContent = `${data.cpu}%`;
-            document.getElementById('ramValue').textContent = 
-                `${data.memory.used} / ${data.memory.total} MB`;
+            renderStats(data);
         }
     } catch (error) {
         console.error('Stats hatası:', error);
     }
+}
+
+// Üst bardaki istatistikleri yaz
+function renderStats(data) {
+    const cpuValue = document.getElementById('cpuValue');
+    cpuValue.textContent = `${data.cpu.usage}%`;
+    cpuValue.title = [`iowait: ${data.cpu.iowait}%`]
+        .concat(data.cpu.cores.map(c => `${c.name}: ${c.usage}%`))
+        .join('\n');
+    document.getElementById('ramValue').textContent = 
+        `${data.mem.used} / ${data.mem.total} MB`;
+    document.getElementById('uptimeValue').textContent = data.uptime.uptime || '--';
+    document.getElementById('loadValue').textContent = data.load.load.slice(0,2).join(', ');
+}
+
+// Canlı metrikler: sunucu örnekleri SSE ile gönderir, sekme gizliyken bağlantı kapanır
+function startMetricsStream() {
+    if (!window.EventSource) {
+        // Eski tarayıcılar için yoklamaya geri dön
+        if (!metricsPollTimer) metricsPollTimer = setInterval(updateStats, 2000);
+        return;
+    }
+    if (metricsSource) return;
     
-    // Sistem bilgisi
-    try {
-        const response = await fetch('/api/system/info');
-        const data = await response.json();
-        
-        if (data.success) {
-            document.getElementById('uptimeValue').textContent = data.info.uptime || '--';
-            document.getElementById('loadValue').textContent = 
-                data.info.load ? data.info.load.slice(0,2).join(', ') : '--';
-        }
-    } catch (error) {
-        console.error('System info hatası:', error);
+    metricsSource = new EventSource('/api/stream/metrics?interval=2');
+    metricsSource.addEventListener('metrics', (e) => {
+        renderStats(JSON.parse(e.data));
+    });
+}
+
+function stopMetricsStream() {
+    if (metricsSource) {
+        metricsSource.close();
+        metricsSource = null;
+    }
+    if (metricsPollTimer) {
+        clearInterval(metricsPollTimer);
+        metricsPollTimer = null;
     }
 }
 
+document.addEventListener('visibilitychange', () => {
+    if (document.hidden) {
+        stopMetricsStream();
+    } else {
+        startMetricsStream();
+    }
+});
+
 // Dashboard yükle
 async function loadDashboard() {
-    // Sistem bilgisi
+    let data;
     try {
-        const response = await fetch('/api/system/info');
-        const data = await response.json();
-        
-        if (data.success) {
-            const info = data.info;
-            document.getElementById('systemInfo').innerHTML = `
-                <div class="info-item">
-                    <span class="info-label">Hostname</span>
-                    <span class="info-value">${info.hostname}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Kernel</span>
-                    <span class="info-value">${info.kernel}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Uptime</span>
-                    <span class="info-value">${info.uptime}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Load Avg</span>
-                    <span class="info-value">${info.load.join(' / ')}</span>
-                </div>
-            `;
-        }
+        const response = await fetch('/api/dashboard?fields=system,uptime,load,mem,interfaces,wireless');
+        data = await response.json();
+        if (!data.success) throw new Error(data.error);
     } catch (error) {
-        document.getElementById('systemInfo').innerHTML = '<div>Yüklenemedi</div>';
+        ['systemInfo', 'memoryInfo', 'networkStatus', 'wifiStatus'].forEach(id => {
+            document.getElementById(id).innerHTML = '<div>Yüklenemedi</div>';
+        });
+        return;
     }
     
+    // Sistem bilgisi
+    document.getElementById('systemInfo').innerHTML = `
+        <div class="info-item">
+            <span class="info-label">Hostname</span>
+            <span class="info-value">${data.system.hostname}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Kernel</span>
+            <span class="info-value">${data.system.kernel}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Uptime</span>
+            <span class="info-value">${data.uptime.uptime}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Load Avg</span>
+            <span class="info-value">${data.load.load.join(' / ')}</span>
+        </div>
+    `;
+    
     // Bellek bilgisi
-    try {
-        const response = await fetch('/api/stats');
-        const data = await response.json();
-        
-        if (data.success) {
-            const mem = data.memory;
-            document.getElementById('memoryInfo').innerHTML = `
-                <div class="info-item">
-                    <span class="info-label">Toplam</span>
-                    <span class="info-value">${mem.total} MB</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Kullanılan</span>
-                    <span class="info-value">${mem.used} MB</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Boş</span>
-                    <span class="info-value">${(mem.total - mem.used).toFixed(1)} MB</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Kullanım</span>
-                    <span class="info-value">${mem.percent}%</span>
-                </div>
-            `;
-        }
-    } catch (error) {
-        document.getElementById('memoryInfo').innerHTML = '<div>Yüklenemedi</div>';
-    }
+    const mem = data.mem;
+    document.getElementById('memoryInfo').innerHTML = `
+        <div class="info-item">
+            <span class="info-label">Toplam</span>
+            <span class="info-value">${mem.total} MB</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Kullanılan</span>
+            <span class="info-value">${mem.used} MB</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Boş</span>
+            <span class="info-value">${(mem.total - mem.used).toFixed(1)} MB</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Kullanım</span>
+            <span class="info-value">${mem.percent}%</span>
+        </div>
+    `;
     
     // Ağ durumu
+    const net = data.interfaces;
+    const upInterfaces = net.interfaces.filter(i => i.state === 'UP');
+    document.getElementById('networkStatus').innerHTML = `
+        <div class="info-item">
+            <span class="info-label">Aktif Arayüz</span>
+            <span class="info-value">${net.up}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Toplam Arayüz</span>
+            <span class="info-value">${net.total}</span>
+        </div>
+        ${upInterfaces.slice(0, 2).map(i => `
+            <div class="info-item">
+                <span class="info-label">${i.name}</span>
+                <span class="info-value">${i.ipv4[0] || 'IP yok'}</span>
+            </div>
+        `).join('')}
+    `;
+    
+    // WiFi durumu
+    if (data.wireless.length > 0) {
+        const wlan = data.wireless[0];
+        document.getElementById('wifiStatus').innerHTML = `
+            <div class="info-item">
+                <span class="info-label">Arayüz</span>
+                <span class="info-value">${wlan.interface}</span>
+            </div>
+            <div class="info-item">
+                <span class="info-label">SSID</span>
+                <span class="info-value">${wlan.ssid || 'Bağlı değil'}</span>
+            </div>
+            <div class="info-item">
+                <span class="info-label">Frekans</span>
+                <span class="info-value">${wlan.frequency || '--'}</span>
+            </div>
+            <div class="info-item">
+                <span class="info-label">Sinyal</span>
+                <span class="info-value">${wlan.signal || '--'}</span>
+            </div>
+            ${wlan.stations !== null && wlan.stations !== undefined ? `
+            <div class="info-item">
+                <span class="info-label">İstemci</span>
+                <span class="info-value">${wlan.stations}</span>
+            </div>
+            ` : ''}
+        `;
+    } else {
+        document.getElementById('wifiStatus').innerHTML = '<div class="info-item"><span>WiFi arayüzü bulunamadı</span></div>';
+    }
+}
+
+// Metrik geçmişi (min/max bandı ve ortalama çizgisi)
+document.querySelectorAll('#historyMetric .filter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        document.querySelectorAll('#historyMetric .filter-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        historyMetric = btn.dataset.metric;
+        loadHistory();
+    });
+});
+
+document.querySelectorAll('#historyRange .filter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        document.querySelectorAll('#historyRange .filter-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        historyRange = parseInt(btn.dataset.range);
+        loadHistory();
+    });
+});
+
+function formatHistoryValue(metric, value) {
+    if (value === null) return '--';
+    if (metric === 'rx' || metric === 'tx') return formatSize(Math.round(value)) + '/s';
+    if (metric === 'load') return value.toFixed(2);
+    return value.toFixed(1) + '%';
+}
+
+async function loadHistory() {
+    const to = Date.now() / 1000;
+    
     try {
-        const response = await fetch('/api/network/interfaces');
+        const response = await fetch(`/api/history?metric=${historyMetric}&from=${to - historyRange}&to=${to}`);
         const data = await response.json();
         
         if (data.success) {
-            const upInterfaces = data.interfaces.filter(i => i.state === 'UP');
-            document.getElementById('networkStatus').innerHTML = `
-                <div class="info-item">
-                    <span class="info-label">Aktif Arayüz</span>
-                    <span class="info-value">${upInterfaces.length}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Toplam Arayüz</span>
-                    <span class="info-value">${data.interfaces.length}</span>
-                </div>
-                ${upInterfaces.slice(0, 2).map(i => `
-                    <div class="info-item">
-                        <span class="info-label">${i.name}</span>
-                        <span class="info-value">${i.ipv4[0] || 'IP yok'}</span>
-                    </div>
-                `).join('')}
-            `;
+            drawHistoryChart(data.points, historyMetric);
         }
     } catch (error) {
-        document.getElementById('networkStatus').innerHTML = '<div>Yüklenemedi</div>';
+        console.error('Geçmiş hatası:', error);
     }
+}
+
+function drawHistoryChart(points, metric) {
+    const canvas = document.getElementById('historyChart');
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    canvas.width = width;
+    canvas.height = height;
     
-    // WiFi durumu
-    try {
-        const response = await fetch('/api/network/wireless');
-        const data = await response.json();
-        
-        if (data.success && data.wireless.length > 0) {
-            const wlan = data.wireless[0];
-            document.getElementById('wifiStatus').innerHTML = `
-                <div class="info-item">
-                    <span class="info-label">Arayüz</span>
-                    <span class="info-value">${wlan.interface}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">SSID</span>
-                    <span class="info-value">${wlan.ssid || 'Bağlı değil'}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Frekans</span>
-                    <span class="info-value">${wlan.frequency || '--'}</span>
-                </div>
-                <div class="info-item">
-                    <span class="info-label">Sinyal</span>
-                    <span class="info-value">${wlan.signal || '--'}</span>
-                </div>
-            `;
+    const ctx = canvas.getContext('2d');
+    ctx.clearRect(0, 0, width, height);
+    
+    const values = points.filter(p => p[2] !== null);
+    const legend = document.getElementById('historyLegend');
+    if (values.length === 0) {
+        legend.textContent = 'Bu aralık için veri yok';
+        return;
+    }
+    
+    const maxValue = Math.max(...values.map(p => p[3]), metric === 'cpu' || metric === 'mem' ? 100 : 0) || 1;
+    const x = i => points.length > 1 ? i * width / (points.length - 1) : width / 2;
+    const y = v => height - (v / maxValue) * (height - 4) - 2;
+    
+    // Boşlukları bölerek çiz
+    const segments = [];
+    let segment = [];
+    points.forEach((p, i) => {
+        if (p[2] === null) {
+            if (segment.length) segments.push(segment);
+            segment = [];
         } else {
-            document.getElementById('wifiStatus').innerHTML = '<div class="info-item"><span>WiFi arayüzü bulunamadı</span></div>';
+            segment.push([i, p]);
         }
-    } catch (error) {
-        document.getElementById('wifiStatus').innerHTML = '<div>Yüklenemedi</div>';
-    }
+    });
+    if (segment.length) segments.push(segment);
+    
+    segments.forEach(seg => {
+        ctx.fillStyle = 'rgba(74, 95, 193, 0.15)';
+        ctx.beginPath();
+        seg.forEach(([i, p], n) => n ? ctx.lineTo(x(i), y(p[3])) : ctx.moveTo(x(i), y(p[3])));
+        seg.slice().reverse().forEach(([i, p]) => ctx.lineTo(x(i), y(p[1])));
+        ctx.closePath();
+        ctx.fill();
+        
+        ctx.strokeStyle = '#4a5fc1';
+        ctx.lineWidth = 1.5;
+        ctx.beginPath();
+        seg.forEach(([i, p], n) => n ? ctx.lineTo(x(i), y(p[2])) : ctx.moveTo(x(i), y(p[2])));
+        ctx.stroke();
+    });
+    
+    const avg = values.reduce((sum, p) => sum + p[2], 0) / values.length;
+    legend.textContent = `Ortalama: ${formatHistoryValue(metric, avg)} · ` +
+        `En yüksek: ${formatHistoryValue(metric, Math.max(...values.map(p => p[3])))} · ` +
+        `En düşük: ${formatHistoryValue(metric, Math.min(...values.map(p => p[1])))}`;
+}
+
+// Arayüz hızları, hata ve düşen paket sayıları
+function renderBandwidthItems(bw) {
+    if (!bw) return '';
+    
+    const rate = value => value === null ? '--' : formatSize(Math.round(value)) + '/s';
+    return `
+        <div class="info-item">
+            <span class="info-label">RX / TX</span>
+            <span class="info-value">${rate(bw.rx_rate)} / ${rate(bw.tx_rate)}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Paket/sn</span>
+            <span class="info-value">${bw.rx_pps ?? '--'} / ${bw.tx_pps ?? '--'}</span>
+        </div>
+        <div class="info-item">
+            <span class="info-label">Hata / Düşen</span>
+            <span class="info-value">${bw.rx_errors + bw.tx_errors} / ${bw.rx_dropped + bw.tx_dropped}</span>
+        </div>
+    `;
+}
+
+// RX (mavi) ve TX (yeşil) hız grafiği
+function drawSparkline(canvas, history) {
+    const width = canvas.clientWidth;
+    const height = canvas.clientHeight;
+    canvas.width = width;
+    canvas.height = height;
+    if (!history || history.length < 2) return;
+    
+    const ctx = canvas.getContext('2d');
+    const maxValue = Math.max(...history.map(h => Math.max(h[1], h[2]))) || 1;
+    
+    [[1, '#4a5fc1'], [2, '#10b981']].forEach(([index, color]) => {
+        ctx.strokeStyle = color;
+        ctx.lineWidth = 1.5;
+        ctx.beginPath();
+        history.forEach((h, i) => {
+            const x = i * width / (history.length - 1);
+            const y = height - (h[index] / maxValue) * (height - 2) - 1;
+            i ? ctx.lineTo(x, y) : ctx.moveTo(x, y);
+        });
+        ctx.stroke();
+    });
 }
 
 // Ağ arayüzleri yükle
 async function loadNetworkInterfaces() {
     try {
-        const response = await fetch('/api/network/interfaces');
+        const [response, bwResponse] = await Promise.all([
+            fetch('/api/network/interfaces'),
+            fetch('/api/bandwidth?history=30')
+        ]);
         const data = await response.json();
+        const bwData = await bwResponse.json();
+        const bandwidth = bwData.success ? bwData.interfaces : {};
         
         if (data.success) {
             const container = document.getElementById('networkInterfaces');
@@ -232,6 +432,12 @@ async function loadNetworkInterfaces() {
                             <span class="info-value">${iface.mac}</span>
                         </div>
                         ` : ''}
+                        ${iface.mtu ? `
+                        <div class="info-item">
+                            <span class="info-label">MTU${iface.speed ? ' / Hız' : ''}</span>
+                            <span class="info-value">${iface.mtu}${iface.speed ? ` / ${iface.speed} Mbit/s` : ''}</span>
+                        </div>
+                        ` : ''}
                         ${iface.ipv4.length > 0 ? `
                         <div class="info-item">
                             <span class="info-label">IPv4</span>
@@ -244,9 +450,15 @@ async function loadNetworkInterfaces() {
                             <span class="info-value">${iface.ipv6.join(', ')}</span>
                         </div>
                         ` : ''}
+                        ${renderBandwidthItems(bandwidth[iface.name])}
                     </div>
+                    ${bandwidth[iface.name] ? `<canvas class="bandwidth-sparkline" data-iface="${iface.name}" height="40"></canvas>` : ''}
                 </div>
             `).join('');
+            
+            container.querySelectorAll('.bandwidth-sparkline').forEach(canvas => {
+                drawSparkline(canvas, bandwidth[canvas.dataset.iface].history);
+            });
         }
     } catch (error) {
         document.getElementById('networkInterfaces').innerHTML = 
@@ -285,42 +497,43 @@ async function loadStorage() {
             const tbody = document.querySelector('#storageTable tbody');
             
             if (data.storage.length === 0) {
-                tbody.innerHTML = '<tr><td colspan="6">Depolama bilgisi bulunamadı</td></tr>';
+                tbody.innerHTML = '<tr><td colspan="7">Depolama bilgisi bulunamadı</td></tr>';
                 return;
             }
             
             tbody.innerHTML = data.storage.map(s => `
                 <tr>
-                    <td>${s.filesystem}</td>
-                    <td>${s.size}</td>
-                    <td>${s.used}</td>
-                    <td>${s.available}</td>
+                    <td>${s.filesystem} <small>(${s.type})</small></td>
+                    <td>${formatSize(s.size)}</td>
+                    <td>${formatSize(s.used)}</td>
+                    <td>${formatSize(s.available)}</td>
                     <td>
-                        <div>${s.use_percent}</div>
+                        <div>${s.use_percent}%</div>
                         <div class="storage-bar">
-                            <div class="storage-bar-fill" style="width: ${s.use_percent}"></div>
+                            <div class="storage-bar-fill" style="width: ${s.use_percent}%"></div>
                         </div>
                     </td>
+                    <td>${s.inodes ? `${s.inodes_used} / ${s.inodes}` : '--'}</td>
                     <td>${s.mounted_on}</td>
                 </tr>
             `).join('');
         }
     } catch (error) {
         document.querySelector('#storageTable tbody').innerHTML = 
-            '<tr><td colspan="6">Yüklenemedi</td></tr>';
+            '<tr><td colspan="7">Yüklenemedi</td></tr>';
     }
 }
 
 // İşlemleri yükle
 async function loadProcesses() {
     try {
-        const response = await fetch('/api/processes');
+        const response = await fetch(`/api/processes?format=columnar&sort=${processSort}`);
         const data = await response.json();
         
         console.log('Processes API response:', data);
         
         if (data.success) {
-            allProcesses = data.processes;
+            allProcesses = fromColumnar(data.processes);
             console.log('Total processes:', allProcesses.length);
             renderProcesses(allProcesses);
         } else {
@@ -358,8 +571,8 @@ function renderProcesses(processes) {
             <tr>
                 <td>${p.pid || '-'}</td>
                 <td>${p.user || '-'}</td>
-                <td>${p.cpu || '0.0'}%</td>
-                <td>${p.mem || '0.0'}%</td>
+                <td>${p.cpu.toFixed(1)}%</td>
+                <td title="RSS: ${formatSize(p.rss * 1024)}">${p.mem.toFixed(1)}%</td>
                 <td style="max-width:300px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;" title="${escapedCommand}">${escapedCommand}</td>
                 <td><button class="btn btn-sm btn-remove" onclick="killProcess('${p.pid}')">Kill</button></td>
             </tr>
@@ -374,12 +587,23 @@ document.getElementById('processSearch').addEventListener('input', (e) => {
     const search = e.target.value.toLowerCase();
     const filtered = allProcesses.filter(p => 
         p.command.toLowerCase().includes(search) || 
-        p.pid.includes(search) ||
+        String(p.pid).includes(search) ||
         p.user.toLowerCase().includes(search)
     );
     renderProcesses(filtered);
 });
 
+// Process sıralama (sunucu tarafında)
+document.querySelectorAll('#processSort .filter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        document.querySelectorAll('#processSort .filter-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        processSort = btn.dataset.sort;
+        document.getElementById('processSearch').value = '';
+        loadProcesses();
+    });
+});
+
 // Process kill
 async function killProcess(pid) {
     if (!confirm(`PID ${pid} sonlandırılacak. Emin misiniz?`)) return;
@@ -438,26 +662,141 @@ function renderServices(services) {
 }
 
 // Servis filtre
-document.querySelectorAll('.filter-btn').forEach(btn => {
+document.querySelectorAll('.service-filter .filter-btn[data-proto]').forEach(btn => {
     btn.addEventListener('click', () => {
         currentServiceProto = btn.dataset.proto;
         
-        document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+        document.querySelectorAll('.filter-btn[data-proto]').forEach(b => b.classList.remove('active'));
         btn.classList.add('active');
         
         loadServices();
     });
 });
 
-// Paketleri yükle
-async function loadPackages() {
+// Bağlantı izleme tablosu (özetler ve sayfalama sunucuda)
+const CONNTRACK_PAGE_SIZE = 100;
+
+async function loadConntrack(append = false) {
+    const offset = append ? conntrackOffset : 0;
+    const params = new URLSearchParams({offset: offset, limit: CONNTRACK_PAGE_SIZE});
+    if (conntrackProto) params.set('proto', conntrackProto);
+    
+    try {
+        const response = await fetch(`/api/conntrack?${params}`);
+        const data = await response.json();
+        
+        if (!data.success) {
+            document.getElementById('conntrackSummary').innerHTML = `<div class="loading">${data.error}</div>`;
+            return;
+        }
+        
+        conntrackOffset = offset + data.rows.length;
+        renderConntrackSummary(data);
+        renderConntrackRows(data.rows, append);
+        
+        document.getElementById('conntrackMore').innerHTML = conntrackOffset < data.matched ? `
+            <button class="btn btn-secondary btn-sm" onclick="loadConntrack(true)">
+                Daha fazla göster (${conntrackOffset} / ${data.matched})
+            </button>
+        ` : '';
+    } catch (error) {
+        document.getElementById('conntrackSummary').innerHTML = '<div class="loading">Yüklenemedi</div>';
+    }
+}
+
+function renderTopList(items) {
+    if (items.length === 0) return '<div class="info-item"><span>Veri yok</span></div>';
+    return items.map(item => `
+        <div class="info-item">
+            <span class="info-label">${item.key}</span>
+            <span class="info-value">${item.error ? '~' : ''}${item.count}</span>
+        </div>
+    `).join('');
+}
+
+function renderConntrackSummary(data) {
+    const states = Object.entries(data.states).sort((a, b) => b[1] - a[1]);
+    document.getElementById('conntrackSummary').innerHTML = `
+        <div class="info-item">
+            <span class="info-label">Toplam</span>
+            <span class="info-value">${data.total}${data.max ? ` / ${data.max}` : ''}</span>
+        </div>
+        ${states.map(([state, count]) => `
+            <div class="info-item">
+                <span class="info-label">${state}</span>
+                <span class="info-value">${count}</span>
+            </div>
+        `).join('')}
+    `;
+    document.getElementById('conntrackTopSrc').innerHTML = renderTopList(data.top.src);
+    document.getElementById('conntrackTopDst').innerHTML = renderTopList(data.top.dst);
+    document.getElementById('conntrackTopPort').innerHTML = renderTopList(data.top.dport);
+}
+
+function renderConntrackRows(rows, append) {
+    const tbody = document.querySelector('#conntrackTable tbody');
+    const endpoint = (addr, port) => port !== null ? `${addr}:${port}` : addr;
+    const html = rows.map(c => `
+        <tr>
+            <td>${c.proto}</td>
+            <td>${c.state || '-'}</td>
+            <td>${endpoint(c.src, c.sport)}</td>
+            <td>${endpoint(c.dst, c.dport)}</td>
+            <td>${c.bytes !== null ? formatSize(c.bytes) : '--'}</td>
+            <td>${c.timeout}</td>
+        </tr>
+    `).join('');
+    
+    if (append) {
+        tbody.insertAdjacentHTML('beforeend', html);
+    } else {
+        tbody.innerHTML = html || '<tr><td colspan="6">Bağlantı yok</td></tr>';
+    }
+}
+
+document.querySelectorAll('#conntrackProto .filter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        document.querySelectorAll('#conntrackProto .filter-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        conntrackProto = btn.dataset.proto;
+        loadConntrack();
+    });
+});
+
+// Paketleri yükle (arama, filtre ve sayfalama sunucuda yapılır)
+const PACKAGE_PAGE_SIZE = 100;
+
+async function loadPackages(append = false) {
+    if (packageInstalledFilter === 'upgradable') {
+        return loadUpgradablePackages();
+    }
+    
+    const seq = ++packageRequestSeq;
+    const offset = append ? packageOffset : 0;
+    const params = new URLSearchParams({
+        q: packageQuery,
+        offset: offset,
+        limit: PACKAGE_PAGE_SIZE,
+        format: 'columnar'
+    });
+    
+    if (packageInstalledFilter) {
+        params.set('installed', packageInstalledFilter);
+    }
+    
     try {
-        const response = await fetch('/api/packages');
+        const response = await fetch(`/api/packages?${params}`);
         const data = await response.json();
         
+        // Daha yeni bir arama başladıysa eski cevabı yok say
+        if (seq !== packageRequestSeq) return;
+        
         if (data.success) {
-            allPackages = data.packages;
-            renderPackages(allPackages);
+            const packages = fromColumnar(data.packages);
+            packagesLoaded = true;
+            packageOffset = offset + packages.length;
+            packageTotal = data.total;
+            renderPackages(packages, append);
         }
     } catch (error) {
         document.getElementById('packageList').innerHTML = 
@@ -465,16 +804,18 @@ async function loadPackages() {
     }
 }
 
-function renderPackages(packages) {
+function renderPackages(packages, append = false) {
     const list = document.getElementById('packageList');
     
-    if (packages.length === 0) {
+    if (!append && packages.length === 0) {
         list.innerHTML = '<div class="loading">Paket bulunamadı</div>';
         return;
     }
     
-    list.innerHTML = packages.map(pkg => `
+    const html = packages.map(pkg => `
         <div class="package-item">
+            <input type="checkbox" style="margin-right:12px;" ${selectedPackages.has(pkg.name) ? 'checked' : ''}
+                   onchange="togglePackageSelection('${pkg.name}', ${pkg.installed}, this.checked)">
             <div class="package-info">
                 <div class="package-name">${pkg.name}</div>
                 <div class="package-version">${pkg.version}</div>
@@ -486,60 +827,298 @@ function renderPackages(packages) {
             }
         </div>
     `).join('');
+    
+    const moreButton = document.getElementById('packageMoreBtn');
+    if (moreButton) moreButton.parentElement.remove();
+    
+    if (append) {
+        list.insertAdjacentHTML('beforeend', html);
+    } else {
+        list.innerHTML = html;
+        list.scrollTop = 0;
+    }
+    
+    if (packageOffset < packageTotal) {
+        list.insertAdjacentHTML('beforeend', `
+            <div class="package-item" style="justify-content:center;">
+                <button class="btn btn-secondary btn-sm" id="packageMoreBtn" onclick="loadPackages(true)">
+                    Daha fazla göster (${packageOffset} / ${packageTotal})
+                </button>
+            </div>
+        `);
+    }
+}
+
+// Süreyi okunabilir hale getir (saniye -> "3 saat")
+function formatAge(seconds) {
+    if (seconds < 60) return `${seconds} sn`;
+    if (seconds < 3600) return `${Math.floor(seconds / 60)} dk`;
+    if (seconds < 86400) return `${Math.floor(seconds / 3600)} saat`;
+    return `${Math.floor(seconds / 86400)} gün`;
 }
 
-// Paket ara
+// Feed yaşı ve otomatik güncelleme durumu
+async function loadFeedInfo() {
+    try {
+        const response = await fetch('/api/packages/feeds');
+        const data = await response.json();
+        
+        if (data.success) {
+            const feeds = data.feeds;
+            let text = feeds.age !== null
+                ? `Feed'ler ${formatAge(feeds.age)} önce güncellendi (${feeds.feeds.length} feed)`
+                : 'Feed listesi yok, güncelleme gerekli';
+            
+            text += feeds.interval > 0
+                ? ` · Otomatik güncelleme: her ${formatAge(feeds.interval)}`
+                : ' · Otomatik güncelleme kapalı';
+            
+            if (feeds.refreshing) text += ' · Güncelleniyor...';
+            
+            document.getElementById('feedInfo').textContent = text;
+            document.getElementById('feedRefreshBtn').disabled = feeds.refreshing;
+        }
+    } catch (error) {
+        document.getElementById('feedInfo').textContent = 'Feed bilgisi alınamadı';
+    }
+}
+
+// Feed'leri şimdi güncelle (opkg update)
+async function refreshFeeds() {
+    try {
+        const response = await fetch('/api/packages/feeds/refresh', {method: 'POST'});
+        const data = await response.json();
+        
+        if (!data.success) {
+            showNotification('Hata: ' + data.error, 'error');
+            return;
+        }
+        
+        document.getElementById('feedRefreshBtn').disabled = true;
+        watchJob(data.job_id, 'Feed güncelleme (opkg update)', (job) => {
+            if (job.state === 'done') {
+                showNotification('Feed\'ler güncellendi', 'success');
+            } else {
+                showNotification('Feed güncelleme başarısız', 'error');
+            }
+            loadFeedInfo();
+            loadPackages();
+        });
+    } catch (error) {
+        showNotification('Hata: ' + error.message, 'error');
+    }
+}
+
+// Güncellenebilir paketler (liste küçük olduğu için arama burada yapılır)
+async function loadUpgradablePackages() {
+    const seq = ++packageRequestSeq;
+    
+    try {
+        const response = await fetch('/api/packages/upgradable');
+        const data = await response.json();
+        
+        if (seq !== packageRequestSeq) return;
+        
+        if (data.success) {
+            const query = packageQuery.toLowerCase();
+            const packages = data.packages.filter(pkg => pkg.name.toLowerCase().includes(query));
+            const list = document.getElementById('packageList');
+            
+            if (packages.length === 0) {
+                list.innerHTML = '<div class="loading">Tüm paketler güncel</div>';
+                return;
+            }
+            
+            list.innerHTML = `
+                <div class="package-item" style="justify-content:center;">
+                    <button class="btn btn-install" onclick="upgradePackages([])">Tümünü Güncelle (${data.count})</button>
+                </div>
+            ` + packages.map(pkg => `
+                <div class="package-item">
+                    <div class="package-info">
+                        <div class="package-name">${pkg.name}</div>
+                        <div class="package-version">${pkg.installed_version} → ${pkg.version}</div>
+                        ${pkg.description ? `<div class="package-desc">${pkg.description}</div>` : ''}
+                    </div>
+                    <button class="btn btn-install" onclick="upgradePackages(['${pkg.name}'])">Güncelle</button>
+                </div>
+            `).join('');
+        }
+    } catch (error) {
+        document.getElementById('packageList').innerHTML = 
+            '<div class="loading">Güncellemeler yüklenemedi</div>';
+    }
+}
+
+// Paketleri güncelle (boş liste = tüm güncellenebilir paketler, tek opkg çağrısı)
+async function upgradePackages(names) {
+    const label = names.length ? names.join(', ') : 'tüm güncellenebilir paketler';
+    if (!confirm(`${label} güncellenecek. Emin misiniz?`)) return;
+    
+    try {
+        const response = await fetch('/api/packages/upgrade', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({packages: names})
+        });
+        
+        const data = await response.json();
+        
+        if (!data.success) {
+            showNotification('Hata: ' + data.error, 'error');
+            return;
+        }
+        
+        watchJob(data.job_id, `Güncelleme (${data.job.packages.length} paket)`, (job) => {
+            const failed = (job.results || []).filter(r => !r.success).map(r => r.package);
+            
+            if (job.state === 'done' && failed.length === 0) {
+                showNotification('Paketler güncellendi', 'success');
+            } else {
+                showNotification('Güncellenemeyen: ' + (failed.join(', ') || 'opkg hatası'), 'error');
+            }
+            loadPackages();
+        });
+    } catch (error) {
+        showNotification('Hata: ' + error.message, 'error');
+    }
+}
+
+// Paket ara (yazarken kısa bir gecikmeyle sunucuya sorulur)
 document.getElementById('packageSearch').addEventListener('input', (e) => {
-    const search = e.target.value.toLowerCase();
-    const filtered = allPackages.filter(pkg => 
-        pkg.name.toLowerCase().includes(search) || 
-        (pkg.description && pkg.description.toLowerCase().includes(search))
-    );
-    renderPackages(filtered);
+    clearTimeout(packageSearchTimer);
+    packageSearchTimer = setTimeout(() => {
+        packageQuery = e.target.value.trim();
+        loadPackages();
+    }, 250);
 });
 
-// Paket yükle
-async function installPackage(packageName) {
-    if (!confirm(`${packageName} paketini yüklemek istediğinizden emin misiniz?`)) return;
+// Yüklü / yüklü değil filtresi
+document.querySelectorAll('#packageFilter .filter-btn').forEach(btn => {
+    btn.addEventListener('click', () => {
+        packageInstalledFilter = btn.dataset.installed;
+        
+        document.querySelectorAll('#packageFilter .filter-btn').forEach(b => b.classList.remove('active'));
+        btn.classList.add('active');
+        
+        loadPackages();
+    });
+});
+
+// Toplu işlem için paket seçimi
+function togglePackageSelection(name, installed, checked) {
+    if (checked) {
+        selectedPackages.set(name, installed);
+    } else {
+        selectedPackages.delete(name);
+    }
     
-    const btn = event.target;
-    btn.disabled = true;
-    btn.textContent = 'Yükleniyor...';
+    const btn = document.getElementById('packageBatchBtn');
+    btn.disabled = selectedPackages.size === 0;
+    btn.textContent = selectedPackages.size > 0
+        ? `Seçilenleri Uygula (${selectedPackages.size})`
+        : 'Seçilenleri Uygula';
+}
+
+// Seçilen paketler tek işte: yüklü olanlar kaldırılır, olmayanlar yüklenir
+async function applyPackageBatch() {
+    const install = [];
+    const remove = [];
+    
+    selectedPackages.forEach((installed, name) => {
+        (installed ? remove : install).push(name);
+    });
+    
+    let message = '';
+    if (install.length) message += `Yüklenecek: ${install.join(', ')}\n`;
+    if (remove.length) message += `Kaldırılacak: ${remove.join(', ')}\n`;
+    if (!confirm(message + '\nDevam edilsin mi?')) return;
     
     try {
-        const response = await fetch('/api/packages/install', {
+        const response = await fetch('/api/packages/batch', {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({package: packageName})
+            body: JSON.stringify({install: install, remove: remove})
         });
         
         const data = await response.json();
         
-        if (data.success) {
-            showNotification('Paket başarıyla yüklendi', 'success');
-            loadPackages();
-        } else {
-            showNotification('Yükleme başarısız: ' + (data.error || data.output), 'error');
-            btn.disabled = false;
-            btn.textContent = 'Yükle';
+        if (!data.success) {
+            showNotification('Hata: ' + data.error, 'error');
+            return;
         }
+        
+        selectedPackages.clear();
+        togglePackageSelection('', false, false);
+        
+        watchJob(data.job_id, `Toplu işlem (${install.length + remove.length} paket)`, (job) => {
+            const failed = (job.results || []).filter(r => !r.success).map(r => r.package);
+            
+            if (job.state === 'done' && failed.length === 0) {
+                showNotification('Toplu işlem tamamlandı', 'success');
+            } else if (failed.length > 0) {
+                showNotification('Başarısız: ' + failed.join(', '), 'error');
+            } else {
+                showNotification('Toplu işlem başarısız', 'error');
+            }
+            loadPackages();
+        });
     } catch (error) {
         showNotification('Hata: ' + error.message, 'error');
-        btn.disabled = false;
-        btn.textContent = 'Yükle';
     }
 }
 
-// Paket kaldır
-async function removePackage(packageName) {
-    if (!confirm(`${packageName} paketini kaldırmak istediğinizden emin misiniz?`)) return;
+// opkg işini canlı izle (Server-Sent Events)
+function watchJob(jobId, title, onDone) {
+    if (currentJobSource) currentJobSource.close();
     
-    const btn = event.target;
+    currentJobId = jobId;
+    document.getElementById('jobPanel').style.display = 'block';
+    document.getElementById('jobTitle').textContent = title;
+    document.getElementById('jobCancelBtn').disabled = false;
+    
+    const output = document.getElementById('jobOutput');
+    output.textContent = '';
+    
+    const source = new EventSource(`/api/jobs/${jobId}/stream`);
+    currentJobSource = source;
+    
+    source.addEventListener('line', (e) => {
+        const line = JSON.parse(e.data);
+        output.textContent += line.text + '\n';
+        output.scrollTop = output.scrollHeight;
+    });
+    
+    source.addEventListener('done', (e) => {
+        source.close();
+        currentJobSource = null;
+        document.getElementById('jobCancelBtn').disabled = true;
+        onDone(JSON.parse(e.data));
+    });
+}
+
+async function cancelCurrentJob() {
+    if (!currentJobId) return;
+    
+    try {
+        const response = await fetch(`/api/jobs/${currentJobId}/cancel`, {method: 'POST'});
+        const data = await response.json();
+        
+        if (!data.success) {
+            showNotification('Hata: ' + data.error, 'error');
+        }
+    } catch (error) {
+        showNotification('Hata: ' + error.message, 'error');
+    }
+}
+
+// Paket işini başlat (install/remove), bitince listeyi yenile
+async function startPackageJob(url, packageName, btn, busyText, idleText, messages) {
     btn.disabled = true;
-    btn.textContent = 'Kaldırılıyor...';
+    btn.textContent = busyText;
     
     try {
-        const response = await fetch('/api/packages/remove', {
+        const response = await fetch(url, {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify({package: packageName})
@@ -547,51 +1126,246 @@ async function removePackage(packageName) {
         
         const data = await response.json();
         
-        if (data.success) {
-            showNotification('Paket başarıyla kaldırıldı', 'success');
-            loadPackages();
-        } else {
-            showNotification('Kaldırma başarısız: ' + (data.error || data.output), 'error');
+        if (!data.success) {
+            showNotification(messages.failed + ': ' + data.error, 'error');
             btn.disabled = false;
-            btn.textContent = 'Kaldır';
+            btn.textContent = idleText;
+            return;
         }
+        
+        watchJob(data.job_id, `${packageName}: ${busyText}`, (job) => {
+            if (job.state === 'done') {
+                showNotification(messages.done, 'success');
+            } else if (job.state === 'cancelled') {
+                showNotification('İşlem iptal edildi', 'error');
+            } else {
+                showNotification(messages.failed + ' (kod: ' + job.returncode + ')', 'error');
+            }
+            loadPackages();
+        });
     } catch (error) {
         showNotification('Hata: ' + error.message, 'error');
         btn.disabled = false;
-        btn.textContent = 'Kaldır';
+        btn.textContent = idleText;
     }
 }
 
-// Logları yükle
-async function loadKernelLog() {
+// Yükleme öncesi bağımlılık özeti (eklenecek paketler ve boyut)
+async function describeInstall(packageName) {
     try {
-        const response = await fetch('/api/logs/kernel');
+        const response = await fetch(`/api/packages/${encodeURIComponent(packageName)}/deps`);
         const data = await response.json();
+        if (!data.success) return '';
         
-        if (data.success) {
-            document.getElementById('logContainer').innerHTML = 
-                data.logs.map(line => `<div class="log-line">${line}</div>`).join('');
+        const preview = data.preview;
+        const extra = preview.to_install.filter(p => p.name !== packageName).map(p => p.name);
+        let text = `\n\nToplam kurulum boyutu: ${formatSize(preview.total_size)}`;
+        if (extra.length) text += `\nEk bağımlılıklar (${extra.length}): ${extra.join(', ')}`;
+        if (preview.missing.length) text += `\nFeed'de bulunamayan: ${preview.missing.join(', ')}`;
+        return text;
+    } catch (error) {
+        return '';
+    }
+}
+
+// Kaldırma öncesi uyarı (bu pakete bağımlı yüklü paketler)
+async function describeRemove(packageName) {
+    try {
+        const response = await fetch(`/api/packages/${encodeURIComponent(packageName)}/rdeps`);
+        const data = await response.json();
+        if (!data.success || data.rdeps.all.length === 0) return '';
+        
+        return `\n\nDİKKAT: Bu pakete bağımlı ${data.rdeps.all.length} paket etkilenecek: ${data.rdeps.all.join(', ')}`;
+    } catch (error) {
+        return '';
+    }
+}
+
+// Paket yükle
+async function installPackage(packageName) {
+    const btn = event.target;
+    const details = await describeInstall(packageName);
+    if (!confirm(`${packageName} paketini yüklemek istediğinizden emin misiniz?${details}`)) return;
+    
+    await startPackageJob('/api/packages/install', packageName, btn, 'Yükleniyor...', 'Yükle', {
+        done: 'Paket başarıyla yüklendi',
+        failed: 'Yükleme başarısız'
+    });
+}
+
+// Paket kaldır
+async function removePackage(packageName) {
+    const btn = event.target;
+    const details = await describeRemove(packageName);
+    if (!confirm(`${packageName} paketini kaldırmak istediğinizden emin misiniz?${details}`)) return;
+    
+    await startPackageJob('/api/packages/remove', packageName, btn, 'Kaldırılıyor...', 'Kaldır', {
+        done: 'Paket başarıyla kaldırıldı',
+        failed: 'Kaldırma başarısız'
+    });
+}
+
+// Logları yükle (imleç saklanır; Yenile sadece yeni satırları ekler)
+const LOG_VIEW_LINES = 200;
+const LOG_VIEW_MAX = 2000;
+const logView = {source: null, cursor: null};
+
+function appendLogLines(lines, replace = false, className = 'log-line') {
+    const container = document.getElementById('logContainer');
+    if (replace) {
+        container.innerHTML = '';
+    }
+    lines.forEach(line => {
+        const div = document.createElement('div');
+        div.className = className;
+        div.textContent = line;
+        container.appendChild(div);
+    });
+    while (container.children.length > LOG_VIEW_MAX) {
+        container.removeChild(container.firstChild);
+    }
+    container.scrollTop = container.scrollHeight;
+}
+
+async function loadLog(source, incremental = false) {
+    const container = document.getElementById('logContainer');
+    const params = new URLSearchParams({lines: LOG_VIEW_LINES});
+    if (incremental && logView.source === source && logView.cursor) {
+        params.set('since', logView.cursor);
+    }
+    
+    try {
+        const response = await fetch(`/api/logs/${source}?${params}`);
+        const data = await response.json();
+        if (!data.success) return;
+        
+        appendLogLines(data.logs, !params.has('since') || data.rotated);
+        logView.source = source;
+        logView.cursor = data.cursor;
+        if (data.more && data.cursor) {
+            await loadLog(source, true);
         }
     } catch (error) {
-        document.getElementById('logContainer').innerHTML = 'Yüklenemedi';
+        container.innerHTML = 'Yüklenemedi';
     }
 }
 
-async function loadSystemLog() {
+function loadKernelLog() {
+    stopLogStream();
+    resetLogQuery();
+    loadLog('kernel');
+}
+
+function loadSystemLog() {
+    stopLogStream();
+    resetLogQuery();
+    loadLog('system');
+}
+
+// Canlı izleme: imleçten devam eder, yeniden bağlanınca kaçırılanlar sunucudan gelir
+let logStream = null;
+
+function toggleLogStream() {
+    if (logStream) {
+        stopLogStream();
+    } else if (logView.source) {
+        startLogStream(logView.source);
+    } else {
+        showNotification('Önce bir log türü seçin', 'error');
+    }
+}
+
+function startLogStream(source) {
+    const params = new URLSearchParams({source: source});
+    if (logView.cursor) params.set('since', logView.cursor);
+    
+    logStream = new EventSource(`/api/stream/logs?${params}`);
+    logStream.addEventListener('log', (e) => {
+        const data = JSON.parse(e.data);
+        appendLogLines(data.lines, data.rotated);
+        if (data.cursor) logView.cursor = data.cursor;
+    });
+    logStream.addEventListener('rotated', () => {
+        appendLogLines(['--- log dosyası döndürüldü ---'], false, 'log-line log-marker');
+    });
+    logStream.addEventListener('dropped', (e) => {
+        const data = JSON.parse(e.data);
+        appendLogLines([`--- ${data.count} satır atlandı (bağlantı yavaş) ---`], false, 'log-line log-marker');
+    });
+    document.getElementById('logStreamBtn').textContent = 'Durdur';
+}
+
+function stopLogStream() {
+    if (logStream) {
+        logStream.close();
+        logStream = null;
+    }
+    document.getElementById('logStreamBtn').textContent = 'Canlı İzle';
+}
+
+function refreshLog() {
+    if (logView.source && !logStream) {
+        loadLog(logView.source, true);
+    }
+}
+
+// Sunucu tarafı log sorgusu (syslog dosyası, sayfalı)
+let logQueryCursor = null;
+
+function formatLogEntry(entry) {
+    const time = entry.time ? new Date(entry.time * 1000).toLocaleString('tr-TR') : '';
+    const level = entry.severity ? ` [${entry.severity}]` : '';
+    const program = entry.program ? ` ${entry.program}${entry.pid ? `[${entry.pid}]` : ''}:` : '';
+    return `${time}${level}${program} ${entry.message}`;
+}
+
+async function queryLogs(more = false) {
+    stopLogStream();
+    const params = new URLSearchParams({limit: LOG_VIEW_LINES, format: 'columnar'});
+    const range = document.getElementById('logQueryRange').value;
+    const severity = document.getElementById('logQuerySeverity').value;
+    const program = document.getElementById('logQueryProgram').value.trim();
+    const text = document.getElementById('logQueryText').value.trim();
+    if (range) params.set('from', Math.floor(Date.now() / 1000) - parseInt(range));
+    if (severity) params.set('severity', severity);
+    if (program) params.set('program', program);
+    if (text) params.set('q', text);
+    if (more && logQueryCursor) params.set('cursor', logQueryCursor);
+    
     try {
-        const response = await fetch('/api/logs/system');
+        const response = await fetch(`/api/logs/query?${params}`);
         const data = await response.json();
+        if (!data.success) {
+            showNotification('Hata: ' + data.error, 'error');
+            return;
+        }
         
-        if (data.success) {
-            document.getElementById('logContainer').innerHTML = 
-                data.logs.map(line => `<div class="log-line">${line}</div>`).join('');
+        const entries = fromColumnar(data.logs);
+        if (!more) {
+            logView.source = null;
+            logView.cursor = null;
         }
+        appendLogLines(entries.map(formatLogEntry), !more);
+        if (!more && !entries.length && !data.cursor) {
+            appendLogLines(['Eşleşen kayıt yok'], false, 'log-line log-marker');
+        }
+        logQueryCursor = data.cursor;
+        document.getElementById('logQueryMore').style.display = data.cursor ? '' : 'none';
     } catch (error) {
-        document.getElementById('logContainer').innerHTML = 'Yüklenemedi';
+        showNotification('Log sorgusu başarısız', 'error');
     }
 }
 
+function resetLogQuery() {
+    logQueryCursor = null;
+    document.getElementById('logQueryMore').style.display = 'none';
+}
+
 function clearLogDisplay() {
+    stopLogStream();
+    resetLogQuery();
+    logView.source = null;
+    logView.cursor = null;
     document.getElementById('logContainer').innerHTML = 'Bir log türü seçin...';
 }
 
@@ -693,18 +1467,38 @@ async function executeTerminalCommand() {
 
 // ===== DOSYA YÖNETİCİSİ =====
 
-async function loadFiles(path) {
-    currentPath = path;
-    document.getElementById('currentPath').textContent = path;
-    selectedFiles.clear();
-    updateToolbarButtons();
+// Büyük klasörler sayfa sayfa yüklenir
+const FILE_PAGE_SIZE = 500;
+let fileSort = 'name';
+let fileOrder = 'asc';
+let fileOffset = 0;
+
+async function loadFiles(path, append = false) {
+    if (!append) {
+        currentPath = path;
+        document.getElementById('currentPath').textContent = path;
+        selectedFiles.clear();
+        updateToolbarButtons();
+        fileOffset = 0;
+    }
+    
+    const params = new URLSearchParams({
+        path: path,
+        format: 'columnar',
+        sort: fileSort,
+        order: fileOrder,
+        offset: fileOffset,
+        limit: FILE_PAGE_SIZE
+    });
     
     try {
-        const response = await fetch(`/api/files?path=${encodeURIComponent(path)}`);
+        const response = await fetch(`/api/files?${params}`);
         const data = await response.json();
         
         if (data.success) {
-            renderFiles(data.items);
+            const items = fromColumnar(data.items);
+            fileOffset = data.offset + items.length;
+            renderFiles(items, append, data.total);
         }
     } catch (error) {
         document.getElementById('fileList').innerHTML = 
@@ -712,12 +1506,17 @@ async function loadFiles(path) {
     }
 }
 
-function renderFiles(items) {
+function changeFileSort(value) {
+    [fileSort, fileOrder] = value.split(':');
+    loadFiles(currentPath);
+}
+
+function renderFiles(items, append = false, total = items.length) {
     const list = document.getElementById('fileList');
     
     let html = '';
     
-    if (currentPath !== '/opt') {
+    if (currentPath !== '/opt' && !append) {
         html += `
             <div class="file-item" onclick="navigateUp()" data-path="..">
                 <span class="file-icon">⬆️</span>
@@ -744,7 +1543,22 @@ function renderFiles(items) {
         </div>
     `).join('');
     
-    list.innerHTML = html;
+    if (fileOffset < total) {
+        html += `
+            <div class="file-item" id="fileListMore" onclick="loadFiles(currentPath, true)">
+                <span class="file-icon">⬇️</span>
+                <span class="file-name">Daha fazla göster (${total - fileOffset} öğe kaldı)</span>
+            </div>
+        `;
+    }
+    
+    if (append) {
+        const more = document.getElementById('fileListMore');
+        if (more) more.remove();
+        list.insertAdjacentHTML('beforeend', html);
+    } else {
+        list.innerHTML = html;
+    }
 }
 
 function getFileIcon(name, isDir) {
@@ -767,7 +1581,9 @@ function getFileIcon(name, isDir) {
 function formatSize(bytes) {
     if (bytes < 1024) return bytes + ' B';
     if (bytes < 1024 * 1024) return (bytes / 1024).toFixed(1) + ' KB';
-    return (bytes / (1024 * 1024)).toFixed(1) + ' MB';
+    if (bytes < 1024 * 1024 * 1024) return (bytes / (1024 * 1024)).toFixed(1) + ' MB';
+    if (bytes < 1024 * 1024 * 1024 * 1024) return (bytes / (1024 * 1024 * 1024)).toFixed(1) + ' GB';
+    return (bytes / (1024 * 1024 * 1024 * 1024)).toFixed(1) + ' TB';
 }
 
 function navigateUp() {
@@ -1311,19 +2127,32 @@ document.getElementById('fileSearch').addEventListener('keypress', async (e) =>
         return;
     }
     
+    // /desen/ regex, * veya ? içeren sorgu glob olarak aranır
+    const params = new URLSearchParams({path: currentPath, format: 'columnar'});
+    if (query.length > 2 && query.startsWith('/') && query.endsWith('/')) {
+        params.set('query', query.slice(1, -1));
+        params.set('mode', 'regex');
+    } else {
+        params.set('query', query);
+        params.set('mode', /[*?]/.test(query) ? 'glob' : 'substring');
+    }
+    
     try {
-        const response = await fetch(`/api/files/search?query=${encodeURIComponent(query)}&path=${encodeURIComponent(currentPath)}`);
+        const response = await fetch(`/api/files/search?${params}`);
         const data = await response.json();
         
         if (data.success) {
             const list = document.getElementById('fileList');
+            const results = fromColumnar(data.results);
             
-            if (data.results.length === 0) {
+            if (results.length === 0) {
                 list.innerHTML = '<div class="loading">Sonuç bulunamadı</div>';
                 return;
             }
             
-            list.innerHTML = data.results.map(item => `
+            const more = data.count > results.length
+                ? `<div class="loading">${data.count} sonuçtan ilk ${results.length} tanesi gösteriliyor</div>` : '';
+            list.innerHTML = more + results.map(item => `
                 <div class="file-item" 
                      data-path="${item.path}"
                      ondblclick="handleFileDblClick('${item.path}', ${item.is_dir})"
@@ -1407,5 +2236,6 @@ function refreshFiles() {
 
 // Başlangıç
 updateStats();
-setInterval(updateStats, 2000);
+startMetricsStream();
 loadDashboard();
+loadHistory();
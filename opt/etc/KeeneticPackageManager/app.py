@@ -1,75 +1,352 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from flask import Flask, jsonify, request, send_from_directory, send_file
+from flask import Flask, jsonify, request, send_file, Response, stream_with_context, g
 import subprocess
 import os
 import json
 import time
 import shutil
+import signal
 import re
 import zipfile
 import io
+import sys
+import hashlib
+import gzip
+import threading
+import queue
+import bisect
+import struct
+import mmap
+import math
+import atexit
+import socket
+import select
+import stat
+import errno
+import fnmatch
+from array import array
+from collections import deque
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    # Entware'de python3-ctypes ayrı paket; yoksa dosya indeksi periyodik taramayla çalışır
+    ctypes = None
+
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max upload
 
-# CPU kullanımını hesaplamak için önceki değerleri sakla
-last_cpu_stats = None
-last_cpu_time = None
-
 # Clipboard için geçici depolama (copy/paste işlemleri için)
 clipboard = {'items': [], 'operation': None}  # operation: 'copy' veya 'cut'
 
-def get_cpu_usage():
-    """Diferansiyel CPU kullanımı hesaplama"""
-    global last_cpu_stats, last_cpu_time
+# /proc örnekleyici: tek thread sabit aralıkla okur, istekler son örneği döndürür
+SAMPLER_INTERVAL = 2
+SAMPLER_HISTORY = 150  # 5 dakika
+
+# /proc/stat cpu satırı: user nice system idle iowait irq softirq steal
+CPU_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+
+_samples = deque(maxlen=SAMPLER_HISTORY)
+_sample_cond = threading.Condition()  # yeni örnekte abonelere haber verir
+_sampler_lock = threading.Lock()
+_sampler_thread = None
+
+def read_cpu_times():
+    """/proc/stat'tan toplam ve çekirdek bazında CPU sayaçlarını oku
+
+    Dönüş: {'cpu': (...), 'cpu0': (...), ...} - değerler CPU_FIELDS sırasında
+    """
+    times = {}
+    with open('/proc/stat', 'r') as f:
+        for line in f:
+            if not line.startswith('cpu'):
+                break
+            parts = line.split()
+            values = [int(x) for x in parts[1:len(CPU_FIELDS) + 1]]
+            values += [0] * (len(CPU_FIELDS) - len(values))
+            times[parts[0]] = tuple(values)
+    return times
+
+def cpu_percentages(previous, current):
+    """İki sayaç okuması arasındaki farktan kullanım ve iowait yüzdesi"""
+    deltas = [max(c - p, 0) for p, c in zip(previous, current)]
+    total = sum(deltas)
+    if total == 0:
+        return {'usage': 0.0, 'iowait': 0.0}
+    
+    idle = deltas[3] + deltas[4]
+    return {
+        'usage': round((total - idle) * 100.0 / total, 1),
+        'iowait': round(deltas[4] * 100.0 / total, 1)
+    }
+
+def get_load_average():
+    """/proc/loadavg: 1/5/15 dakikalık yük ve süreç sayıları"""
+    with open('/proc/loadavg', 'r') as f:
+        parts = f.read().split()
+    running, total = parts[3].split('/')
+    return {
+        'load': [float(x) for x in parts[:3]],
+        'running': int(running),
+        'processes': int(total)
+    }
+
+def read_net_dev():
+    """/proc/net/dev sayaçları: arayüz -> {'rx_bytes', 'rx_packets', ...}"""
+    interfaces = {}
+    with open('/proc/net/dev', 'r') as f:
+        lines = f.readlines()[2:]  # İlk 2 satırı atla
+    
+    for line in lines:
+        if ':' in line:
+            iface, _, data = line.partition(':')
+            stats = data.split()
+            if len(stats) >= 16:
+                interfaces[iface.strip()] = {
+                    'rx_bytes': int(stats[0]),
+                    'rx_packets': int(stats[1]),
+                    'rx_errors': int(stats[2]),
+                    'rx_dropped': int(stats[3]),
+                    'tx_bytes': int(stats[8]),
+                    'tx_packets': int(stats[9]),
+                    'tx_errors': int(stats[10]),
+                    'tx_dropped': int(stats[11])
+                }
+    return interfaces
+
+# Rota bayrakları (linux/route.h)
+RTF_UP = 0x0001
+RTF_REJECT = 0x0200
+
+def read_uplink_interfaces():
+    """Varsayılan IPv4/IPv6 rotasının geçtiği (WAN) arayüzler"""
+    uplinks = set()
+    try:
+        with open('/proc/net/route', 'r') as f:
+            for line in f.readlines()[1:]:  # Başlık satırını atla
+                fields = line.split()
+                # Iface Destination Gateway Flags RefCnt Use Metric Mask ...
+                if len(fields) >= 8 and fields[1] == '00000000' and fields[7] == '00000000':
+                    if int(fields[3], 16) & (RTF_UP | RTF_REJECT) == RTF_UP:
+                        uplinks.add(fields[0])
+    except (OSError, ValueError):
+        pass
     
     try:
-        with open('/proc/stat', 'r') as f:
-            line = f.readline()
+        with open('/proc/net/ipv6_route', 'r') as f:
+            for line in f:
+                fields = line.split()
+                # hedef, önek uzunluğu, kaynak, kaynak öneki, ağ geçidi, metrik, refcnt, use, bayraklar, arayüz
+                if len(fields) >= 10 and fields[1] == '00' and int(fields[0], 16) == 0:
+                    if int(fields[8], 16) & (RTF_UP | RTF_REJECT) == RTF_UP:
+                        uplinks.add(fields[9])
+    except (OSError, ValueError):
+        pass
+    
+    uplinks.discard('lo')
+    return uplinks
+
+# Arayüz bazlı hızlar: örnekleyici her turda /proc/net/dev sayaçlarını işler
+BANDWIDTH_HISTORY = 60  # 2 dakika
+COUNTER_32_LIMIT = 2 ** 32
+
+_bandwidth = {}  # arayüz -> {'time', 'counters', 'rates', 'history'}
+_bandwidth_lock = threading.Lock()
+
+def counter_delta(previous, current):
+    """Sayaç farkı; 32-bit taşmayı sıfırlanmadan ayırt et"""
+    if current >= previous:
+        return current - previous
+    
+    if previous < COUNTER_32_LIMIT:
+        wrapped = current + COUNTER_32_LIMIT - previous
+        if wrapped < COUNTER_32_LIMIT // 2:
+            return wrapped
+    
+    # Sayaç sıfırlandı (arayüz yeniden oluştu): sıfırdan bu yana sayılan
+    return current
+
+def update_bandwidth():
+    """Sayaçları oku, önceki okumaya göre bayt/sn ve paket/sn hesapla"""
+    now = time.monotonic()
+    counters = read_net_dev()
+    
+    with _bandwidth_lock:
+        for name in [n for n in _bandwidth if n not in counters]:
+            del _bandwidth[name]
+        
+        for name, current in counters.items():
+            entry = _bandwidth.get(name)
+            if entry is None:
+                _bandwidth[name] = {'time': now, 'counters': current, 'rates': None,
+                                    'history': deque(maxlen=BANDWIDTH_HISTORY)}
+                continue
             
-        # cpu  user nice system idle iowait irq softirq
-        parts = line.split()
-        if parts[0] != 'cpu':
-            return 0.0
+            elapsed = now - entry['time']
+            if elapsed <= 0:
+                continue
             
-        # İlk 4 değeri al (user, nice, system, idle)
-        user = int(parts[1])
-        nice = int(parts[2])
-        system = int(parts[3])
-        idle = int(parts[4])
-        
-        total = user + nice + system + idle
-        active = user + nice + system
-        
-        current_time = time.time()
-        
-        if last_cpu_stats is None:
-            last_cpu_stats = {'total': total, 'active': active}
-            last_cpu_time = current_time
-            time.sleep(0.1)  # İlk okuma için kısa bekleme
-            return get_cpu_usage()
-        
-        # Diferansiyel hesaplama
-        total_delta = total - last_cpu_stats['total']
-        active_delta = active - last_cpu_stats['active']
+            previous = entry['counters']
+            rate = lambda key: round(counter_delta(previous[key], current[key]) / elapsed, 1)
+            rates = {
+                'rx_rate': rate('rx_bytes'),
+                'tx_rate': rate('tx_bytes'),
+                'rx_pps': rate('rx_packets'),
+                'tx_pps': rate('tx_packets')
+            }
+            entry.update(time=now, counters=current, rates=rates)
+            entry['history'].append((round(time.time(), 1), rates['rx_rate'], rates['tx_rate']))
+
+def get_bandwidth_info(history=0):
+    """Arayüz başına sayaçlar, hızlar ve (istenirse) son history hız örneği"""
+    start_system_sampler()
+    if not _bandwidth:
+        update_bandwidth()
+    
+    result = {}
+    with _bandwidth_lock:
+        for name, entry in _bandwidth.items():
+            info = dict(entry['counters'])
+            info.update(entry['rates'] or {'rx_rate': None, 'tx_rate': None, 'rx_pps': None, 'tx_pps': None})
+            if history > 0:
+                info['history'] = [list(h) for h in list(entry['history'])[-history:]]
+            result[name] = info
+    return result
+
+def _take_sample(previous_times):
+    """Tek örnek al; ilk örnekte sayaçlar açılıştan beri ortalamayı verir"""
+    times = read_cpu_times()
+    zero = (0,) * len(CPU_FIELDS)
+    
+    total = cpu_percentages(previous_times.get('cpu', zero), times['cpu'])
+    cores = []
+    for name in sorted((n for n in times if n != 'cpu'), key=lambda n: int(n[3:])):
+        core = cpu_percentages(previous_times.get(name, zero), times[name])
+        core['name'] = name
+        cores.append(core)
+    
+    try:
+        load = get_load_average()
+    except Exception:
+        load = {'load': [0, 0, 0], 'running': 0, 'processes': 0}
+    
+    sample = {
+        'time': time.time(),
+        'cpu': total['usage'],
+        'iowait': total['iowait'],
+        'cores': cores,
+        'memory': get_memory_usage(),
+        'uptime': get_uptime(),
+        'load': load['load'],
+        'running': load['running'],
+        'processes': load['processes']
+    }
+    return sample, times
+
+def _sampler_loop():
+    """SAMPLER_INTERVAL aralıkla /proc'u okuyup halka tampona ekle"""
+    previous = {}
+    while True:
+        started = time.monotonic()
+        try:
+            sample, previous = _take_sample(previous)
+            with _sample_cond:
+                _samples.append(sample)
+                _sample_cond.notify_all()
+        except Exception as e:
+            print(f"Örnekleyici hatası: {e}")
+        
+        # Toplayıcılar birbirinden bağımsız: biri hata verirse diğerleri çalışmaya devam eder
+        for collect in (update_bandwidth, update_process_snapshot, update_wireless):
+            try:
+                collect()
+            except Exception as e:
+                print(f"Örnekleyici hatası ({collect.__name__}): {e}")
         
-        if total_delta == 0:
-            cpu_percent = 0.0
+        time.sleep(max(SAMPLER_INTERVAL - (time.monotonic() - started), 0.1))
+
+def start_system_sampler():
+    """Sistem örnekleyici thread'ini başlat"""
+    global _sampler_thread
+    
+    with _sampler_lock:
+        if _sampler_thread is None or not _sampler_thread.is_alive():
+            _sampler_thread = threading.Thread(target=_sampler_loop, name='proc-sampler', daemon=True)
+            _sampler_thread.start()
+
+def get_latest_sample():
+    """Son örnek (thread henüz örnek üretmediyse kısa süre bekle)"""
+    start_system_sampler()
+    
+    deadline = time.monotonic() + 1
+    while not _samples and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    if _samples:
+        return _samples[-1]
+    return _take_sample({})[0]
+
+def get_recent_samples(count):
+    """Halka tampondaki son count örnek (eskiden yeniye)"""
+    start_system_sampler()
+    samples = list(_samples)
+    return samples[-count:] if count > 0 else []
+
+def get_cpu_usage():
+    """Toplam CPU kullanımı (örnekleyicinin son değeri)"""
+    return get_latest_sample()['cpu']
+
+def sample_metrics(sample):
+    """Örneği dashboard / metrik akışı formatına çevir"""
+    return {
+        'time': sample['time'],
+        'cpu': {'usage': sample['cpu'], 'iowait': sample['iowait'], 'cores': sample['cores']},
+        'mem': sample['memory'],
+        'load': {'load': sample['load'], 'running': sample['running'], 'processes': sample['processes']},
+        'uptime': sample['uptime']
+    }
+
+# Canlı metrik akışı: tüm aboneler örnekleyicinin ürettiği aynı örneği alır
+METRICS_KEEPALIVE = 15
+METRICS_MAX_INTERVAL = 60
+
+_metrics_event = (None, None)  # (örnek, hazır SSE mesajı)
+
+def metrics_event(sample):
+    """Örneğin SSE mesajı; her örnek için bir kez serileştirilir"""
+    global _metrics_event
+    
+    cached_sample, message = _metrics_event
+    if cached_sample is not sample:
+        message = sse_event(sample_metrics(sample), 'metrics')
+        _metrics_event = (sample, message)
+    return message
+
+def stream_metrics(interval):
+    """Yeni örnekleri en fazla interval saniyede bir SSE olarak gönder"""
+    start_system_sampler()
+    last_sent = 0
+    
+    def due():
+        # Örnekleme aralığındaki kaymayı tolere et
+        return bool(_samples) and _samples[-1]['time'] >= last_sent + interval - SAMPLER_INTERVAL / 2
+    
+    while True:
+        with _sample_cond:
+            ready = _sample_cond.wait_for(due, timeout=METRICS_KEEPALIVE)
+            sample = _samples[-1] if ready else None
+        
+        if sample is not None:
+            last_sent = sample['time']
+            yield metrics_event(sample)
         else:
-            cpu_percent = (active_delta / total_delta) * 100.0
-        
-        # Güncelle
-        last_cpu_stats = {'total': total, 'active': active}
-        last_cpu_time = current_time
-        
-        return round(cpu_percent, 1)
-    except Exception as e:
-        print(f"CPU hesaplama hatası: {e}")
-        return 0.0
+            # Bağlantıyı canlı tut
+            yield ': keep-alive\n\n'
 
 def get_memory_usage():
     """RAM kullanımı hesaplama"""
@@ -102,6 +379,18 @@ def get_memory_usage():
         print(f"RAM hesaplama hatası: {e}")
         return {'used': 0, 'total': 0, 'percent': 0}
 
+def get_uptime():
+    """Çalışma süresi (/proc/uptime)"""
+    try:
+        with open('/proc/uptime', 'r') as f:
+            uptime_seconds = float(f.read().split()[0])
+        days = int(uptime_seconds // 86400)
+        hours = int((uptime_seconds % 86400) // 3600)
+        minutes = int((uptime_seconds % 3600) // 60)
+        return {'uptime': f"{days}d {hours}h {minutes}m", 'uptime_seconds': int(uptime_seconds)}
+    except:
+        return {'uptime': 'Unknown', 'uptime_seconds': 0}
+
 def get_system_info():
     """Sistem bilgilerini al (OpenWRT tarzı)"""
     info = {}
@@ -113,18 +402,7 @@ def get_system_info():
     except:
         info['hostname'] = 'Unknown'
     
-    try:
-        # Uptime
-        with open('/proc/uptime', 'r') as f:
-            uptime_seconds = float(f.read().split()[0])
-            days = int(uptime_seconds // 86400)
-            hours = int((uptime_seconds % 86400) // 3600)
-            minutes = int((uptime_seconds % 3600) // 60)
-            info['uptime'] = f"{days}d {hours}h {minutes}m"
-            info['uptime_seconds'] = int(uptime_seconds)
-    except:
-        info['uptime'] = 'Unknown'
-        info['uptime_seconds'] = 0
+    info.update(get_uptime())
     
     try:
         # Load average
@@ -144,8 +422,215 @@ def get_system_info():
     
     return info
 
-def get_network_interfaces():
-    """Ağ arayüzlerini al"""
+# Ağ arayüzleri: /sys/class/net + rtnetlink adres dökümü, değişiklik
+# bildirimleri gelene kadar önbellekte tutulur
+SYS_NET_DIR = '/sys/class/net'
+
+# rtnetlink sabitleri (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h)
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWADDR = 20
+RTM_GETADDR = 22
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_DUMP = 0x300
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+ARPHRD_ETHER = 1
+
+_NLMSGHDR = struct.Struct('=LHHLL')
+_IFADDRMSG = struct.Struct('=BBBBi')
+_RTATTR = struct.Struct('=HH')
+
+_interfaces_cache = None  # (nesil, arayüz listesi)
+_interfaces_generation = 0
+_interfaces_lock = threading.Lock()
+_netlink_watcher = None
+
+def _read_sys(path, default=None):
+    """sysfs değerini oku (arayüz kapalıyken bazı dosyalar EINVAL verir)"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+def netlink_query(protocol, msg_type, flags, payload):
+    """Netlink isteği gönder, cevap mesajlarını [(tip, veri), ...] olarak döndür
+
+    Döküm isteklerinde NLMSG_DONE'a kadar okunur. Hata cevabı OSError olur.
+    """
+    messages = []
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol) as sock:
+        sock.settimeout(2)
+        sock.bind((0, 0))
+        sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(payload), msg_type,
+                                 NLM_F_REQUEST | flags, 1, 0) + payload)
+        
+        while True:
+            data = sock.recv(65536)
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, reply_type, reply_flags, _, _ = _NLMSGHDR.unpack_from(data, offset)
+                if length < _NLMSGHDR.size or reply_type == NLMSG_DONE:
+                    return messages
+                body = data[offset + _NLMSGHDR.size:offset + length]
+                if reply_type == NLMSG_ERROR:
+                    error = struct.unpack_from('=i', body)[0]
+                    if error:
+                        raise OSError(-error, os.strerror(-error))
+                    return messages
+                messages.append((reply_type, body))
+                if not reply_flags & NLM_F_MULTI:
+                    return messages
+                offset += (length + 3) & ~3
+
+def netlink_attrs(data, offset=0):
+    """Netlink özniteliklerini {tip: veri} sözlüğüne çevir (iç içe bayrakları atılır)"""
+    attrs = {}
+    while offset + _RTATTR.size <= len(data):
+        length, attr_type = _RTATTR.unpack_from(data, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[attr_type & 0x3fff] = data[offset + _RTATTR.size:offset + length]
+        offset += (length + 3) & ~3
+    return attrs
+
+def _netlink_addresses():
+    """RTM_GETADDR dökümü: ifindex -> {'ipv4': [...], 'ipv6': [...]}"""
+    addresses = {}
+    request_msg = _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+    for msg_type, body in netlink_query(socket.NETLINK_ROUTE, RTM_GETADDR, NLM_F_DUMP, request_msg):
+        if msg_type == RTM_NEWADDR:
+            _parse_ifaddrmsg(body, addresses)
+    return addresses
+
+def _parse_ifaddrmsg(payload, addresses):
+    """Tek RTM_NEWADDR mesajını addresses sözlüğüne ekle"""
+    family, prefixlen, _, _, index = _IFADDRMSG.unpack_from(payload, 0)
+    attrs = netlink_attrs(payload, _IFADDRMSG.size)
+    
+    # Noktadan noktaya bağlantılarda IFA_ADDRESS karşı uçtur; yerel adres IFA_LOCAL
+    raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+    if raw is None or family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    
+    entry = addresses.setdefault(index, {'ipv4': [], 'ipv6': []})
+    key = 'ipv4' if family == socket.AF_INET else 'ipv6'
+    entry[key].append(f"{socket.inet_ntop(family, raw)}/{prefixlen}")
+
+def _netlink_watch_loop(sock):
+    """Bağlantı/adres değişikliği bildiriminde önbelleği geçersiz kıl
+
+    Kalıcı bir soket hatasında dinleyici durur; arayüz listesi o andan
+    itibaren COLLECTOR_TTL ile yoklanır.
+    """
+    global _interfaces_generation, _netlink_watcher
+    
+    while True:
+        try:
+            sock.recv(65536)
+        except OSError as e:
+            if e.errno != errno.ENOBUFS:
+                print(f"rtnetlink dinleyici durdu: {e}")
+                sock.close()
+                with _interfaces_lock:
+                    _interfaces_generation += 1
+                    _netlink_watcher = threading.Thread(target=lambda: None)
+                return
+            # ENOBUFS: bildirim kaçırıldı, yine de yenile
+        with _interfaces_lock:
+            _interfaces_generation += 1
+
+def start_netlink_watcher():
+    """rtnetlink bildirim dinleyicisini başlat (destek yoksa False)"""
+    global _netlink_watcher
+    
+    with _interfaces_lock:
+        if _netlink_watcher is not None:
+            return _netlink_watcher.is_alive()
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        except (OSError, AttributeError) as e:
+            print(f"rtnetlink dinleyici başlatılamadı: {e}")
+            _netlink_watcher = threading.Thread(target=lambda: None)
+            return False
+        
+        _netlink_watcher = threading.Thread(target=_netlink_watch_loop, args=(sock,),
+                                            name='netlink-watcher', daemon=True)
+        _netlink_watcher.start()
+        return True
+
+def _collect_interfaces():
+    """/sys/class/net ve rtnetlink ile arayüz listesini oluştur"""
+    addresses = _netlink_addresses()
+    interfaces = []
+    
+    for name in os.listdir(SYS_NET_DIR):
+        base = os.path.join(SYS_NET_DIR, name)
+        ifindex = _read_sys(os.path.join(base, 'ifindex'))
+        if ifindex is None:
+            continue
+        
+        operstate = _read_sys(os.path.join(base, 'operstate'), 'unknown')
+        speed = _read_sys(os.path.join(base, 'speed'))
+        mtu = _read_sys(os.path.join(base, 'mtu'))
+        link_type = _read_sys(os.path.join(base, 'type'))
+        entry = addresses.get(int(ifindex), {'ipv4': [], 'ipv6': []})
+        
+        interfaces.append({
+            'index': int(ifindex),
+            'name': name,
+            'state': operstate.upper() if operstate in ('up', 'unknown') else 'DOWN',
+            'operstate': operstate,
+            'ipv4': entry['ipv4'],
+            'ipv6': entry['ipv6'],
+            'mac': _read_sys(os.path.join(base, 'address'), '') if link_type == str(ARPHRD_ETHER) else '',
+            'mtu': int(mtu) if mtu else None,
+            'speed': int(speed) if speed and speed.lstrip('-').isdigit() and int(speed) > 0 else None
+        })
+    
+    interfaces.sort(key=lambda i: i['index'])
+    return interfaces
+
+def get_network_interfaces(statistics=True):
+    """Ağ arayüzlerini al
+
+    Liste, netlink bildirimi gelene kadar önbellekten döner (dinleyici
+    yoksa COLLECTOR_TTL['interfaces'] süresince). statistics=True ise
+    /proc/net/dev sayaçları her çağrıda eklenir.
+    """
+    global _interfaces_cache
+    
+    try:
+        watching = start_netlink_watcher()
+        cache = _interfaces_cache
+        if cache is not None and cache[0] == _interfaces_generation and (
+                watching or time.monotonic() - cache[2] < COLLECTOR_TTL['interfaces']):
+            interfaces = cache[1]
+        else:
+            generation = _interfaces_generation
+            interfaces = _collect_interfaces()
+            _interfaces_cache = (generation, interfaces, time.monotonic())
+    except OSError as e:
+        print(f"Netlink arayüz toplama hatası: {e}")
+        interfaces = _parse_ip_addr()
+    
+    if not statistics:
+        return interfaces
+    
+    try:
+        counters = read_net_dev()
+    except OSError:
+        counters = {}
+    return [dict(iface, statistics=counters.get(iface['name'])) for iface in interfaces]
+
+def _parse_ip_addr():
+    """Yedek: `ip addr show` çıktısından arayüzleri al"""
     interfaces = []
     
     try:
@@ -201,32 +686,253 @@ def get_network_interfaces():
     
     return interfaces
 
+# Disk kullanımı: /proc/mounts + statvfs (df çağrısı yok)
+PROC_MOUNTS = '/proc/mounts'
+PSEUDO_FILESYSTEMS = {
+    'proc', 'sysfs', 'devpts', 'cgroup', 'cgroup2', 'debugfs', 'tracefs', 'securityfs',
+    'pstore', 'bpf', 'mqueue', 'hugetlbfs', 'configfs', 'fusectl', 'autofs', 'binfmt_misc',
+    'rpc_pipefs', 'nsfs', 'selinuxfs', 'efivarfs', 'usbfs', 'nfsd', 'ramfs'
+}
+
+def _unescape_mount(value):
+    """/proc/mounts alanlarındaki \040 gibi sekizlik kaçışları çöz"""
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), value)
+
 def get_storage_info():
-    """Disk kullanımı (OpenWRT tarzı)"""
-    storage = []
+    """Disk kullanımı (bayt ve inode sayıları, biçimlendirme istemcide)"""
+    mounts = {}
     
     try:
-        result = subprocess.run(['df', '-h'], capture_output=True, text=True, timeout=5)
-        
-        for line in result.stdout.split('\n')[1:]:  # İlk satırı atla (header)
-            if line.strip():
+        with open(PROC_MOUNTS, 'r') as f:
+            for line in f:
                 parts = line.split()
-                if len(parts) >= 6:
-                    storage.append({
-                        'filesystem': parts[0],
-                        'size': parts[1],
-                        'used': parts[2],
-                        'available': parts[3],
-                        'use_percent': parts[4],
-                        'mounted_on': parts[5]
-                    })
+                if len(parts) < 3 or parts[2] in PSEUDO_FILESYSTEMS:
+                    continue
+                # Aynı noktaya tekrar bağlanmışsa son bağlama geçerli
+                mounts[_unescape_mount(parts[1])] = (_unescape_mount(parts[0]), parts[2])
     except Exception as e:
         print(f"Storage info hatası: {e}")
+        return []
+    
+    storage = []
+    for mount_point, (filesystem, fs_type) in mounts.items():
+        try:
+            st = os.statvfs(mount_point)
+        except OSError:
+            continue
+        if st.f_blocks == 0:
+            continue
+        
+        size = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        available = st.f_bavail * st.f_frsize
+        # df ile aynı: kök için ayrılan bloklar hariç, yukarı yuvarlanmış
+        usable = used + available
+        
+        storage.append({
+            'filesystem': filesystem,
+            'type': fs_type,
+            'mounted_on': mount_point,
+            'size': size,
+            'used': used,
+            'available': available,
+            'use_percent': -(-used * 100 // usable) if usable else 0,
+            'inodes': st.f_files,
+            'inodes_used': st.f_files - st.f_ffree,
+            'inodes_free': st.f_favail
+        })
     
     return storage
 
+# Kablosuz: /proc/net/wireless (kalite, sinyal, gürültü) + nl80211 (SSID,
+# frekans, hız, istasyon sayısı); örnekleyici WIRELESS_INTERVAL'de bir yeniler
+PROC_NET_WIRELESS = '/proc/net/wireless'
+WIRELESS_INTERVAL = 10
+NL80211_RETRY_INTERVAL = 60  # nl80211 bulunamadıysa (sürücü henüz yüklenmemiş olabilir)
+
+# Generic netlink / nl80211 sabitleri (linux/genetlink.h, linux/nl80211.h)
+NETLINK_GENERIC = 16  # socket modülünde tanımlı değil
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_IFNAME = 4
+NL80211_ATTR_IFTYPE = 5
+NL80211_ATTR_STA_INFO = 21
+NL80211_ATTR_WIPHY_FREQ = 38
+NL80211_ATTR_SSID = 52
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_RATE_INFO_BITRATE = 1
+NL80211_RATE_INFO_BITRATE32 = 5
+NL80211_IFTYPES = {1: 'adhoc', 2: 'station', 3: 'ap', 4: 'ap_vlan', 6: 'monitor', 7: 'mesh'}
+
+_GENLMSGHDR = struct.Struct('=BBH')
+
+_wireless_snapshot = None  # (monotonic zaman, liste)
+_wireless_demand = 0
+_wireless_lock = threading.Lock()
+_nl80211_family = None  # None: henüz bulunamadı
+_nl80211_retry = 0  # aile bulunamadıysa tekrar sorulacağı an (monotonic)
+
+def _netlink_attr(attr_type, value):
+    """Tek netlink özniteliği (4 bayta hizalı)"""
+    data = _RTATTR.pack(_RTATTR.size + len(value), attr_type) + value
+    return data + b'\0' * (-len(data) % 4)
+
+def _genl_query(family, command, flags=0, attrs=b''):
+    """Generic netlink komutu; cevapların öznitelikleri listesi"""
+    payload = _GENLMSGHDR.pack(command, 1, 0) + attrs
+    return [netlink_attrs(body, _GENLMSGHDR.size)
+            for _, body in netlink_query(NETLINK_GENERIC, family, flags, payload)]
+
+def get_nl80211_family():
+    """nl80211 generic netlink aile numarası (bulunamazsa 0)
+
+    Başarısız sorgu kalıcı olarak önbelleğe alınmaz; NL80211_RETRY_INTERVAL
+    sonra yeniden denenir.
+    """
+    global _nl80211_family, _nl80211_retry
+    
+    if _nl80211_family is None and time.monotonic() >= _nl80211_retry:
+        try:
+            replies = _genl_query(GENL_ID_CTRL, CTRL_CMD_GETFAMILY,
+                                  attrs=_netlink_attr(CTRL_ATTR_FAMILY_NAME, b'nl80211\0'))
+            _nl80211_family = struct.unpack_from('=H', replies[0][CTRL_ATTR_FAMILY_ID])[0]
+        except (OSError, IndexError, KeyError, struct.error):
+            _nl80211_retry = time.monotonic() + NL80211_RETRY_INTERVAL
+    return _nl80211_family or 0
+
+def _nl80211_interfaces(family):
+    """nl80211 arayüzleri: ad -> {'mode', 'ssid', 'frequency_mhz', 'stations', ...}"""
+    interfaces = {}
+    for attrs in _genl_query(family, NL80211_CMD_GET_INTERFACE, NLM_F_DUMP):
+        if NL80211_ATTR_IFNAME not in attrs or NL80211_ATTR_IFINDEX not in attrs:
+            continue
+        name = attrs[NL80211_ATTR_IFNAME].rstrip(b'\0').decode('utf-8', 'replace')
+        ifindex = struct.unpack_from('=I', attrs[NL80211_ATTR_IFINDEX])[0]
+        iftype = struct.unpack_from('=I', attrs[NL80211_ATTR_IFTYPE])[0] if NL80211_ATTR_IFTYPE in attrs else 0
+        info = {
+            'mode': NL80211_IFTYPES.get(iftype, str(iftype)),
+            'ssid': attrs[NL80211_ATTR_SSID].decode('utf-8', 'replace') if NL80211_ATTR_SSID in attrs else '',
+            'frequency_mhz': struct.unpack_from('=I', attrs[NL80211_ATTR_WIPHY_FREQ])[0]
+                             if NL80211_ATTR_WIPHY_FREQ in attrs else None,
+            'stations': 0,
+            'signal_dbm': None,
+            'bitrate_mbps': None
+        }
+        
+        stations = _genl_query(family, NL80211_CMD_GET_STATION, NLM_F_DUMP,
+                               _netlink_attr(NL80211_ATTR_IFINDEX, struct.pack('=I', ifindex)))
+        info['stations'] = len(stations)
+        if info['mode'] == 'station' and stations:
+            # İstemci modunda tek istasyon bağlı olunan erişim noktasıdır
+            sta_info = netlink_attrs(stations[0].get(NL80211_ATTR_STA_INFO, b''))
+            if NL80211_STA_INFO_SIGNAL in sta_info:
+                info['signal_dbm'] = struct.unpack_from('=b', sta_info[NL80211_STA_INFO_SIGNAL])[0]
+            rate = netlink_attrs(sta_info.get(NL80211_STA_INFO_TX_BITRATE, b''))
+            if NL80211_RATE_INFO_BITRATE32 in rate:
+                info['bitrate_mbps'] = struct.unpack_from('=I', rate[NL80211_RATE_INFO_BITRATE32])[0] / 10
+            elif NL80211_RATE_INFO_BITRATE in rate:
+                info['bitrate_mbps'] = struct.unpack_from('=H', rate[NL80211_RATE_INFO_BITRATE])[0] / 10
+        
+        interfaces[name] = info
+    return interfaces
+
+def _wireless_dbm(value):
+    """/proc/net/wireless seviye sütunu -> dBm (göreli ölçekse None)
+
+    IW_QUAL_DBM bayrağı varsa çekirdek değeri zaten negatif yazar. Bayrağı
+    koymayan eski sürücülerin işaretsiz 8 bit dBm'i yalnızca makul aralıktaysa
+    (-110..-10 dBm) çevrilir; 70 gibi göreli değerler dBm sayılmaz.
+    """
+    if value < 0:
+        return value if value > -256 else None
+    if 146 <= value <= 246:
+        return value - 256
+    return None
+
+def _proc_net_wireless():
+    """/proc/net/wireless: ad -> {'quality', 'signal_dbm', 'noise_dbm'}"""
+    stats = {}
+    try:
+        with open(PROC_NET_WIRELESS, 'r') as f:
+            lines = f.readlines()[2:]
+    except OSError:
+        return stats
+    
+    for line in lines:
+        name, _, data = line.partition(':')
+        parts = [p.rstrip('.') for p in data.split()]
+        if len(parts) < 4:
+            continue
+        stats[name.strip()] = {
+            'quality': int(parts[1]),
+            'signal_dbm': _wireless_dbm(int(parts[2])),
+            'noise_dbm': _wireless_dbm(int(parts[3]))
+        }
+    return stats
+
+def _collect_wireless():
+    """nl80211 ve /proc/net/wireless'ı birleştir; ikisi de yoksa iwconfig"""
+    family = get_nl80211_family()
+    try:
+        nl_interfaces = _nl80211_interfaces(family) if family else {}
+    except OSError as e:
+        print(f"nl80211 hatası: {e}")
+        nl_interfaces = {}
+    proc_stats = _proc_net_wireless()
+    
+    if not nl_interfaces and proc_stats and shutil.which('iwconfig'):
+        # nl80211 desteklemeyen (wext) sürücüler: SSID için iwconfig'e düş
+        return _parse_iwconfig()
+    
+    wireless = []
+    for name in sorted(set(nl_interfaces) | set(proc_stats)):
+        info = {'mode': None, 'ssid': '', 'frequency_mhz': None, 'stations': None,
+                'signal_dbm': None, 'bitrate_mbps': None, 'quality': None, 'noise_dbm': None}
+        info.update(proc_stats.get(name, {}))
+        nl = nl_interfaces.get(name, {})
+        info.update({k: v for k, v in nl.items() if v is not None or k not in info})
+        if info['signal_dbm'] is None and name in proc_stats:
+            info['signal_dbm'] = proc_stats[name]['signal_dbm']
+        
+        info['interface'] = name
+        info['frequency'] = f"{info['frequency_mhz'] / 1000:.3f} GHz" if info['frequency_mhz'] else ''
+        info['signal'] = f"{info['signal_dbm']} dBm" if info['signal_dbm'] is not None else ''
+        info['bitrate'] = f"{info['bitrate_mbps']:g} Mb/s" if info['bitrate_mbps'] else ''
+        wireless.append(info)
+    return wireless
+
+def update_wireless(force=False):
+    """Örnekleyici turu: yakın zamanda istenmişse ve süresi dolduysa yenile"""
+    global _wireless_snapshot
+    
+    now = time.monotonic()
+    if not force and (now - _wireless_demand > PROCESS_TRACK_WINDOW or
+                      (_wireless_snapshot and now - _wireless_snapshot[0] < WIRELESS_INTERVAL)):
+        return
+    
+    with _wireless_lock:
+        _wireless_snapshot = (now, _collect_wireless())
+
 def get_wireless_info():
-    """WiFi bilgileri (OpenWRT/Keenetic tarzı)"""
+    """WiFi bilgileri (örnekleyicinin son okuması)"""
+    global _wireless_demand
+    
+    _wireless_demand = time.monotonic()
+    start_system_sampler()
+    snapshot = _wireless_snapshot
+    if snapshot is None or time.monotonic() - snapshot[0] > WIRELESS_INTERVAL * 2:
+        update_wireless(force=True)
+        snapshot = _wireless_snapshot
+    return snapshot[1]
+
+def _parse_iwconfig():
+    """Yedek: iwconfig çıktısından WiFi bilgileri"""
     wireless = []
     
     try:
@@ -273,241 +979,3299 @@ def get_wireless_info():
                     if match:
                         current_iface['signal'] = match.group(1).strip()
     
-    except Exception as e:
-        print(f"Wireless info hatası: {e}")
+    except Exception as e:
+        print(f"Wireless info hatası: {e}")
+    
+    return wireless
+
+# Dashboard toplayıcıları için kısa ömürlü önbellek: anahtar -> (zaman, değer)
+COLLECTOR_TTL = {'system': 60, 'storage': 5, 'interfaces': 10}  # interfaces: netlink yoksa
+
+_collector_cache = {}
+_collector_locks = {}
+_collector_locks_guard = threading.Lock()
+
+def cached_collect(key, collect):
+    """collect() sonucunu COLLECTOR_TTL[key] saniye boyunca paylaş
+
+    Aynı anda gelen istekler aynı toplayıcıyı tek kez çalıştırır.
+    """
+    entry = _collector_cache.get(key)
+    if entry and time.monotonic() - entry[0] < COLLECTOR_TTL[key]:
+        return entry[1]
+    
+    with _collector_locks_guard:
+        lock = _collector_locks.setdefault(key, threading.Lock())
+    
+    with lock:
+        entry = _collector_cache.get(key)
+        if entry and time.monotonic() - entry[0] < COLLECTOR_TTL[key]:
+            return entry[1]
+        value = collect()
+        _collector_cache[key] = (time.monotonic(), value)
+        return value
+
+def _dashboard_interfaces():
+    """Arayüz özeti: sayılar ve ad/durum/IPv4"""
+    interfaces = get_network_interfaces(statistics=False)
+    return {
+        'total': len(interfaces),
+        'up': sum(1 for i in interfaces if i['state'] == 'UP'),
+        'interfaces': [{'name': i['name'], 'state': i['state'], 'ipv4': i['ipv4']} for i in interfaces]
+    }
+
+def _dashboard_system():
+    """Hostname ve kernel (nadiren değişir)"""
+    info = get_system_info()
+    return {'hostname': info['hostname'], 'kernel': info['kernel']}
+
+# fields= ile seçilebilen dashboard alanları
+DASHBOARD_FIELDS = {
+    'cpu': lambda: sample_metrics(get_latest_sample())['cpu'],
+    'mem': lambda: sample_metrics(get_latest_sample())['mem'],
+    'load': lambda: sample_metrics(get_latest_sample())['load'],
+    'uptime': lambda: sample_metrics(get_latest_sample())['uptime'],
+    'system': lambda: cached_collect('system', _dashboard_system),
+    'storage': lambda: cached_collect('storage', get_storage_info),
+    'interfaces': _dashboard_interfaces,
+    'wireless': get_wireless_info
+}
+
+def get_dashboard(fields):
+    """İstenen dashboard alanlarını topla"""
+    return {field: DASHBOARD_FIELDS[field]() for field in fields}
+
+# İşlem tablosu: /proc/[pid]/stat taraması, CPU% örnekler arası jiffy farkından
+PROCESS_TRACK_WINDOW = 60  # son istekten bu kadar saniye sonra örnekleyici taramayı bırakır
+PROCESS_SORT_KEYS = ('cpu', 'mem', 'rss', 'pid')
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+_process_snapshot = None  # (monotonic zaman, pid -> kayıt)
+_process_demand = 0
+_process_lock = threading.Lock()
+_process_cmdlines = {}  # pid -> (starttime, komut satırı)
+_passwd_cache = (None, {})  # (imza, uid -> kullanıcı adı)
+
+def get_user_names():
+    """/etc/passwd'dan uid -> kullanıcı adı (dosya değişene kadar önbellekte)"""
+    global _passwd_cache
+    
+    signature = _file_signature('/etc/passwd')
+    if signature != _passwd_cache[0]:
+        names = {}
+        try:
+            with open('/etc/passwd', 'r') as f:
+                for line in f:
+                    parts = line.split(':')
+                    if len(parts) > 2 and parts[2].isdigit():
+                        names.setdefault(int(parts[2]), parts[0])
+        except OSError:
+            pass
+        _passwd_cache = (signature, names)
+    return _passwd_cache[1]
+
+def _read_process(pid):
+    """Tek işlemin /proc/[pid]/stat bilgisi (işlem bittiyse None)"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            data = f.read().decode('utf-8', 'replace')
+        uid = os.stat(f'/proc/{pid}').st_uid
+    except OSError:
+        return None
+    
+    # comm parantez ve boşluk içerebilir; son ')' sonrası alanlar sabit
+    close = data.rfind(')')
+    fields = data[close + 2:].split()
+    return {
+        'pid': pid,
+        'comm': data[data.find('(') + 1:close],
+        'state': fields[0],
+        'ppid': int(fields[1]),
+        'jiffies': int(fields[11]) + int(fields[12]),  # utime + stime
+        'threads': int(fields[17]),
+        'starttime': int(fields[19]),
+        'vsz': int(fields[20]) // 1024,
+        'rss': int(fields[21]) * PAGE_SIZE // 1024,
+        'uid': uid
+    }
+
+def scan_processes(previous):
+    """Tüm işlemleri tara; CPU% önceki taramaya göre, yoksa ömür boyu ortalama"""
+    now = time.monotonic()
+    table = {}
+    uptime_ticks = None
+    
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        proc = _read_process(int(name))
+        if proc is None:
+            continue
+        
+        prev = previous[1].get(proc['pid']) if previous else None
+        if prev is not None and prev['starttime'] == proc['starttime'] and now > previous[0]:
+            ticks = (now - previous[0]) * CLK_TCK
+            proc['cpu'] = round((proc['jiffies'] - prev['jiffies']) * 100.0 / ticks, 1)
+        else:
+            if uptime_ticks is None:
+                uptime_ticks = get_uptime()['uptime_seconds'] * CLK_TCK
+            lifetime = uptime_ticks - proc['starttime']
+            proc['cpu'] = round(proc['jiffies'] * 100.0 / lifetime, 1) if lifetime > 0 else 0.0
+        table[proc['pid']] = proc
+    
+    return now, table
+
+def _process_command(proc):
+    """Komut satırı (pid+starttime için önbellekte; çekirdek thread'leri [comm])"""
+    cached = _process_cmdlines.get(proc['pid'])
+    if cached is not None and cached[0] == proc['starttime']:
+        return cached[1]
+    
+    try:
+        with open(f"/proc/{proc['pid']}/cmdline", 'rb') as f:
+            raw = f.read()
+        command = raw.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+    except OSError:
+        command = ''
+    command = command or f"[{proc['comm']}]"
+    
+    _process_cmdlines[proc['pid']] = (proc['starttime'], command)
+    return command
+
+def update_process_snapshot(force=False):
+    """Örnekleyici turu: yakın zamanda istek geldiyse işlem tablosunu yenile"""
+    global _process_snapshot
+    
+    if not force and time.monotonic() - _process_demand > PROCESS_TRACK_WINDOW:
+        return
+    
+    with _process_lock:
+        _process_snapshot = scan_processes(_process_snapshot)
+        # Biten işlemlerin komut satırlarını unut
+        for pid in [p for p in _process_cmdlines if p not in _process_snapshot[1]]:
+            del _process_cmdlines[pid]
+
+def get_processes(sort='cpu', limit=0, user=None, name=None):
+    """Çalışan process listesi
+
+    sort: cpu | mem | rss (büyükten küçüğe) | pid; user: tam eşleşme;
+    name: komut veya işlem adında geçen metin. Dönüş: (liste, eşleşen sayısı)
+    """
+    global _process_demand
+    
+    _process_demand = time.monotonic()
+    start_system_sampler()
+    
+    snapshot = _process_snapshot
+    if snapshot is None or time.monotonic() - snapshot[0] > SAMPLER_INTERVAL * 2:
+        update_process_snapshot(force=True)
+        snapshot = _process_snapshot
+    
+    users = get_user_names()
+    mem_total = get_latest_sample()['memory']['total'] * 1024  # KB
+    name = name.lower() if name else None
+    
+    processes = []
+    with _process_lock:
+        for proc in snapshot[1].values():
+            user_name = users.get(proc['uid'], str(proc['uid']))
+            if user and user_name != user:
+                continue
+            command = _process_command(proc)
+            if name and name not in command.lower() and name not in proc['comm'].lower():
+                continue
+            
+            processes.append({
+                'pid': proc['pid'],
+                'ppid': proc['ppid'],
+                'user': user_name,
+                'state': proc['state'],
+                'cpu': proc['cpu'],
+                'mem': round(proc['rss'] * 100.0 / mem_total, 1) if mem_total else 0.0,
+                'vsz': proc['vsz'],
+                'rss': proc['rss'],
+                'threads': proc['threads'],
+                'command': command
+            })
+    
+    if sort == 'pid':
+        processes.sort(key=lambda p: p['pid'])
+    else:
+        processes.sort(key=lambda p: (p[sort], p['rss']), reverse=True)
+    
+    total = len(processes)
+    if limit > 0:
+        processes = processes[:limit]
+    return processes, total
+
+# Dinleyen soketler: /proc/net/{tcp,udp}{,6} + artımlı soket inode -> PID haritası
+SOCKET_TABLES = (
+    ('tcp', '/proc/net/tcp', socket.AF_INET),
+    ('tcp6', '/proc/net/tcp6', socket.AF_INET6),
+    ('udp', '/proc/net/udp', socket.AF_INET),
+    ('udp6', '/proc/net/udp6', socket.AF_INET6)
+)
+TCP_LISTEN = '0A'
+UDP_UNCONNECTED = '07'
+
+_socket_inodes = {}  # pid -> o işlemin soket inode'ları
+_inode_pids = {}  # inode -> pid
+_unresolved_inodes = set()  # tam taramada da sahibi bulunamayanlar (çekirdek soketleri)
+_socket_lock = threading.Lock()
+
+def _decode_socket_address(value, family):
+    """'0100007F:0035' -> ('127.0.0.1', 53)"""
+    address, port = value.split(':')
+    raw = bytes.fromhex(address)
+    if sys.byteorder == 'little':
+        # Çekirdek adresi 32-bit kelimeler halinde yerel bayt sırasıyla yazar
+        raw = b''.join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    return socket.inet_ntop(family, raw), int(port, 16)
+
+def _scan_process_sockets(pid):
+    """İşlemin açık soket inode'larını yeniden tara"""
+    inodes = set()
+    try:
+        fds = os.listdir(f'/proc/{pid}/fd')
+    except OSError:
+        fds = []
+    for fd in fds:
+        try:
+            target = os.readlink(f'/proc/{pid}/fd/{fd}')
+        except OSError:
+            continue
+        if target.startswith('socket:['):
+            inodes.add(int(target[8:-1]))
+    
+    for inode in _socket_inodes.pop(pid, ()):
+        if _inode_pids.get(inode) == pid:
+            del _inode_pids[inode]
+    _socket_inodes[pid] = inodes
+    for inode in inodes:
+        _inode_pids[inode] = pid
+
+def resolve_socket_owners(inodes):
+    """Soket inode'larının sahibi olan PID'ler
+
+    Yalnızca yeni görülen işlemlerin fd'leri taranır, biten işlemler
+    haritadan çıkarılır. Sahibi bilinmeyen yeni bir inode çıkarsa (eski
+    bir işlem sonradan soket açtıysa) tüm işlemler bir kez yeniden taranır.
+    """
+    with _socket_lock:
+        pids = {int(name) for name in os.listdir('/proc') if name.isdigit()}
+        for pid in [p for p in _socket_inodes if p not in pids]:
+            for inode in _socket_inodes.pop(pid):
+                if _inode_pids.get(inode) == pid:
+                    del _inode_pids[inode]
+        for pid in pids - _socket_inodes.keys():
+            _scan_process_sockets(pid)
+        
+        _unresolved_inodes.intersection_update(inodes)
+        missing = [i for i in inodes if i not in _inode_pids and i not in _unresolved_inodes]
+        if missing:
+            for pid in pids:
+                _scan_process_sockets(pid)
+            _unresolved_inodes.update(i for i in missing if i not in _inode_pids)
+        
+        return {inode: _inode_pids.get(inode) for inode in inodes}
+
+def get_listening_sockets():
+    """TCP dinleyen ve UDP bağlanmamış soketler: {'tcp': [...], 'udp': [...]}"""
+    sockets = []
+    for proto, path, family in SOCKET_TABLES:
+        wanted = TCP_LISTEN if proto.startswith('tcp') else UDP_UNCONNECTED
+        try:
+            with open(path, 'r') as f:
+                next(f, None)  # başlık
+                for line in f:
+                    parts = line.split()
+                    if len(parts) < 10 or parts[3] != wanted:
+                        continue
+                    address, port = _decode_socket_address(parts[1], family)
+                    sockets.append((proto, address, port, int(parts[9])))
+        except OSError:
+            continue  # IPv6 kapalı olabilir
+    
+    owners = resolve_socket_owners({s[3] for s in sockets if s[3]})
+    services = {'tcp': [], 'udp': []}
+    programs = {}
+    for proto, address, port, inode in sorted(sockets, key=lambda s: (s[2], s[0])):
+        pid = owners.get(inode)
+        if pid is not None and pid not in programs:
+            proc = _read_process(pid)
+            programs[pid] = proc['comm'] if proc else '-'
+        
+        services[proto[:3]].append({
+            'proto': proto,
+            'port': port,
+            'address': f"{address}:{port}",
+            'program': programs.get(pid, '-'),
+            'pid': pid,
+            'inode': inode
+        })
+    return services
+
+# Bağlantı izleme tablosu: satır satır okunur, bellek kullanımı sabit kalır
+CONNTRACK_FILES = ('/proc/net/nf_conntrack', '/proc/net/ip_conntrack')
+CONNTRACK_MAX_FILE = '/proc/sys/net/netfilter/nf_conntrack_max'
+CONNTRACK_TOP_DIMENSIONS = ('src', 'dst', 'dport')
+CONNTRACK_TOPK_CAPACITY = 64  # boyut başına izlenen en fazla anahtar
+CONNTRACK_PAGE_MAX = 500
+
+def topk_new(capacity):
+    """Space-Saving özeti: en sık anahtarlar için sabit boyutlu sayaç"""
+    return {'capacity': capacity, 'floor': 0, 'counters': {}}
+
+def topk_add(summary, key, amount=1):
+    """Anahtarı say; tablo 2x kapasiteye ulaşınca en küçükler atılır
+
+    Atılan en büyük sayaç 'floor' olur ve sonradan gelen yeni anahtarlar bu
+    değerle başlar (Space-Saving üst sınırı); eleme toplu yapıldığı için
+    eleman başına maliyet amortize O(log k) kalır.
+    """
+    counters = summary['counters']
+    entry = counters.get(key)
+    if entry is not None:
+        entry[0] += amount
+        return
+    
+    if len(counters) >= summary['capacity'] * 2:
+        ranked = sorted(counters.items(), key=lambda item: item[1][0], reverse=True)
+        summary['floor'] = max(summary['floor'], ranked[summary['capacity']][1][0])
+        summary['counters'] = counters = dict(ranked[:summary['capacity']])
+    
+    floor = summary['floor']
+    counters[key] = [floor + amount, floor]  # sayı, olası fazla sayım
+
+def topk_result(summary, limit):
+    """En büyük limit anahtar: [{'key', 'count', 'error'}, ...]"""
+    ranked = sorted(summary['counters'].items(), key=lambda item: item[1][0], reverse=True)
+    return [{'key': key, 'count': count, 'error': error} for key, (count, error) in ranked[:limit]]
+
+# [aile], protokol, zaman aşımı, [durum], orijinal yön src/dst/[sport/dport]
+# (eski ip_conntrack satırlarında aile sütunları yoktur, hep ipv4'tür)
+CONNTRACK_LINE_RE = re.compile(
+    r'(?:(\S+)\s+\d+\s+)?(\S+)\s+\d+\s+(\d+)\s+(?:([A-Z_]+)\s+)?src=(\S+) dst=(\S+)(?: sport=(\d+) dport=(\d+))?')
+CONNTRACK_COUNTER_RE = re.compile(r'(packets|bytes)=(\d+)')
+CONNTRACK_FLAG_RE = re.compile(r'\[([A-Z_]+)\]')
+
+def parse_conntrack_line(line, detail=False):
+    """nf_conntrack/ip_conntrack satırı -> bağlantı sözlüğü (orijinal yön)
+
+    detail=True ise iki yönün paket/bayt toplamı ve bayraklar da çıkarılır.
+    """
+    match = CONNTRACK_LINE_RE.match(line)
+    if match is None:
+        return None
+    
+    family, proto, timeout, state, src, dst, sport, dport = match.groups()
+    conn = {'family': family or 'ipv4', 'proto': proto, 'timeout': int(timeout), 'state': state,
+            'src': src, 'dst': dst,
+            'sport': int(sport) if sport else None, 'dport': int(dport) if dport else None}
+    
+    if detail:
+        conn['packets'] = conn['bytes'] = None
+        for key, value in CONNTRACK_COUNTER_RE.findall(line):
+            conn[key] = (conn[key] or 0) + int(value)
+        conn['flags'] = [flag.lower() for flag in CONNTRACK_FLAG_RE.findall(line)]
+    return conn
+
+def _conntrack_bytes(line):
+    """Satırdaki bayt sayaçlarının toplamı (muhasebe kapalıysa 0)"""
+    return sum(int(value) for key, value in CONNTRACK_COUNTER_RE.findall(line) if key == 'bytes')
+
+def scan_conntrack(offset=0, limit=100, top=10, weight='connections', filters=None):
+    """Tabloyu akış halinde tara: durum/protokol sayıları, en çok konuşanlar, sayfa
+
+    Bellekte yalnızca sayfadaki satırlar ve sabit boyutlu özetler tutulur.
+    """
+    path = next((p for p in CONNTRACK_FILES if os.path.exists(p)), None)
+    if path is None:
+        return None
+    
+    filters = list((filters or {}).items())
+    states = {}
+    protocols = {}
+    top_src, top_dst, top_dport = (topk_new(CONNTRACK_TOPK_CAPACITY) for _ in CONNTRACK_TOP_DIMENSIONS)
+    rows = []
+    matched = 0
+    total = 0
+    
+    with open(path, 'r') as f:
+        for line in f:
+            total += 1
+            conn = parse_conntrack_line(line)
+            if conn is None:
+                continue
+            if filters and any(conn[key] != value for key, value in filters):
+                continue
+            
+            if offset <= matched < offset + limit:
+                rows.append(parse_conntrack_line(line, detail=True))
+            matched += 1
+            
+            state = conn['state'] or '-'
+            states[state] = states.get(state, 0) + 1
+            protocols[conn['proto']] = protocols.get(conn['proto'], 0) + 1
+            
+            amount = _conntrack_bytes(line) if weight == 'bytes' else 1
+            topk_add(top_src, conn['src'], amount)
+            topk_add(top_dst, conn['dst'], amount)
+            if conn['dport'] is not None:
+                topk_add(top_dport, f"{conn['proto']}/{conn['dport']}", amount)
+    
+    try:
+        with open(CONNTRACK_MAX_FILE, 'r') as f:
+            maximum = int(f.read().strip())
+    except (OSError, ValueError):
+        maximum = None
+    
+    return {
+        'total': total,
+        'max': maximum,
+        'matched': matched,
+        'states': states,
+        'protocols': protocols,
+        'top': {
+            'src': topk_result(top_src, top),
+            'dst': topk_result(top_dst, top),
+            'dport': topk_result(top_dport, top)
+        },
+        'rows': rows
+    }
+
+# Log okuma: dosyalar sondan bloklarla okunur, imleç (inode, offset) ile artımlı devam edilir
+SYSTEM_LOG_FILES = ('/var/log/messages', '/opt/var/log/messages')
+KMSG_PATH = '/dev/kmsg'
+LOG_BLOCK_SIZE = 8192
+LOG_MAX_LINES = 1000
+
+def encode_log_cursor(*parts):
+    """Opak imleç: tamsayı parçaları hex olarak birleştirir"""
+    return '-'.join(f"{part:x}" for part in parts)
+
+def decode_log_cursor(cursor, count):
+    """İmleci tamsayı demetine çöz; geçersizse None"""
+    try:
+        parts = tuple(int(part, 16) for part in cursor.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return parts if len(parts) == count else None
+
+def _tail_lines(f, size, lines):
+    """Dosyayı sondan bloklarla okuyup son tam satırları ve bitiş konumunu döndür.
+
+    Okunan veri istenen satır sayısıyla orantılıdır; dosya boyutundan bağımsızdır.
+    Sonu newline ile bitmeyen (henüz yazılmakta olan) satır dahil edilmez.
+    """
+    pos, end = size, None
+    chunks, newlines = [], 0
+    while pos > 0 and newlines <= lines:
+        step = min(LOG_BLOCK_SIZE, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        if end is None:
+            cut = chunk.rfind(b'\n')
+            if cut < 0:
+                continue
+            end = pos + cut + 1
+            chunk = chunk[:cut + 1]
+        chunks.append(chunk)
+        newlines += chunk.count(b'\n')
+    
+    if end is None:
+        return [], 0
+    data = b''.join(reversed(chunks))
+    return [line.decode('utf-8', 'replace') for line in data.split(b'\n')[:-1][-lines:]], end
+
+def _read_lines_from(f, offset, limit):
+    """offset'ten itibaren en fazla limit tam satırı ve yeni konumu döndür"""
+    f.seek(offset)
+    logs = []
+    for raw in f:
+        if len(logs) >= limit or not raw.endswith(b'\n'):
+            break
+        logs.append(raw[:-1].decode('utf-8', 'replace'))
+        offset += len(raw)
+    return logs, offset
+
+def tail_file(path, lines=50, since=None):
+    """Dosyanın son satırlarını ya da imleçten sonra eklenen satırları oku.
+
+    İmleçteki inode değiştiyse (logrotate) ya da dosya kısaldıysa 'rotated'
+    işaretlenir ve yeni dosyanın son satırları döndürülür. Tek çağrıda en fazla
+    lines satır döner; 'more' kalan satırlar için tekrar çağrılması gerektiğini bildirir.
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        position = decode_log_cursor(since, 2) if since else None
+        if position and position[0] == st.st_ino and position[1] <= st.st_size:
+            logs, end = _read_lines_from(f, position[1], lines)
+            return {'logs': logs, 'cursor': encode_log_cursor(st.st_ino, end),
+                    'rotated': False, 'more': len(logs) >= lines and end < st.st_size}
+        
+        logs, end = _tail_lines(f, st.st_size, lines)
+        return {'logs': logs, 'cursor': encode_log_cursor(st.st_ino, end),
+                'rotated': position is not None, 'more': False}
+
+def parse_kmsg_record(record):
+    """Tek /dev/kmsg kaydını (seq, usec, priority, mesaj) olarak ayrıştır"""
+    header, _, message = record.partition(b';')
+    fields = header.split(b',')
+    # Devam satırları (" SUBSYSTEM=..." gibi) gösterilmez
+    message = message.split(b'\n', 1)[0].decode('utf-8', 'replace')
+    return int(fields[1]), int(fields[2]), int(fields[0]) & 7, message
+
+def read_kmsg(since=None):
+    """/dev/kmsg kayıtlarını (seq, usec, priority, mesaj) ve en son sıra numarasını oku.
+
+    Halka tampon boyutuyla sınırlıdır; since verilirse sadece daha yeni
+    sıra numaraları döner. Üzerine yazılmış kayıtlar (EPIPE) atlanır.
+    """
+    records, last_seq = [], None
+    fd = os.open(KMSG_PATH, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        while True:
+            try:
+                record = os.read(fd, LOG_BLOCK_SIZE)
+            except BlockingIOError:
+                break
+            except BrokenPipeError:
+                continue
+            if not record:
+                break
+            parsed = parse_kmsg_record(record)
+            last_seq = parsed[0]
+            if since is None or last_seq > since:
+                records.append(parsed)
+    finally:
+        os.close(fd)
+    return records, last_seq
+
+def format_kmsg(records):
+    """kmsg kayıtlarını dmesg -T biçiminde satırlara çevir"""
+    boot = time.time() - time.monotonic()
+    return [f"[{time.strftime('%a %b %d %H:%M:%S %Y', time.localtime(boot + usec / 1e6))}] {message}"
+            for _, usec, _, message in records]
+
+def get_kernel_log(lines=50, since=None):
+    """Kernel log mesajları (/dev/kmsg; imleç son okunan sıra numarasıdır)"""
+    position = decode_log_cursor(since, 1) if since else None
+    try:
+        records, last_seq = read_kmsg(position[0] if position else None)
+        rotated = bool(position and last_seq is not None and last_seq < position[0])
+        if rotated:
+            # Sıra numarası geriledi: sistem yeniden başlatılmış
+            records, last_seq = read_kmsg()
+    except (OSError, ValueError, IndexError):
+        # /dev/kmsg okunamıyorsa dmesg çıktısı (artımlı okuma yok)
+        try:
+            result = subprocess.run(['dmesg', '-T'], capture_output=True, text=True, timeout=5)
+            logs = result.stdout.splitlines()[-lines:]
+        except:
+            logs = []
+        return {'logs': logs, 'cursor': None, 'rotated': False, 'more': False}
+    
+    if position and not rotated:
+        page = records[:lines]
+        cursor = encode_log_cursor(page[-1][0]) if page else since
+        return {'logs': format_kmsg(page), 'cursor': cursor,
+                'rotated': False, 'more': len(records) > lines}
+    
+    records = records[-lines:]
+    cursor = encode_log_cursor(last_seq) if last_seq is not None else None
+    return {'logs': format_kmsg(records), 'cursor': cursor, 'rotated': rotated, 'more': False}
+
+def get_system_log(lines=50, since=None):
+    """System log: syslog dosyası sondan okunur, yoksa logread çıktısı"""
+    for path in SYSTEM_LOG_FILES:
+        if os.path.isfile(path):
+            try:
+                return tail_file(path, lines, since)
+            except OSError:
+                continue
+    
+    # OpenWRT logread (bellek içi tampon; artımlı okuma yok)
+    try:
+        result = subprocess.run(['logread'], capture_output=True, text=True, timeout=5)
+        logs = result.stdout.splitlines()[-lines:] if result.returncode == 0 else []
+    except:
+        logs = []
+    return {'logs': logs, 'cursor': None, 'rotated': False, 'more': False}
+
+# Canlı log akışı: her kaynak için tek okuyucu thread, satırlar abonelere dağıtılır
+LOG_STREAM_BUFFER = 256  # istemci başına bekleyen en fazla parti
+LOG_STREAM_POLL = 1
+LOG_STREAM_KEEPALIVE = 15
+
+_log_followers = {}  # source -> {'subscribers': {id: abone}, 'opened': bool}
+_log_follow_lock = threading.Lock()
+
+def resolve_log_source(source):
+    """Akış kaynağını (tür, hedef) olarak çöz; okunamıyorsa None"""
+    if source == 'kernel':
+        return ('kmsg', KMSG_PATH) if os.access(KMSG_PATH, os.R_OK) else None
+    if source == 'system':
+        for path in SYSTEM_LOG_FILES:
+            if os.path.isfile(path):
+                return ('file', path)
+        if shutil.which('logread'):
+            return ('logread', None)
+    return None
+
+def _log_batch(scope, lines, cursor, event='log'):
+    """Okuyucunun yayınladığı parti: SSE mesajı bir kez serileştirilir.
+
+    lines: [(konum, satır)] - konum tekrar gönderimde çakışan satırları ayıklamak için
+    """
+    return {
+        'scope': scope,
+        'lines': lines,
+        'count': len(lines),
+        'message': sse_event({'lines': [text for _, text in lines], 'cursor': cursor}, event, cursor)
+    }
+
+def _publish_log(follower, batch):
+    """Partiyi tüm abonelerin kuyruğuna koy; dolu kuyrukta parti düşürülür"""
+    with _log_follow_lock:
+        subscribers = list(follower['subscribers'].values())
+    for subscriber in subscribers:
+        try:
+            subscriber['queue'].put_nowait(batch)
+        except queue.Full:
+            subscriber['dropped'] += batch['count']
+
+def _log_follower_active(source, follower):
+    """Abone kalmadıysa okuyucuyu kayıttan çıkar"""
+    with _log_follow_lock:
+        if follower['subscribers']:
+            return True
+        if _log_followers.get(source) is follower:
+            del _log_followers[source]
+        return False
+
+def _follow_kmsg(source, follower, path):
+    """/dev/kmsg'yi sondan itibaren izle (sıra numarası imleçtir)"""
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        os.lseek(fd, 0, os.SEEK_END)
+        while _log_follower_active(source, follower):
+            ready, _, _ = select.select([fd], [], [], LOG_STREAM_POLL)
+            if not ready:
+                continue
+            records = []
+            while True:
+                try:
+                    record = os.read(fd, LOG_BLOCK_SIZE)
+                except BlockingIOError:
+                    break
+                except BrokenPipeError:
+                    continue
+                if not record:
+                    break
+                records.append(parse_kmsg_record(record))
+            if records:
+                lines = list(zip((r[0] for r in records), format_kmsg(records)))
+                _publish_log(follower, _log_batch((), lines, encode_log_cursor(records[-1][0])))
+    finally:
+        os.close(fd)
+
+def _follow_file(source, follower, path):
+    """Syslog dosyasını izle; inode değişince ya da dosya kısalınca baştan aç"""
+    f, inode, offset, pending = None, None, 0, b''
+    try:
+        while _log_follower_active(source, follower):
+            if f is None:
+                try:
+                    f = open(path, 'rb')
+                except OSError:
+                    time.sleep(LOG_STREAM_POLL)
+                    continue
+                inode = os.fstat(f.fileno()).st_ino
+                # İlk açılışta sondan, rotasyondan sonra baştan başla
+                offset = f.seek(0, os.SEEK_END) if not follower['opened'] else 0
+                follower['opened'] = True
+                pending = b''
+            
+            chunk = f.read(LOG_BLOCK_SIZE * 8)
+            if chunk:
+                parts = (pending + chunk).split(b'\n')
+                pending = parts.pop()
+                lines = []
+                for raw in parts:
+                    offset += len(raw) + 1
+                    lines.append((offset, raw.decode('utf-8', 'replace')))
+                if lines:
+                    _publish_log(follower, _log_batch((inode,), lines, encode_log_cursor(inode, offset)))
+                continue
+            
+            time.sleep(LOG_STREAM_POLL)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_ino != inode or st.st_size < offset + len(pending):
+                f.close()
+                f = None
+                _publish_log(follower, _log_batch((), [], None, 'rotated'))
+    finally:
+        if f is not None:
+            f.close()
+
+def _follow_logread(source, follower, target):
+    """logread -f çıktısını izle (imleç yok)
+
+    Ham fd okunur: tamponlu readline() birden çok satırı çekip select'i
+    yanıltır ve yarım satırda bloklanır.
+    """
+    proc = subprocess.Popen(['logread', '-f'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    fd = proc.stdout.fileno()
+    pending = b''
+    try:
+        while _log_follower_active(source, follower):
+            ready, _, _ = select.select([fd], [], [], LOG_STREAM_POLL)
+            if not ready:
+                continue
+            chunk = os.read(fd, LOG_BLOCK_SIZE)
+            if not chunk:
+                # logread sonlandı
+                break
+            parts = (pending + chunk).split(b'\n')
+            pending = parts.pop()
+            if parts:
+                lines = [(0, raw.decode('utf-8', 'replace')) for raw in parts]
+                _publish_log(follower, _log_batch((), lines, None))
+    finally:
+        proc.kill()
+        proc.wait()
+
+LOG_FOLLOWERS = {'kmsg': _follow_kmsg, 'file': _follow_file, 'logread': _follow_logread}
+
+def _log_follower_loop(source, follower, kind, target):
+    """Okuyucu hata verirse abonelere bildir ve kaydı temizle"""
+    try:
+        LOG_FOLLOWERS[kind](source, follower, target)
+    except Exception as e:
+        _publish_log(follower, {'scope': (), 'lines': [], 'count': 0,
+                                'message': sse_event({'error': str(e)}, 'error')})
+    finally:
+        with _log_follow_lock:
+            if _log_followers.get(source) is follower:
+                del _log_followers[source]
+
+def subscribe_log(source, kind, target):
+    """Aboneliği kaydet; kaynağın okuyucusu yoksa başlat"""
+    subscriber = {'queue': queue.Queue(maxsize=LOG_STREAM_BUFFER), 'dropped': 0}
+    with _log_follow_lock:
+        follower = _log_followers.get(source)
+        if follower is None:
+            follower = {'subscribers': {}, 'opened': False}
+            _log_followers[source] = follower
+            threading.Thread(target=_log_follower_loop, args=(source, follower, kind, target),
+                             daemon=True).start()
+        follower['subscribers'][id(subscriber)] = subscriber
+    return follower, subscriber
+
+def unsubscribe_log(follower, subscriber):
+    """Aboneliği kaldır; okuyucu bir sonraki turda kendini durdurur"""
+    with _log_follow_lock:
+        follower['subscribers'].pop(id(subscriber), None)
+
+def stream_logs(source, kind, target, since=None):
+    """Log satırlarını SSE olarak akıt.
+
+    since (ya da Last-Event-ID) verilirse önce kaçırılan satırlar /api/logs ile
+    aynı imleç mantığıyla gönderilir; canlı partilerde bunlarla çakışanlar atlanır.
+    Yavaş istemcinin kuyruğu dolarsa partiler düşürülür ve 'dropped' olayı gönderilir.
+    """
+    follower, subscriber = subscribe_log(source, kind, target)
+    try:
+        replayed = None
+        if since and kind != 'logread':
+            read_log = get_kernel_log if kind == 'kmsg' else get_system_log
+            while True:
+                result = read_log(LOG_MAX_LINES, since)
+                if result['logs'] or result['rotated']:
+                    yield sse_event({'lines': result['logs'], 'cursor': result['cursor'],
+                                     'rotated': result['rotated']}, 'log', result['cursor'])
+                since = result['cursor']
+                if not result['more'] or not since:
+                    break
+            replayed = decode_log_cursor(since, 1 if kind == 'kmsg' else 2)
+        
+        reported = 0
+        while True:
+            try:
+                batch = subscriber['queue'].get(timeout=LOG_STREAM_KEEPALIVE)
+            except queue.Empty:
+                batch = None
+            
+            if subscriber['dropped'] > reported:
+                yield sse_event({'count': subscriber['dropped'] - reported}, 'dropped')
+                reported = subscriber['dropped']
+            
+            if batch is None:
+                with _log_follow_lock:
+                    if _log_followers.get(source) is not follower:
+                        # Okuyucu durdu; istemci yeniden bağlanınca yenisi başlar
+                        return
+                yield ': keep-alive\n\n'
+                continue
+            
+            if replayed and batch['lines'] and batch['scope'] == replayed[:-1]:
+                if batch['lines'][0][0] <= replayed[-1]:
+                    lines = [text for position, text in batch['lines'] if position > replayed[-1]]
+                    if lines:
+                        cursor = encode_log_cursor(*batch['scope'], batch['lines'][-1][0])
+                        yield sse_event({'lines': lines, 'cursor': cursor}, 'log', cursor)
+                    continue
+                replayed = None
+            yield batch['message']
+    finally:
+        unsubscribe_log(follower, subscriber)
+
+# Log sorgusu: syslog dosyası üzerinde seyrek zaman indeksi ile sunucu tarafında filtreleme
+LOG_INDEX_INTERVAL = 64 * 1024  # kontrol noktası aralığı (bayt)
+LOG_QUERY_MAX_SCAN = 4 * 1024 * 1024  # istek başına taranan en fazla bayt
+LOG_QUERY_MAX_LIMIT = 500
+LOG_QUERY_SLACK = 60  # sırası bozuk satırlar için bitiş zamanı toleransı (saniye)
+LOG_QUERY_FIELDS = ('time', 'host', 'facility', 'severity', 'program', 'pid', 'message')
+
+SYSLOG_SEVERITIES = ('emerg', 'alert', 'crit', 'err', 'warning', 'notice', 'info', 'debug')
+SYSLOG_SEVERITY_ALIASES = {'panic': 'emerg', 'error': 'err', 'warn': 'warning'}
+SYSLOG_MONTHS = {name: number for number, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+# "Oct 18 12:00:01 [host] [facility.level] program[pid]: mesaj" ya da RFC 3339 zaman damgası
+SYSLOG_TIME_RE = re.compile(r'[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d|\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\S*')
+SYSLOG_LINE_RE = re.compile(
+    r'(?P<time>' + SYSLOG_TIME_RE.pattern + r')\s+'
+    r'(?:(?P<host>\S+)\s+)??'
+    r'(?:(?P<facility>[a-z0-9]+)\.(?P<severity>[a-z]+)\s+)?'
+    r'(?P<program>[^\s:\[]+)(?:\[(?P<pid>\d+)\])?:\s?(?P<message>.*)')
+
+_syslog_hour_cache = {}  # (yıl, ay, gün, saat) -> saat başı
+_syslog_year = (None, 0)  # (yıl, yılın bittiği an)
+_log_indexes = {}  # path -> {'inode', 'next': sıradaki sınır, 'offsets': [...], 'times': [...]}
+_log_index_lock = threading.Lock()
+
+def _syslog_hour_base(year, month, day, hour):
+    """Yerel saatle verilen saatin başlangıcı (unix zamanı, önbellekli)"""
+    key = (year, month, day, hour)
+    base = _syslog_hour_cache.get(key)
+    if base is None:
+        base = time.mktime((year, month, day, hour, 0, 0, 0, 0, -1))
+        if len(_syslog_hour_cache) > 20000:
+            _syslog_hour_cache.clear()
+        _syslog_hour_cache[key] = base
+    return base
+
+def parse_syslog_time(stamp):
+    """Syslog zaman damgasını unix zamanına çevir; yılsız damgalarda yıl tahmin edilir"""
+    if stamp[4] == '-':
+        try:
+            return datetime.fromisoformat(stamp.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+    
+    month = SYSLOG_MONTHS.get(stamp[:3])
+    if month is None:
+        return None
+    day, hour = int(stamp[4:6]), int(stamp[7:9])
+    global _syslog_year
+    
+    now = time.time()
+    if now >= _syslog_year[1]:
+        year = time.localtime(now).tm_year
+        _syslog_year = (year, time.mktime((year + 1, 1, 1, 0, 0, 0, 0, 0, -1)))
+    year = _syslog_year[0]
+    base = _syslog_hour_base(year, month, day, hour)
+    if base > now + 86400:
+        # Gelecekteki tarih: geçen yılın kaydı
+        base = _syslog_hour_base(year - 1, month, day, hour)
+    return base + int(stamp[10:12]) * 60 + int(stamp[13:15])
+
+def parse_syslog_line(line):
+    """Syslog satırını alanlarına ayır; biçim tanınmazsa sadece mesaj döner"""
+    match = SYSLOG_LINE_RE.match(line)
+    if match is None:
+        return {'time': None, 'host': None, 'facility': None, 'severity': None,
+                'program': None, 'pid': None, 'message': line}
+    
+    entry = match.groupdict()
+    entry['time'] = parse_syslog_time(entry['time'])
+    if entry['severity']:
+        entry['severity'] = SYSLOG_SEVERITY_ALIASES.get(entry['severity'], entry['severity'])
+    if entry['pid']:
+        entry['pid'] = int(entry['pid'])
+    return entry
+
+def update_log_index(path, f):
+    """Dosyanın seyrek zaman indeksini yeni eklenen kısım için güncelle.
+
+    Her LOG_INDEX_INTERVAL sınırından sonraki ilk satırın konumu ve zamanı
+    kaydedilir; sadece bu satırlar okunur. Zamanlar kümülatif maksimum olarak
+    tutulur, böylece sırası bozuk satırlarda da bisect ile aranabilir.
+    Inode değişir ya da dosya kısalırsa indeks baştan kurulur.
+    """
+    st = os.fstat(f.fileno())
+    with _log_index_lock:
+        index = _log_indexes.get(path)
+        if index is None or index['inode'] != st.st_ino or index['size'] > st.st_size:
+            index = {'inode': st.st_ino, 'size': 0, 'next': 0, 'offsets': [], 'times': []}
+            _log_indexes[path] = index
+        
+        while index['next'] < st.st_size:
+            f.seek(index['next'])
+            if index['next']:
+                # Sınırın ortasına düşen satırı atla
+                f.readline()
+            start = f.tell()
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                break
+            match = SYSLOG_TIME_RE.match(line.decode('utf-8', 'replace'))
+            stamp = parse_syslog_time(match.group()) if match else None
+            latest = index['times'][-1] if index['times'] else float('-inf')
+            index['offsets'].append(start)
+            index['times'].append(max(latest, stamp) if stamp is not None else latest)
+            index['next'] = max(index['next'] + LOG_INDEX_INTERVAL, f.tell())
+        
+        index['size'] = st.st_size
+        return index['inode'], list(index['offsets']), list(index['times'])
+
+def query_log(path, start=None, end=None, severity=None, facility=None, program=None,
+              pattern=None, cursor=None, limit=100):
+    """Syslog dosyasında filtrelenmiş satırları sayfalı olarak döndür.
+
+    Başlangıç konumu indeksten bulunur; tarama istek başına LOG_QUERY_MAX_SCAN
+    bayt ile sınırlıdır. Dönen cursor ile aynı filtrelerle sonraki sayfa istenir;
+    None ise aralığın sonuna gelinmiştir.
+    """
+    max_rank = SYSLOG_SEVERITIES.index(severity) if severity else None
+    with open(path, 'rb') as f:
+        inode, offsets, times = update_log_index(path, f)
+        position = decode_log_cursor(cursor, 2) if cursor else None
+        rotated = bool(position) and position[0] != inode
+        if position and not rotated:
+            offset = position[1]
+        elif start is not None and offsets:
+            offset = offsets[max(bisect.bisect_left(times, start) - 1, 0)]
+        else:
+            offset = 0
+        
+        f.seek(offset)
+        entries, scanned, last_time, finished = [], 0, None, True
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break
+            if len(entries) >= limit or scanned >= LOG_QUERY_MAX_SCAN:
+                finished = False
+                break
+            offset += len(raw)
+            scanned += len(raw)
+            
+            line = raw[:-1].decode('utf-8', 'replace')
+            if pattern is not None and not pattern.search(line):
+                # Zaman filtresi için damgayı yine de izle
+                if end is not None:
+                    match = SYSLOG_TIME_RE.match(line)
+                    stamp = parse_syslog_time(match.group()) if match else None
+                    if stamp is not None and stamp > end + LOG_QUERY_SLACK:
+                        break
+                continue
+            
+            entry = parse_syslog_line(line)
+            if entry['time'] is None:
+                # Devam satırı: önceki satırın zamanını kullan
+                entry['time'] = last_time
+            last_time = entry['time']
+            
+            if entry['time'] is not None:
+                if end is not None and entry['time'] > end:
+                    if entry['time'] > end + LOG_QUERY_SLACK:
+                        break
+                    continue
+                if start is not None and entry['time'] < start:
+                    continue
+            elif start is not None or end is not None:
+                continue
+            if max_rank is not None and (entry['severity'] not in SYSLOG_SEVERITIES or
+                                         SYSLOG_SEVERITIES.index(entry['severity']) > max_rank):
+                continue
+            if facility and entry['facility'] != facility:
+                continue
+            if program and entry['program'] != program:
+                continue
+            entries.append(entry)
+        
+        return {
+            'logs': entries,
+            'cursor': None if finished else encode_log_cursor(inode, offset),
+            'scanned': scanned,
+            'rotated': rotated
+        }
+
+# Dizin listesi: os.scandir ile tek geçiş, sıralı listeler dizin mtime'ına göre önbellekte
+DIR_CACHE_SIZE = 16
+DIR_CACHE_TTL = 10  # alt öğelerdeki boyut/mtime değişiklikleri dizin mtime'ını değiştirmez
+FILE_SORT_KEYS = {
+    'name': lambda item: item['name'].lower(),
+    'size': lambda item: item['size'],
+    'mtime': lambda item: item['mtime'],
+    'type': lambda item: (os.path.splitext(item['name'])[1].lower(), item['name'].lower())
+}
+FILE_LIST_FIELDS = ('name', 'path', 'is_dir', 'size', 'mtime', 'permissions')
+
+_dir_cache = {}  # path -> {'mtime_ns', 'time', 'items', 'sorted': {(sort, reverse): [...]}}
+_dir_cache_lock = threading.Lock()
+
+def scan_directory(path):
+    """Dizini os.scandir ile oku; öğe başına tek stat (DirEntry önbelleği)"""
+    items = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                # Kırık sembolik bağ: bağın kendi bilgileri
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+            is_dir = entry.is_dir()
+            items.append({
+                'name': entry.name,
+                'path': entry.path,
+                'is_dir': is_dir,
+                'size': 0 if is_dir else st.st_size,
+                'mtime': int(st.st_mtime),
+                'permissions': oct(st.st_mode)[-3:]
+            })
+    return items
+
+def list_directory(path, sort='name', reverse=False):
+    """Klasörler önce olacak şekilde sıralı liste (önbellekten).
+
+    Önbellek dizinin mtime'ı değişince ya da DIR_CACHE_TTL dolunca yenilenir;
+    her sıralama bir kez hesaplanır, sayfalar aynı listeden dilimlenir.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    now = time.time()
+    with _dir_cache_lock:
+        cached = _dir_cache.pop(path, None)
+        if cached is not None and (cached['mtime_ns'] != mtime_ns or now - cached['time'] > DIR_CACHE_TTL):
+            cached = None
+        if cached is not None:
+            _dir_cache[path] = cached
+    
+    if cached is None:
+        cached = {'mtime_ns': mtime_ns, 'time': now, 'items': scan_directory(path), 'sorted': {}}
+        with _dir_cache_lock:
+            _dir_cache[path] = cached
+            while len(_dir_cache) > DIR_CACHE_SIZE:
+                del _dir_cache[next(iter(_dir_cache))]
+    
+    key = (sort, reverse)
+    items = cached['sorted'].get(key)
+    if items is None:
+        items = sorted(cached['items'], key=FILE_SORT_KEYS[sort], reverse=reverse)
+        # Stabil sıralama: klasörler her iki yönde de önde kalır
+        items.sort(key=lambda item: not item['is_dir'])
+        cached['sorted'][key] = items
+    return items
+
+# Dosya adı indeksi: FILE_INDEX_ROOT bir kez taranır, inotify ile güncel tutulur.
+#
+# Öğeler paralel dizilerde tutulur (ad, üst klasör id'si, boyut, mtime, klasör mü);
+# adlar intern edilir. Her adın küçük harfli trigramları öğe id'lerine işaret eder,
+# aramada en kısa listelerin kesişimi aday kümesini verir. ctypes/inotify yoksa ya
+# da izleme sınırı (max_user_watches) dolarsa klasör mtime'ları periyodik taranır.
+FILE_INDEX_ROOT = '/opt'
+FILE_INDEX_RESCAN = 300
+FILE_SEARCH_MAX_LIMIT = 5000
+FILE_SEARCH_FIELDS = ('name', 'path', 'is_dir', 'size', 'mtime', 'parent')
+FILE_INDEX_ROOT_ID = -1
+FILE_INDEX_FREE = -2
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+FILE_INDEX_WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                         IN_CREATE | IN_DELETE | IN_ONLYDIR)
+_INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len
+
+_file_index = None
+_file_index_lock = threading.Lock()
+_file_indexer_lock = threading.Lock()
+_file_indexer_thread = None
+
+def _name_trigrams(name):
+    """Adın küçük harfli trigram kümesi"""
+    lowered = name.lower()
+    return {lowered[i:i + 3] for i in range(len(lowered) - 2)}
+
+def _new_file_index(root):
+    return {
+        'root': root,
+        'names': [],
+        'parents': array('i'),
+        'sizes': array('q'),
+        'mtimes': array('q'),
+        'is_dir': bytearray(),
+        'free': [],
+        'children': {FILE_INDEX_ROOT_ID: {}},  # klasör id -> {ad: öğe id}
+        'dirs': {FILE_INDEX_ROOT_ID: [root, None]},  # klasör id -> [yol, mtime_ns]
+        'postings': {},
+        'postings_size': 0,
+        'postings_stale': 0,
+        'inotify': None,
+        'watches': {},  # wd -> klasör id
+        'dir_watches': {},  # klasör id -> wd
+        'mode': 'rescan',
+        'built': None
+    }
+
+def _inotify_init():
+    """inotify tanımlayıcısı; ctypes yoksa ya da çekirdek desteklemiyorsa None"""
+    if ctypes is None:
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    return {'libc': libc, 'fd': fd} if fd >= 0 else None
+
+def _index_watch(index, did):
+    """Klasörü izlemeye al; sınır dolarsa periyodik taramaya geç"""
+    inotify = index['inotify']
+    if inotify is None or index['mode'] != 'inotify':
+        return
+    wd = inotify['libc'].inotify_add_watch(inotify['fd'], os.fsencode(index['dirs'][did][0]),
+                                           FILE_INDEX_WATCH_MASK)
+    if wd < 0:
+        if ctypes.get_errno() == errno.ENOSPC:
+            index['mode'] = 'rescan'
+        return
+    index['watches'][wd] = did
+    index['dir_watches'][did] = wd
+
+def _index_unwatch(index, did):
+    wd = index['dir_watches'].pop(did, None)
+    if wd is not None and index['watches'].get(wd) == did:
+        del index['watches'][wd]
+        index['inotify']['libc'].inotify_rm_watch(index['inotify']['fd'], wd)
+
+def _index_add(index, parent, name, st, is_dir):
+    """Öğeyi ekle (boş id varsa yeniden kullan) ve trigram listelerine kaydet"""
+    name = sys.intern(name)
+    size = 0 if is_dir else st.st_size
+    if index['free']:
+        eid = index['free'].pop()
+        index['names'][eid] = name
+        index['parents'][eid] = parent
+        index['sizes'][eid] = size
+        index['mtimes'][eid] = int(st.st_mtime)
+        index['is_dir'][eid] = is_dir
+    else:
+        eid = len(index['names'])
+        index['names'].append(name)
+        index['parents'].append(parent)
+        index['sizes'].append(size)
+        index['mtimes'].append(int(st.st_mtime))
+        index['is_dir'].append(is_dir)
+    
+    index['children'][parent][name] = eid
+    for trigram in _name_trigrams(name):
+        postings = index['postings'].get(trigram)
+        if postings is None:
+            postings = index['postings'][trigram] = array('i')
+        postings.append(eid)
+        index['postings_size'] += 1
+    
+    if is_dir:
+        index['children'][eid] = {}
+        index['dirs'][eid] = [os.path.join(index['dirs'][parent][0], name), None]
+        _index_watch(index, eid)
+    return eid
+
+def _index_remove(index, eid):
+    """Öğeyi (klasörse alt ağacıyla) sil; trigram listelerindeki eski id'ler aramada elenir"""
+    parent = index['parents'][eid]
+    index['children'][parent].pop(index['names'][eid], None)
+    stack = [eid]
+    while stack:
+        current = stack.pop()
+        if index['is_dir'][current]:
+            stack.extend(index['children'].pop(current, {}).values())
+            index['dirs'].pop(current, None)
+            _index_unwatch(index, current)
+        index['postings_stale'] += len(_name_trigrams(index['names'][current]))
+        index['parents'][current] = FILE_INDEX_FREE
+        index['names'][current] = ''
+        index['free'].append(current)
+
+def _index_compact(index):
+    """Silinen öğelerin payı yarıyı geçince trigram listelerini yeniden kur"""
+    if index['postings_stale'] * 2 < index['postings_size']:
+        return
+    postings, size = {}, 0
+    for eid, name in enumerate(index['names']):
+        if index['parents'][eid] == FILE_INDEX_FREE:
+            continue
+        for trigram in _name_trigrams(name):
+            postings.setdefault(trigram, array('i')).append(eid)
+            size += 1
+    index['postings'], index['postings_size'], index['postings_stale'] = postings, size, 0
+
+def _index_apply(index, did, name, st, is_dir):
+    """Diskteki öğeyi indekse uygula; yeni eklenen klasörün id'sini döndür"""
+    eid = index['children'][did].get(name)
+    if eid is not None and bool(index['is_dir'][eid]) != is_dir:
+        _index_remove(index, eid)
+        eid = None
+    if eid is None:
+        eid = _index_add(index, did, name, st, is_dir)
+        return eid if is_dir else None
+    index['sizes'][eid] = 0 if is_dir else st.st_size
+    index['mtimes'][eid] = int(st.st_mtime)
+    return None
+
+def _index_scan_dir(index, did):
+    """Klasörü oku, indeksteki çocuklarıyla eşitle; yeni klasörlere inilir.
+
+    Sembolik bağlar izlenmez (döngü ve indeks dışı ağaçlara taşmayı önler).
+    """
+    stack = [did]
+    while stack:
+        current = stack.pop()
+        info = index['dirs'].get(current)
+        if info is None:
+            continue
+        try:
+            info[1] = os.stat(info[0]).st_mtime_ns
+            with os.scandir(info[0]) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        seen = set()
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            seen.add(entry.name)
+            new_dir = _index_apply(index, current, entry.name, st, stat.S_ISDIR(st.st_mode))
+            if new_dir is not None:
+                stack.append(new_dir)
+        
+        children = index['children'][current]
+        for name in [name for name in children if name not in seen]:
+            _index_remove(index, children[name])
+
+def _index_update_child(index, did, name):
+    """inotify olayındaki tek öğeyi diskteki durumuna göre güncelle"""
+    info = index['dirs'].get(did)
+    if info is None:
+        return
+    try:
+        st = os.lstat(os.path.join(info[0], name))
+    except OSError:
+        eid = index['children'][did].get(name)
+        if eid is not None:
+            _index_remove(index, eid)
+        return
+    new_dir = _index_apply(index, did, name, st, stat.S_ISDIR(st.st_mode))
+    if new_dir is not None:
+        _index_scan_dir(index, new_dir)
+
+def _read_inotify_events(index):
+    """Bekleyen inotify olaylarını (klasör id, ad) değişikliklerine çevir.
+
+    Kuyruk taştıysa None döner: tüm klasörlerin mtime'ı kontrol edilmeli.
+    """
+    changes, overflow = set(), False
+    fd = index['inotify']['fd']
+    while True:
+        try:
+            data = os.read(fd, 65536)
+        except BlockingIOError:
+            break
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            did = index['watches'].get(wd)
+            if mask & IN_IGNORED:
+                # Klasör silindi ya da izleme kaldırıldı
+                if did is not None:
+                    del index['watches'][wd]
+                    index['dir_watches'].pop(did, None)
+                continue
+            if did is not None and name:
+                changes.add((did, name))
+    return None if overflow else changes
+
+def _changed_index_dirs(index):
+    """mtime'ı indekstekinden farklı olan klasörler"""
+    changed = []
+    for did, (path, mtime_ns) in list(index['dirs'].items()):
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                changed.append(did)
+        except OSError:
+            changed.append(index['parents'][did] if did != FILE_INDEX_ROOT_ID else did)
+    return changed
+
+def _file_indexer_loop():
+    """İndeksi bir kez kur, ardından değişiklikleri uygula"""
+    global _file_index
+    
+    while True:
+        index = _new_file_index(FILE_INDEX_ROOT)
+        try:
+            index['inotify'] = _inotify_init()
+            if index['inotify'] is not None:
+                index['mode'] = 'inotify'
+            _index_watch(index, FILE_INDEX_ROOT_ID)
+            _index_scan_dir(index, FILE_INDEX_ROOT_ID)
+            break
+        except Exception as e:
+            print(f"Dosya indeksi kurulamadı: {e}")
+            if index['inotify'] is not None:
+                os.close(index['inotify']['fd'])
+            # Aramalar bu arada os.walk ile yanıtlanır
+            time.sleep(FILE_INDEX_RESCAN)
+    index['built'] = time.time()
+    with _file_index_lock:
+        _file_index = index
+    
+    next_rescan = time.time() + FILE_INDEX_RESCAN
+    resync = False
+    while True:
+        changes, dirs = set(), []
+        try:
+            # inotify kipinde olay gelene kadar beklenir; periyodik mtime
+            # karşılaştırması yalnızca 'rescan' kipinde yapılır
+            if resync:
+                timeout = 0
+            elif index['mode'] == 'rescan':
+                timeout = max(next_rescan - time.time(), 0)
+            else:
+                timeout = None
+            if index['inotify'] is not None:
+                ready, _, _ = select.select([index['inotify']['fd']], [], [], timeout)
+                if ready:
+                    changes = _read_inotify_events(index)
+            else:
+                time.sleep(timeout)
+            
+            rescan = changes is None or resync or (index['mode'] == 'rescan' and time.time() >= next_rescan)
+            dirs = _changed_index_dirs(index) if rescan else []
+            if rescan:
+                next_rescan = time.time() + FILE_INDEX_RESCAN
+                resync = False
+            if not changes and not dirs:
+                continue
+            
+            with _file_index_lock:
+                for did, name in changes or ():
+                    _index_update_child(index, did, name)
+                for did in dirs:
+                    _index_scan_dir(index, did)
+                _index_compact(index)
+        except Exception as e:
+            print(f"Dosya indeksi hatası: {e}")
+            # Yarım kalan klasörler bir sonraki turda mtime farkıyla baştan okunur
+            for did in {did for did, _ in changes or ()} | set(dirs):
+                if did in index['dirs']:
+                    index['dirs'][did][1] = None
+            resync = True
+            time.sleep(1)
+
+def start_file_indexer():
+    """Dosya adı indeksleyicisini başlat"""
+    global _file_indexer_thread
+    
+    with _file_indexer_lock:
+        if _file_indexer_thread is None or not _file_indexer_thread.is_alive():
+            _file_indexer_thread = threading.Thread(target=_file_indexer_loop, name='file-indexer', daemon=True)
+            _file_indexer_thread.start()
+
+def file_matcher(query, mode='substring'):
+    """Ad eşleştirici ve aday daraltmada kullanılacak sabit metin.
+
+    substring: büyük/küçük harf duyarsız içerme, glob: fnmatch deseni (tüm ad),
+    regex: ad üzerinde re.search. Sabit metin yoksa (ya da 3 karakterden kısaysa)
+    tüm adlar taranır.
+    """
+    if mode == 'glob':
+        pattern = re.compile(fnmatch.translate(query), re.IGNORECASE)
+        literal = max(re.split(r'\[[^\]]*\]|[*?]', query), key=len)
+        return pattern.match, literal.lower()
+    if mode == 'regex':
+        pattern = re.compile(query, re.IGNORECASE)
+        return pattern.search, query.lower() if re.escape(query) == query else ''
+    lowered = query.lower()
+    return (lambda name: lowered in name.lower()), lowered
+
+def file_filters_match(is_dir, size, mtime, filters):
+    """Tür/boyut/mtime filtreleri"""
+    kind = filters.get('kind')
+    if kind and (kind == 'dir') != bool(is_dir):
+        return False
+    if filters.get('min_size') is not None and (is_dir or size < filters['min_size']):
+        return False
+    if filters.get('max_size') is not None and (is_dir or size > filters['max_size']):
+        return False
+    if filters.get('newer') is not None and mtime < filters['newer']:
+        return False
+    if filters.get('older') is not None and mtime > filters['older']:
+        return False
+    return True
+
+def search_file_index(index, match, literal, search_path, filters, limit):
+    """İndeksten ara: (sonuçlar, toplam eşleşme)"""
+    trigrams = _name_trigrams(literal) if literal else set()
+    if trigrams:
+        postings = sorted((index['postings'].get(trigram, ()) for trigram in trigrams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        candidates = sorted(candidates)
+    else:
+        candidates = range(len(index['names']))
+    
+    prefix = search_path.rstrip('/') + '/'
+    names, parents, sizes, mtimes, is_dir = (index['names'], index['parents'], index['sizes'],
+                                             index['mtimes'], index['is_dir'])
+    results, count = [], 0
+    for eid in candidates:
+        parent = parents[eid]
+        if parent == FILE_INDEX_FREE or not match(names[eid]):
+            continue
+        if not file_filters_match(is_dir[eid], sizes[eid], mtimes[eid], filters):
+            continue
+        parent_path = index['dirs'][parent][0]
+        if not (parent_path + '/').startswith(prefix):
+            continue
+        count += 1
+        if len(results) < limit:
+            results.append({
+                'name': names[eid],
+                'path': os.path.join(parent_path, names[eid]),
+                'is_dir': bool(is_dir[eid]),
+                'size': sizes[eid],
+                'mtime': mtimes[eid],
+                'parent': parent_path
+            })
+    return results, count
+
+def walk_search(search_path, match, filters, limit):
+    """İndeks hazır değilken os.walk ile ara (limit dolunca durur)"""
+    results = []
+    for root, dirs, files in os.walk(search_path):
+        for name, is_dir in [(name, True) for name in dirs] + [(name, False) for name in files]:
+            if not match(name):
+                continue
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            size = 0 if is_dir else st.st_size
+            if file_filters_match(is_dir, size, int(st.st_mtime), filters):
+                results.append({'name': name, 'path': os.path.join(root, name), 'is_dir': is_dir,
+                                'size': size, 'mtime': int(st.st_mtime), 'parent': root})
+        if len(results) >= limit:
+            break
+    return results[:limit], min(len(results), limit)
+
+def search_files_indexed(query, mode, search_path, filters, limit):
+    """Dosya adı araması; indeks kurulana kadar os.walk kullanılır"""
+    start_file_indexer()
+    match, literal = file_matcher(query, mode)
+    with _file_index_lock:
+        index = _file_index
+        if index is not None and (search_path + '/').startswith(index['root'].rstrip('/') + '/'):
+            results, count = search_file_index(index, match, literal, search_path, filters, limit)
+            return results, count, index
+    results, count = walk_search(search_path, match, filters, limit)
+    return results, count, None
+
+# opkg dosya yolları (Entware varsayılanları; lists_dir opkg.conf'tan okunur)
+OPKG_CONF = '/opt/etc/opkg.conf'
+OPKG_LISTS_DIR = '/opt/var/opkg-lists'
+OPKG_STATUS_FILE = '/opt/lib/opkg/status'
+
+# Paket listesinde tutulacak alanlar (geri kalanlar bellekte tutulmaz)
+OPKG_FIELDS = ('Package', 'Version', 'Depends', 'Provides', 'Description',
+               'Installed-Size', 'Size', 'Section', 'Architecture', 'Status')
+
+# Ayrıştırılmış opkg dosyaları: path -> {'sig': (mtime_ns, size), 'digest': md5, 'packages': [...]}
+_opkg_file_cache = {}
+# Birleştirilmiş paket durumu (dosya imzası değişene kadar geçerli)
+_package_state = None
+_package_generation = 0
+_package_lock = threading.Lock()
+
+def get_opkg_paths():
+    """opkg.conf içinden lists_dir ve status dosyası yolunu bul"""
+    lists_dir = OPKG_LISTS_DIR
+    
+    try:
+        with open(OPKG_CONF, 'r') as f:
+            for line in f:
+                parts = line.split()
+                # lists_dir ext /opt/var/opkg-lists
+                if len(parts) >= 3 and parts[0] == 'lists_dir':
+                    lists_dir = parts[2]
+    except:
+        pass
+    
+    return lists_dir, OPKG_STATUS_FILE
+
+def parse_opkg_control(text):
+    """opkg Packages/status formatını paket sözlüklerine ayrıştır"""
+    packages = []
+    fields = {}
+    
+    for line in text.split('\n'):
+        if not line.strip():
+            # Boş satır: paket kaydı bitti
+            if 'Package' in fields:
+                packages.append(fields)
+            fields = {}
+        elif line[0] in ' \t':
+            # Çok satırlı alanların devamı (açıklamanın sadece ilk satırı tutulur)
+            continue
+        else:
+            key, sep, value = line.partition(':')
+            if sep and key in OPKG_FIELDS:
+                fields[key] = value.strip()
+    
+    if 'Package' in fields:
+        packages.append(fields)
+    
+    return packages
+
+def _version_order(c):
+    """dpkg/opkg sürüm karşılaştırmasında karakter ağırlığı"""
+    if c == '~':
+        return -1
+    if not c or c in '0123456789':
+        return 0
+    if ('a' <= c <= 'z') or ('A' <= c <= 'Z'):
+        return ord(c)
+    return ord(c) + 256
+
+def _verrevcmp(a, b):
+    """Sürüm parçalarını opkg'nin verrevcmp algoritmasıyla karşılaştır"""
+    i = j = 0
+    digits = '0123456789'
+    
+    while i < len(a) or j < len(b):
+        # Rakam olmayan kısım
+        while (i < len(a) and a[i] not in digits) or (j < len(b) and b[j] not in digits):
+            ac = _version_order(a[i] if i < len(a) else '')
+            bc = _version_order(b[j] if j < len(b) else '')
+            if ac != bc:
+                return ac - bc
+            i += 1
+            j += 1
+        
+        # Sayısal kısım (baştaki sıfırlar atlanır)
+        while i < len(a) and a[i] == '0':
+            i += 1
+        while j < len(b) and b[j] == '0':
+            j += 1
+        
+        first_diff = 0
+        while i < len(a) and a[i] in digits and j < len(b) and b[j] in digits:
+            if not first_diff:
+                first_diff = ord(a[i]) - ord(b[j])
+            i += 1
+            j += 1
+        
+        if i < len(a) and a[i] in digits:
+            return 1
+        if j < len(b) and b[j] in digits:
+            return -1
+        if first_diff:
+            return first_diff
+    
+    return 0
+
+def _split_version(version):
+    """'epoch:upstream-revision' -> (epoch, upstream, revision)"""
+    epoch = 0
+    if ':' in version:
+        head, _, version = version.partition(':')
+        try:
+            epoch = int(head)
+        except ValueError:
+            epoch = 0
+    upstream, _, revision = version.rpartition('-')
+    if not upstream:
+        return epoch, revision, ''
+    return epoch, upstream, revision
+
+def compare_versions(a, b):
+    """opkg uyumlu sürüm karşılaştırma: a < b ise negatif, eşitse 0, büyükse pozitif"""
+    epoch_a, upstream_a, revision_a = _split_version(a)
+    epoch_b, upstream_b, revision_b = _split_version(b)
+    
+    if epoch_a != epoch_b:
+        return epoch_a - epoch_b
+    
+    return _verrevcmp(upstream_a, upstream_b) or _verrevcmp(revision_a, revision_b)
+
+def _list_feed_files(lists_dir):
+    """lists_dir altındaki feed index dosyaları"""
+    try:
+        names = sorted(os.listdir(lists_dir))
+    except OSError:
+        return []
+    
+    return [os.path.join(lists_dir, name) for name in names
+            if not name.startswith('.') and not name.endswith('.sig')]
+
+def _file_signature(path):
+    """Dosya imzası (mtime, boyut); dosya yoksa None"""
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _load_opkg_file(path, sig):
+    """opkg dosyasını oku; (paketler, içerik değişti mi) döndür
+
+    İmza (mtime, boyut) aynıysa dosya okunmaz. İmza değişse de içerik
+    aynıysa (opkg update dosyayı yeniden yazdığında) tekrar ayrıştırılmaz.
+    """
+    cached = _opkg_file_cache.get(path)
+    if cached and cached['sig'] == sig:
+        return cached['packages'], False
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    digest = hashlib.md5(data).hexdigest()
+    if cached and cached['digest'] == digest:
+        cached['sig'] = sig
+        return cached['packages'], False
+    
+    # Sıkıştırılmış index (Packages.gz) desteği
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    
+    packages = parse_opkg_control(data.decode('utf-8', errors='replace'))
+    _opkg_file_cache[path] = {'sig': sig, 'digest': digest, 'packages': packages}
+    return packages, True
+
+def _build_package_state(feed_files, status_file, signature, previous):
+    """Feed index ve status dosyalarından paket durumunu oluştur
+
+    Sadece içeriği değişen dosyalar yeniden ayrıştırılır; hiçbiri
+    değişmediyse önceki durum (aynı nesil) yeni imzayla döner.
+    """
+    global _package_generation
+    
+    present = {path for path, sig in signature.items() if sig is not None}
+    changed = previous is None or present != {
+        path for path, sig in previous['signature'].items() if sig is not None}
+    
+    # Yüklü paketler (status: "install ok installed")
+    status_packages = []
+    if signature[status_file] is not None:
+        status_packages, file_changed = _load_opkg_file(status_file, signature[status_file])
+        changed = changed or file_changed
+    
+    # Feed paketleri
+    feed_packages = []
+    for path in feed_files:
+        if signature[path] is None:
+            continue
+        try:
+            packages, file_changed = _load_opkg_file(path, signature[path])
+            feed_packages.append(packages)
+            changed = changed or file_changed
+        except Exception as e:
+            print(f"Feed okuma hatası ({path}): {e}")
+    
+    # Artık var olmayan dosyaları önbellekten at
+    for path in list(_opkg_file_cache):
+        if path not in signature:
+            del _opkg_file_cache[path]
+    
+    if not changed:
+        return dict(previous, signature=signature)
+    
+    installed = {}
+    for fields in status_packages:
+        status = fields.get('Status', '').split()
+        if len(status) >= 3 and status[2] == 'installed':
+            installed[fields['Package']] = fields
+    
+    # Aynı paket birden çok feed'de varsa en yüksek sürüm geçerlidir (opkg gibi)
+    available = {}
+    for packages in feed_packages:
+        for fields in packages:
+            current = available.get(fields['Package'])
+            if current is None or compare_versions(fields.get('Version', ''), current.get('Version', '')) > 0:
+                available[fields['Package']] = fields
+    
+    packages = []
+    for name in sorted(set(available) | set(installed)):
+        fields = available.get(name) or installed[name]
+        packages.append({
+            'name': name,
+            'version': fields.get('Version', ''),
+            'description': fields.get('Description', ''),
+            'installed': name in installed
+        })
+    
+    _package_generation += 1
+    
+    # HTTP doğrulayıcısı: nesil sayacı yeniden başlatmada sıfırlanır, içerik özeti sıfırlanmaz
+    digests = sorted((path, _opkg_file_cache[path]['digest'])
+                     for path in present if path in _opkg_file_cache)
+    
+    return {
+        'signature': signature,
+        'generation': _package_generation,
+        'version': hashlib.md5(repr(digests).encode('utf-8')).hexdigest(),
+        'feed_files': feed_files,
+        'packages': packages,
+        'available': available,
+        'installed': installed
+    }
+
+def get_package_state():
+    """Paket durumunu döndür (opkg dosyaları değişmediyse bellekten)
+
+    Başka bir thread durumu yeniden oluştururken beklenmez; hazır olan
+    önceki durum döndürülür.
+    """
+    global _package_state
+    
+    lists_dir, status_file = get_opkg_paths()
+    feed_files = _list_feed_files(lists_dir)
+    signature = {path: _file_signature(path) for path in feed_files + [status_file]}
+    
+    state = _package_state
+    if state is not None and state['signature'] == signature:
+        return state
+    
+    if not _package_lock.acquire(blocking=state is None):
+        return state
+    
+    try:
+        state = _package_state
+        if state is None or state['signature'] != signature:
+            state = _build_package_state(feed_files, status_file, signature, state)
+            _package_state = state
+    finally:
+        _package_lock.release()
+    
+    return state
+
+# Paket arama indeksi (her paket durumu nesli için bir kez oluşturulur)
+_package_index = None
+_package_index_lock = threading.Lock()
+
+# /api/packages sayfalama sınırları
+PACKAGE_PAGE_SIZE = 100
+PACKAGE_PAGE_MAX = 1000
+
+def _trigrams(text):
+    """Metnin 3'lü harf gruplarını döndür"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _build_package_index(state):
+    """İsim/açıklama için prefix + trigram arama indeksi oluştur"""
+    packages = state['packages']
+    names = [pkg['name'].lower() for pkg in packages]
+    texts = [names[i] + '\n' + pkg['description'].lower() for i, pkg in enumerate(packages)]
+    
+    # Prefix araması için sıralı isimler (bisect)
+    order = sorted(range(len(names)), key=names.__getitem__)
+    
+    # Trigram -> paket sırası listesi (artan sırada)
+    postings = {}
+    for i, text in enumerate(texts):
+        for tri in _trigrams(text):
+            posting = postings.get(tri)
+            if posting is None:
+                posting = postings[tri] = array('I')
+            posting.append(i)
+    
+    return {
+        'generation': state['generation'],
+        'names': names,
+        'texts': texts,
+        'sorted_names': [names[i] for i in order],
+        'sorted_ids': order,
+        'postings': postings
+    }
+
+def get_package_index(state):
+    """Paket durumuna ait arama indeksini döndür"""
+    global _package_index
+    
+    index = _package_index
+    if index is not None and index['generation'] == state['generation']:
+        return index
+    
+    with _package_index_lock:
+        index = _package_index
+        if index is None or index['generation'] != state['generation']:
+            index = _build_package_index(state)
+            _package_index = index
+    
+    return index
+
+def search_packages(state, query='', installed=None):
+    """İndeksten eşleşen paket sıralarını döndür (isim eşleşmeleri önce)"""
+    index = get_package_index(state)
+    packages = state['packages']
+    names = index['names']
+    query = query.strip().lower()
+    
+    if not query:
+        ids = range(len(packages))
+    else:
+        if len(query) >= 3:
+            # Trigram listelerinin kesişimi, en kısa listeden başlayarak
+            posting_lists = [index['postings'].get(tri) for tri in _trigrams(query)]
+            if any(p is None for p in posting_lists):
+                candidates = []
+            else:
+                posting_lists.sort(key=len)
+                candidates = set(posting_lists[0])
+                for posting in posting_lists[1:]:
+                    candidates.intersection_update(posting)
+                candidates = sorted(candidates)
+        else:
+            candidates = range(len(packages))
+        
+        texts = index['texts']
+        matches = [i for i in candidates if query in texts[i]]
+        
+        # İsim başı eşleşmeleri (bisect ile)
+        sorted_names = index['sorted_names']
+        start = bisect.bisect_left(sorted_names, query)
+        end = bisect.bisect_left(sorted_names, query + '\uffff')
+        prefix = set(index['sorted_ids'][start:end])
+        
+        def rank(i):
+            if names[i] == query:
+                return 0
+            if i in prefix:
+                return 1
+            if query in names[i]:
+                return 2
+            return 3
+        
+        ids = sorted(matches, key=lambda i: (rank(i), i))
+    
+    if installed is not None:
+        ids = [i for i in ids if packages[i]['installed'] == installed]
+    
+    return ids
+
+# Bağımlılık grafiği (her paket durumu nesli için bir kez oluşturulur)
+_dependency_graph = None
+_dependency_graph_lock = threading.Lock()
+
+def parse_depends(value):
+    """Depends alanını alternatif gruplarına ayır: 'a, b (>= 1) | c' -> [['a'], ['b', 'c']]"""
+    groups = []
+    for group in value.split(','):
+        names = []
+        for alternative in group.split('|'):
+            # Sürüm kısıtını at: "libfoo (>= 1.0)"
+            name = alternative.split('(')[0].strip()
+            if name:
+                names.append(name)
+        if names:
+            groups.append(names)
+    return groups
+
+def _build_dependency_graph(state):
+    """İsimleri tamsayı kimliklere çevirip kompakt komşuluk listeleri oluştur"""
+    available = state['available']
+    installed = state['installed']
+    
+    names = []
+    ids = {}
+    
+    def intern_name(name):
+        node = ids.get(name)
+        if node is None:
+            node = ids[name] = len(names)
+            names.append(sys.intern(name))
+        return node
+    
+    for name in sorted(set(available) | set(installed)):
+        intern_name(name)
+    package_count = len(names)
+    
+    # Sanal paketler (Provides) -> sağlayan paketler
+    providers = {}
+    for name in names[:package_count]:
+        fields = installed.get(name) or available[name]
+        for provided in fields.get('Provides', '').split(','):
+            provided = provided.split('(')[0].strip()
+            if provided and provided != name:
+                providers.setdefault(provided, []).append(ids[name])
+    
+    def resolve(alternatives):
+        # Yüklü olan alternatif/sağlayıcı önceliklidir, yoksa ilk bilinen seçilir
+        candidates = []
+        for name in alternatives:
+            if name in ids and ids[name] < package_count:
+                candidates.append(ids[name])
+            candidates.extend(providers.get(name, ()))
+        for node in candidates:
+            if names[node] in installed:
+                return node
+        if candidates:
+            return candidates[0]
+        # Hiçbir feed'de olmayan bağımlılık: eksik düğüm
+        return intern_name(alternatives[0])
+    
+    deps = []
+    sizes = array('L')
+    for node in range(package_count):
+        name = names[node]
+        # Yüklü paket için kurulu sürümün, değilse feed sürümünün bağımlılıkları
+        fields = installed.get(name) or available[name]
+        feed_fields = available.get(name, fields)
+        targets = {resolve(group) for group in parse_depends(fields.get('Depends', ''))}
+        targets.discard(node)
+        deps.append(array('I', sorted(targets)))
+        try:
+            sizes.append(int(feed_fields.get('Installed-Size') or fields.get('Installed-Size') or 0))
+        except ValueError:
+            sizes.append(0)
+    
+    # Eksik düğümler (sadece bağımlılık olarak geçen isimler)
+    for node in range(package_count, len(names)):
+        deps.append(array('I'))
+        sizes.append(0)
+    
+    rdeps = [array('I') for _ in names]
+    for node, targets in enumerate(deps):
+        for target in targets:
+            rdeps[target].append(node)
+    
+    return {
+        'generation': state['generation'],
+        'names': names,
+        'ids': ids,
+        'package_count': package_count,
+        'installed': bytearray(names[node] in installed for node in range(len(names))),
+        'sizes': sizes,
+        'deps': deps,
+        'rdeps': rdeps
+    }
+
+def get_dependency_graph(state):
+    """Paket durumuna ait bağımlılık grafiğini döndür"""
+    global _dependency_graph
+    
+    graph = _dependency_graph
+    if graph is not None and graph['generation'] == state['generation']:
+        return graph
+    
+    with _dependency_graph_lock:
+        graph = _dependency_graph
+        if graph is None or graph['generation'] != state['generation']:
+            graph = _build_dependency_graph(state)
+            _dependency_graph = graph
+    
+    return graph
+
+def install_preview(state, name):
+    """Paket yüklenirse eklenecek paketler ve toplam kurulum boyutu"""
+    graph = get_dependency_graph(state)
+    root = graph['ids'][name]
+    names = graph['names']
+    installed = graph['installed']
+    sizes = graph['sizes']
+    
+    # Sadece yüklü olmayan düğümler üzerinden genişle
+    seen = {root}
+    order = []
+    pending = deque([root])
+    while pending:
+        node = pending.popleft()
+        if installed[node]:
+            continue
+        order.append(node)
+        for target in graph['deps'][node]:
+            if target not in seen:
+                seen.add(target)
+                pending.append(target)
+    
+    to_install = []
+    missing = []
+    total_size = 0
+    for node in order:
+        if node >= graph['package_count']:
+            missing.append(names[node])
+            continue
+        fields = state['available'].get(names[node], {})
+        to_install.append({
+            'name': names[node],
+            'version': fields.get('Version', ''),
+            'size': sizes[node]
+        })
+        total_size += sizes[node]
+    
+    return {
+        'package': name,
+        'installed': bool(installed[root]),
+        'to_install': to_install,
+        'missing': missing,
+        'total_size': total_size,
+        'total_kb': round(total_size / 1024, 1)
+    }
+
+def reverse_dependencies(state, name):
+    """Pakete bağımlı olan yüklü paketler (doğrudan ve dolaylı)"""
+    graph = get_dependency_graph(state)
+    root = graph['ids'][name]
+    names = graph['names']
+    installed = graph['installed']
+    rdeps = graph['rdeps']
+    
+    direct = sorted(names[node] for node in rdeps[root] if installed[node])
+    
+    # Kaldırılırsa bozulacak tüm yüklü paketler
+    seen = {root}
+    pending = deque([root])
+    while pending:
+        node = pending.popleft()
+        for source in rdeps[node]:
+            if source not in seen and installed[source]:
+                seen.add(source)
+                pending.append(source)
+    seen.discard(root)
+    
+    return {
+        'package': name,
+        'installed': bool(installed[root]),
+        'direct': direct,
+        'all': sorted(names[node] for node in seen)
+    }
+
+# Güncellenebilir paketler (her paket durumu nesli için bir kez hesaplanır)
+_upgradable_cache = None
+
+def get_upgradable_packages(state):
+    """Feed'de daha yeni sürümü olan yüklü paketler"""
+    global _upgradable_cache
+    
+    cached = _upgradable_cache
+    if cached is not None and cached['generation'] == state['generation']:
+        return cached['packages']
+    
+    packages = []
+    for name in sorted(state['installed']):
+        fields = state['available'].get(name)
+        if fields is None:
+            continue
+        installed_version = state['installed'][name].get('Version', '')
+        version = fields.get('Version', '')
+        if compare_versions(version, installed_version) > 0:
+            packages.append({
+                'name': name,
+                'installed_version': installed_version,
+                'version': version,
+                'description': fields.get('Description', '')
+            })
+    
+    _upgradable_cache = {'generation': state['generation'], 'packages': packages}
+    return packages
+
+# Paket işleri: opkg kilit tuttuğu için tüm opkg çağrıları tek worker ile sıralanır
+JOB_HISTORY_SIZE = 20
+JOB_OUTPUT_MAX_LINES = 2000
+JOB_TIMEOUT = 600
+
+_jobs = {}  # job_id -> iş kaydı (eklenme sırasıyla)
+_job_queue = queue.Queue()
+_job_cond = threading.Condition()
+_job_counter = 0
+_job_worker_thread = None
+
+BATCH_MAX_PACKAGES = 200
+
+PACKAGE_NAME_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._+-]*$')
+
+def is_valid_package_name(name):
+    """Paket adı opkg'ye seçenek gibi geçmesin diye doğrula"""
+    return isinstance(name, str) and bool(PACKAGE_NAME_RE.match(name))
+
+def start_job_worker():
+    """opkg işlerini sırayla çalıştıran worker thread'i başlat"""
+    global _job_worker_thread
+    
+    with _job_cond:
+        if _job_worker_thread is None or not _job_worker_thread.is_alive():
+            _job_worker_thread = threading.Thread(target=_job_worker_loop, name='opkg-jobs', daemon=True)
+            _job_worker_thread.start()
+
+def submit_job(action, commands, targets):
+    """Yeni opkg işi oluştur ve kuyruğa ekle
+
+    targets: {'install': [...], 'remove': [...]} - iş bitince paket bazında
+    sonuç bu listelere göre hesaplanır.
+    """
+    global _job_counter
+    
+    start_job_worker()
+    
+    with _job_cond:
+        _job_counter += 1
+        job = {
+            'id': f"{int(time.time())}-{_job_counter}",
+            'action': action,
+            'packages': [name for names in targets.values() for name in names],
+            'targets': targets,
+            'commands': commands,
+            'state': 'queued',
+            'returncode': None,
+            'error': None,
+            'results': None,
+            'lines': [],
+            'line_seq': 0,
+            'created': time.time(),
+            'started': None,
+            'finished': None,
+            'cancel_requested': False,
+            'proc': None
+        }
+        _jobs[job['id']] = job
+        
+        # Biten işlerin geçmişini sınırla
+        finished = [j for j in _jobs.values() if j['finished'] is not None]
+        for old in finished[:max(len(finished) - JOB_HISTORY_SIZE, 0)]:
+            del _jobs[old['id']]
+    
+    _job_queue.put(job['id'])
+    return job
+
+def get_job(job_id):
+    """İş kaydını döndür"""
+    with _job_cond:
+        return _jobs.get(job_id)
+
+def job_to_dict(job, since=None):
+    """İş kaydını JSON'a uygun hale getir (since verilirse çıktı satırlarıyla)"""
+    with _job_cond:
+        data = {
+            'id': job['id'],
+            'action': job['action'],
+            'packages': job['packages'],
+            'state': job['state'],
+            'returncode': job['returncode'],
+            'error': job['error'],
+            'results': job['results'],
+            'created': job['created'],
+            'started': job['started'],
+            'finished': job['finished'],
+            'line_count': job['line_seq']
+        }
+        if since is not None:
+            data['lines'] = [line for line in job['lines'] if line['seq'] > since]
+    return data
+
+def cancel_job(job):
+    """Kuyruktaki işi iptal et veya çalışan opkg sürecini sonlandır"""
+    with _job_cond:
+        if job['finished'] is not None:
+            return False
+        
+        job['cancel_requested'] = True
+        if job['state'] == 'queued':
+            job['state'] = 'cancelled'
+            job['finished'] = time.time()
+        elif job['proc'] is not None:
+            _signal_job_process(job['proc'], signal.SIGTERM)
+        _job_cond.notify_all()
+    return True
+
+def _signal_job_process(proc, sig):
+    """opkg sürecine ve alt süreçlerine (süreç grubu) sinyal gönder"""
+    try:
+        os.killpg(proc.pid, sig)
+    except OSError:
+        pass
+
+def _job_append_line(job, stream, text):
+    """İş çıktısına satır ekle ve dinleyenleri uyandır"""
+    with _job_cond:
+        job['line_seq'] += 1
+        job['lines'].append({'seq': job['line_seq'], 'stream': stream, 'text': text})
+        if len(job['lines']) > JOB_OUTPUT_MAX_LINES:
+            del job['lines'][:len(job['lines']) - JOB_OUTPUT_MAX_LINES]
+        _job_cond.notify_all()
+
+def _job_read_stream(job, pipe, stream):
+    """Süreç çıktısını satır satır iş kaydına aktar"""
+    for line in iter(pipe.readline, ''):
+        _job_append_line(job, stream, line.rstrip('\n'))
+    pipe.close()
+
+def _run_job_command(job, command):
+    """Tek bir opkg komutunu çalıştır, çıktısını canlı aktar"""
+    _job_append_line(job, 'info', '$ ' + ' '.join(command))
+    
+    # Ayrı süreç grubu: iptalde opkg'nin başlattığı betikler de sonlanır
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, bufsize=1, start_new_session=True)
+    with _job_cond:
+        job['proc'] = proc
+        if job['cancel_requested']:
+            _signal_job_process(proc, signal.SIGTERM)
+    
+    stderr_reader = threading.Thread(target=_job_read_stream, args=(job, proc.stderr, 'stderr'), daemon=True)
+    stderr_reader.start()
+    
+    # Zaman aşımında süreci öldür
+    timer = threading.Timer(JOB_TIMEOUT, _signal_job_process, args=(proc, signal.SIGKILL))
+    timer.start()
+    try:
+        _job_read_stream(job, proc.stdout, 'stdout')
+        stderr_reader.join()
+        return proc.wait()
+    finally:
+        timer.cancel()
+        with _job_cond:
+            job['proc'] = None
+
+def _run_job(job):
+    """İşin tüm komutlarını sırayla çalıştır"""
+    with _job_cond:
+        if job['state'] != 'queued':
+            return
+        job['state'] = 'running'
+        job['started'] = time.time()
+        _job_cond.notify_all()
+    
+    returncode = 0
+    error = None
+    try:
+        for command in job['commands']:
+            returncode = _run_job_command(job, command)
+            if returncode != 0 or job['cancel_requested']:
+                break
+    except Exception as e:
+        returncode = -1
+        error = str(e)
+        _job_append_line(job, 'stderr', f"HATA: {e}")
+    
+    # Paket durumu iş başına bir kez (tüm paketler bittikten sonra) tazelenir
+    results = None
+    try:
+        results = _job_package_results(job, get_package_state())
+    except Exception as e:
+        print(f"Paket durumu yenileme hatası: {e}")
+    
+    with _job_cond:
+        job['returncode'] = returncode
+        job['error'] = error
+        job['results'] = results
+        if job['cancel_requested']:
+            job['state'] = 'cancelled'
+        else:
+            job['state'] = 'done' if returncode == 0 else 'failed'
+        job['finished'] = time.time()
+        _job_cond.notify_all()
+
+def _job_package_results(job, state):
+    """İş sonrası paket bazında sonuç (istenen duruma ulaşıldı mı)"""
+    installed = state['installed']
+    results = []
+    
+    for action, names in job['targets'].items():
+        for name in names:
+            is_installed = name in installed
+            installed_version = installed[name].get('Version', '') if is_installed else None
+            
+            if action == 'remove':
+                success = not is_installed
+            elif action == 'upgrade':
+                # Kurulu sürüm feed sürümüne ulaştı mı
+                feed_version = state['available'].get(name, {}).get('Version', '')
+                success = is_installed and compare_versions(installed_version, feed_version) >= 0
+            else:
+                success = is_installed
+            
+            results.append({
+                'package': name,
+                'action': action,
+                'success': success,
+                'installed_version': installed_version
+            })
+    
+    return results
+
+def _job_worker_loop():
+    """Kuyruktaki işleri tek tek çalıştır"""
+    while True:
+        job_id = _job_queue.get()
+        job = get_job(job_id)
+        if job is not None:
+            _run_job(job)
+
+def sse_event(data, event=None, event_id=None):
+    """Server-Sent Events mesajı oluştur"""
+    message = ''
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    if event:
+        message += f"event: {event}\n"
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def stream_job(job, since=0):
+    """İş çıktısını SSE olarak akıt; iş bitince 'done' olayı gönder"""
+    while True:
+        with _job_cond:
+            lines = [line for line in job['lines'] if line['seq'] > since]
+            finished = job['finished'] is not None
+            if not lines and not finished:
+                _job_cond.wait(timeout=15)
+                lines = [line for line in job['lines'] if line['seq'] > since]
+                finished = job['finished'] is not None
+        
+        for line in lines:
+            since = line['seq']
+            yield sse_event(line, 'line', line['seq'])
+        
+        if finished and not lines:
+            yield sse_event(job_to_dict(job), 'done')
+            return
+        
+        if not lines:
+            # Bağlantıyı canlı tut
+            yield ': keep-alive\n\n'
+
+# Panel ayarları (uygulama klasöründe JSON olarak saklanır)
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
+DEFAULT_SETTINGS = {
+    'feed_refresh_interval': 6 * 3600  # saniye, 0 = otomatik güncelleme kapalı
+}
+_settings = None
+_settings_lock = threading.Lock()
+
+def get_settings():
+    """Kayıtlı ayarları varsayılanlarla birleştirerek döndür"""
+    global _settings
+    
+    with _settings_lock:
+        if _settings is None:
+            _settings = dict(DEFAULT_SETTINGS)
+            try:
+                with open(SETTINGS_FILE, 'r') as f:
+                    _settings.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return dict(_settings)
+
+def save_settings(updates):
+    """Ayarları güncelle ve diske yaz"""
+    get_settings()
+    
+    with _settings_lock:
+        _settings.update(updates)
+        with open(SETTINGS_FILE, 'w') as f:
+            json.dump(_settings, f, indent=2)
+        return dict(_settings)
+
+# Feed güncelleme zamanlayıcısı (opkg update düşük öncelikte, iş kuyruğu üzerinden)
+FEED_RETRY_DELAY = 15 * 60
+FEED_MIN_INTERVAL = 10 * 60
+
+_feed_scheduler_thread = None
+_feed_scheduler_wake = threading.Event()
+_feed_update_job = None
+_feed_last_attempt = 0
+
+def low_priority_command(command):
+    """Komutu nice/ionice ile düşük CPU ve disk önceliğinde çalıştır"""
+    prefix = []
+    if shutil.which('nice'):
+        prefix += ['nice', '-n', '19']
+    if shutil.which('ionice'):
+        prefix += ['ionice', '-c', '3']
+    return prefix + command
+
+def get_feed_info():
+    """Feed dosyaları, son güncelleme zamanı ve zamanlayıcı durumu"""
+    state = get_package_state()
+    settings = get_settings()
+    feeds = []
+    
+    for path in state['feed_files']:
+        sig = state['signature'].get(path)
+        if sig is None:
+            continue
+        cached = _opkg_file_cache.get(path)
+        feeds.append({
+            'name': os.path.basename(path),
+            'mtime': sig[0] / 1e9,
+            'size': sig[1],
+            'packages': len(cached['packages']) if cached else 0
+        })
+    
+    last_update = max((feed['mtime'] for feed in feeds), default=None)
+    interval = settings['feed_refresh_interval']
+    job = _feed_update_job
+    
+    return {
+        'feeds': feeds,
+        'last_update': last_update,
+        'age': round(time.time() - last_update) if last_update else None,
+        'interval': interval,
+        'next_refresh': _next_feed_refresh(last_update, interval),
+        'refreshing': job is not None and job['finished'] is None,
+        'job_id': job['id'] if job else None
+    }
+
+def _next_feed_refresh(last_update, interval):
+    """Bir sonraki otomatik güncelleme zamanı (kapalıysa None)"""
+    if interval <= 0:
+        return None
+    return max((last_update or 0) + interval, _feed_last_attempt + FEED_RETRY_DELAY)
+
+def refresh_feeds():
+    """opkg update işini kuyruğa ekle (zaten bekleyen varsa onu döndür)"""
+    global _feed_update_job, _feed_last_attempt
+    
+    job = _feed_update_job
+    if job is not None and job['finished'] is None:
+        return job
+    
+    _feed_last_attempt = time.time()
+    _feed_update_job = submit_job('update', [low_priority_command(['opkg', 'update'])], {})
+    return _feed_update_job
+
+def _feed_scheduler_loop():
+    """Aralık dolduğunda feed'leri arka planda güncelle"""
+    while True:
+        wait = 60
+        try:
+            info = get_feed_info()
+            next_refresh = info['next_refresh']
+            if next_refresh is not None:
+                if time.time() >= next_refresh:
+                    refresh_feeds()
+                else:
+                    wait = min(max(next_refresh - time.time(), 1), 60)
+        except Exception as e:
+            print(f"Feed zamanlayıcı hatası: {e}")
+        
+        _feed_scheduler_wake.wait(wait)
+        _feed_scheduler_wake.clear()
+
+def start_feed_scheduler():
+    """Feed güncelleme zamanlayıcısını başlat"""
+    global _feed_scheduler_thread
+    
+    if _feed_scheduler_thread is None or not _feed_scheduler_thread.is_alive():
+        _feed_scheduler_thread = threading.Thread(target=_feed_scheduler_loop, name='feed-scheduler', daemon=True)
+        _feed_scheduler_thread.start()
+
+# Metrik geçmişi: sabit boyutlu, mmap'li round-robin dosyası (RRD tarzı)
+#
+# Dosya düzeni: başlık, arşiv tablosu (adım, satır, son slot), ardından her
+# arşiv için satır x metrik x (min, avg, max) float32. Eşleme ACCESS_COPY ile
+# açılır; yazmalar RAM'de kalır ve HISTORY_FLUSH_INTERVAL'de yalnızca değişen
+# satırlar pwrite ile dosyaya yazılır (flash yıpranmasını azaltır).
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.rrd')
+HISTORY_METRICS = ('cpu', 'iowait', 'mem', 'load', 'rx', 'tx')
+HISTORY_ARCHIVES = ((2, 1800), (60, 1440), (900, 672), (3600, 2160))  # 1 saat, 1 gün, 1 hafta, 90 gün
+HISTORY_INTERVAL = 2
+HISTORY_FLUSH_INTERVAL = 300
+HISTORY_MAX_POINTS = 1000
+HISTORY_MAGIC = b'KPMRRD01'
+
+_HISTORY_HEADER = struct.Struct('<8sII')
+_HISTORY_ARCHIVE = struct.Struct('<IIq')
+_HISTORY_ROW = struct.Struct('<%df' % (len(HISTORY_METRICS) * 3))
+
+_history = None
+_history_lock = threading.Lock()
+_history_thread = None
+_history_start_lock = threading.Lock()
+
+def _history_layout():
+    """Arşiv tanımları ve dosya boyutu"""
+    archives = []
+    offset = _HISTORY_HEADER.size + _HISTORY_ARCHIVE.size * len(HISTORY_ARCHIVES)
+    for step, rows in HISTORY_ARCHIVES:
+        archives.append({'step': step, 'rows': rows, 'offset': offset,
+                         'last_slot': -1, 'acc': None, 'dirty': set()})
+        offset += rows * _HISTORY_ROW.size
+    return archives, offset
+
+def _create_history_file(archives, size):
+    """Boş (NaN dolu) geçmiş dosyası oluştur"""
+    data = bytearray(size)
+    _HISTORY_HEADER.pack_into(data, 0, HISTORY_MAGIC, len(HISTORY_METRICS), len(archives))
+    empty_row = _HISTORY_ROW.pack(*([math.nan] * (len(HISTORY_METRICS) * 3)))
+    for i, archive in enumerate(archives):
+        _HISTORY_ARCHIVE.pack_into(data, _HISTORY_HEADER.size + i * _HISTORY_ARCHIVE.size,
+                                   archive['step'], archive['rows'], -1)
+        data[archive['offset']:archive['offset'] + archive['rows'] * _HISTORY_ROW.size] = empty_row * archive['rows']
+    
+    tmp_path = HISTORY_FILE + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, HISTORY_FILE)
+
+def _history_file_valid(archives, size):
+    """Mevcut dosya aynı metrik/arşiv düzeninde mi"""
+    try:
+        if os.path.getsize(HISTORY_FILE) != size:
+            return False
+        with open(HISTORY_FILE, 'rb') as f:
+            header = f.read(archives[0]['offset'])
+    except OSError:
+        return False
+    
+    magic, metrics, count = _HISTORY_HEADER.unpack_from(header, 0)
+    if magic != HISTORY_MAGIC or metrics != len(HISTORY_METRICS) or count != len(archives):
+        return False
+    for i, archive in enumerate(archives):
+        step, rows, _ = _HISTORY_ARCHIVE.unpack_from(header, _HISTORY_HEADER.size + i * _HISTORY_ARCHIVE.size)
+        if (step, rows) != (archive['step'], archive['rows']):
+            return False
+    return True
+
+def open_history():
+    """Geçmiş dosyasını eşle (yoksa ya da düzen değiştiyse yeniden oluştur)"""
+    global _history
+    
+    with _history_lock:
+        if _history is not None:
+            return _history
+        
+        archives, size = _history_layout()
+        if not _history_file_valid(archives, size):
+            _create_history_file(archives, size)
+        
+        fd = os.open(HISTORY_FILE, os.O_RDWR)
+        data = mmap.mmap(fd, size, access=mmap.ACCESS_COPY)
+        for i, archive in enumerate(archives):
+            archive['last_slot'] = _HISTORY_ARCHIVE.unpack_from(
+                data, _HISTORY_HEADER.size + i * _HISTORY_ARCHIVE.size)[2]
+        
+        _history = {'fd': fd, 'map': data, 'archives': archives}
+        return _history
+
+def _history_store_slot(history, index, slot, values):
+    """Tamamlanan slotu arşive yaz; atlanan slotları NaN ile doldur"""
+    archive = history['archives'][index]
+    rows = archive['rows']
+    
+    gap_start = max(archive['last_slot'] + 1, slot - rows + 1) if archive['last_slot'] >= 0 else slot
+    empty = [math.nan] * (len(HISTORY_METRICS) * 3)
+    for missing in range(gap_start, slot):
+        row = missing % rows
+        _HISTORY_ROW.pack_into(history['map'], archive['offset'] + row * _HISTORY_ROW.size, *empty)
+        archive['dirty'].add(row)
+    
+    row = slot % rows
+    _HISTORY_ROW.pack_into(history['map'], archive['offset'] + row * _HISTORY_ROW.size, *values)
+    archive['dirty'].add(row)
+    archive['last_slot'] = max(archive['last_slot'], slot)
+    _HISTORY_ARCHIVE.pack_into(history['map'], _HISTORY_HEADER.size + index * _HISTORY_ARCHIVE.size,
+                               archive['step'], rows, archive['last_slot'])
+
+def history_add(timestamp, values):
+    """Bir ölçümü tüm arşivlerin o anki slot özetine ekle
+
+    values: metrik -> değer (bilinmiyorsa None)
+    """
+    history = open_history()
+    
+    with _history_lock:
+        for index, archive in enumerate(history['archives']):
+            slot = int(timestamp // archive['step'])
+            if slot < archive['last_slot']:
+                # Saat geri gitti (ör. NTP öncesi açılış); eski veriyi ezme
+                continue
+            
+            acc = archive['acc']
+            if acc is not None and acc['slot'] != slot:
+                _history_store_slot(history, index, acc['slot'], _history_consolidate(acc))
+                acc = None
+            if acc is None:
+                acc = archive['acc'] = {'slot': slot, 'metrics': [None] * len(HISTORY_METRICS)}
+            
+            for i, name in enumerate(HISTORY_METRICS):
+                value = values.get(name)
+                if value is None:
+                    continue
+                stats = acc['metrics'][i]
+                if stats is None:
+                    acc['metrics'][i] = [value, value, value, 1]  # min, toplam, max, adet
+                else:
+                    stats[0] = min(stats[0], value)
+                    stats[1] += value
+                    stats[2] = max(stats[2], value)
+                    stats[3] += 1
+
+def _history_consolidate(acc):
+    """Slot özetini (min, avg, max) satırına çevir"""
+    row = []
+    for stats in acc['metrics']:
+        if stats is None:
+            row += [math.nan] * 3
+        else:
+            row += [stats[0], stats[1] / stats[3], stats[2]]
+    return row
+
+def flush_history():
+    """Değişen satırları ve arşiv tablosunu dosyaya yaz"""
+    with _history_lock:
+        history = _history
+        if history is None:
+            return
+        
+        data = history['map']
+        for archive in history['archives']:
+            rows = sorted(archive['dirty'])
+            archive['dirty'] = set()
+            
+            # Ardışık satırları tek yazmada birleştir
+            start = 0
+            for i in range(1, len(rows) + 1):
+                if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                    begin = archive['offset'] + rows[start] * _HISTORY_ROW.size
+                    end = archive['offset'] + (rows[i - 1] + 1) * _HISTORY_ROW.size
+                    os.pwrite(history['fd'], data[begin:end], begin)
+                    start = i
+        
+        table_end = _HISTORY_HEADER.size + _HISTORY_ARCHIVE.size * len(history['archives'])
+        os.pwrite(history['fd'], data[:table_end], 0)
+
+def _read_history_values(previous):
+    """Geçmiş için tek ölçüm; previous: önceki sayaçlar (yerinde güncellenir)"""
+    now = time.monotonic()
+    values = {}
+    
+    times = read_cpu_times()['cpu']
+    if 'cpu' in previous:
+        percent = cpu_percentages(previous['cpu'], times)
+        values['cpu'] = percent['usage']
+        values['iowait'] = percent['iowait']
+    previous['cpu'] = times
+    
+    values['mem'] = get_memory_usage()['percent']
+    values['load'] = get_load_average()['load'][0]
+    
+    # Sadece WAN arayüzleri: bir paket köprüden, üye porttan ve WAN/PPP
+    # cihazından geçtiği için tüm arayüzlerin toplamı trafiği 2-3 kat gösterir
+    uplinks = read_uplink_interfaces()
+    counters = {name: c for name, c in read_net_dev().items() if name in uplinks}
+    if 'net' in previous:
+        elapsed = now - previous['time']
+        old = previous['net']
+        if elapsed > 0:
+            # Yeni görünen arayüzlerin ilk okuması hıza katılmaz
+            values['rx'] = sum(counter_delta(old[n]['rx_bytes'], c['rx_bytes'])
+                               for n, c in counters.items() if n in old) / elapsed
+            values['tx'] = sum(counter_delta(old[n]['tx_bytes'], c['tx_bytes'])
+                               for n, c in counters.items() if n in old) / elapsed
+    previous['net'] = counters
+    previous['time'] = now
+    
+    return values
+
+def _history_loop():
+    """HISTORY_INTERVAL aralıkla ölç, periyodik olarak diske yaz"""
+    previous = {}
+    last_flush = time.monotonic()
+    while True:
+        started = time.monotonic()
+        try:
+            history_add(time.time(), _read_history_values(previous))
+            if started - last_flush >= HISTORY_FLUSH_INTERVAL:
+                flush_history()
+                last_flush = started
+        except Exception as e:
+            print(f"Geçmiş kaydı hatası: {e}")
+        
+        time.sleep(max(HISTORY_INTERVAL - (time.monotonic() - started), 0.1))
+
+def start_history_recorder():
+    """Geçmiş kayıt thread'ini başlat"""
+    global _history_thread
+    
+    with _history_start_lock:
+        if _history_thread is None or not _history_thread.is_alive():
+            if _history_thread is None:
+                open_history()
+                atexit.register(flush_history)
+            _history_thread = threading.Thread(target=_history_loop, name='history-recorder', daemon=True)
+            _history_thread.start()
+
+def query_history(metric, start, end, step=0):
+    """[start, end] aralığı için en fazla HISTORY_MAX_POINTS nokta
+
+    Aralığı kapsayan arşivlerden adımı istenene en yakın (büyük olmayan)
+    olanı seçilir; gerekirse satırlar step genişliğindeki kovalara toplanır.
+    Dönüş: (çözünürlük, adım, [[zaman, min, avg, max], ...])
+    """
+    history = open_history()
+    metric_index = HISTORY_METRICS.index(metric)
+    step = max(step, (end - start) / HISTORY_MAX_POINTS)
+    now = time.time()
+    
+    archives = history['archives']
+    covering = [a for a in archives if now - a['step'] * a['rows'] <= start] or [archives[-1]]
+    fitting = [a for a in covering if a['step'] <= step]
+    archive = fitting[-1] if fitting else covering[0]
+    
+    resolution = archive['step']
+    bucket = max(1, int(math.ceil(step / resolution))) * resolution
+    rows = archive['rows']
+    points = []
+    
+    with _history_lock:
+        last_slot = archive['last_slot']
+        first_slot = max(int(start // resolution), last_slot - rows + 1)
+        end_slot = min(int(end // resolution), last_slot)
+        
+        current = None
+        for slot in range(first_slot, end_slot + 1):
+            bucket_start = int(slot * resolution // bucket * bucket)
+            if current is None or current[0] != bucket_start:
+                current = [bucket_start, None, 0.0, 0, None]  # zaman, min, toplam, adet, max
+                points.append(current)
+            
+            offset = archive['offset'] + (slot % rows) * _HISTORY_ROW.size + metric_index * 12
+            low, avg, high = struct.unpack_from('<3f', history['map'], offset)
+            if math.isnan(avg):
+                continue
+            current[1] = low if current[1] is None else min(current[1], low)
+            current[2] += avg
+            current[3] += 1
+            current[4] = high if current[4] is None else max(current[4], high)
+    
+    result = []
+    for bucket_start, low, total, count, high in points:
+        if count:
+            result.append([bucket_start, round(low, 2), round(total / count, 2), round(high, 2)])
+        else:
+            result.append([bucket_start, None, None, None])
+    return resolution, bucket, result
+
+# HTTP sıkıştırma ve koşullu GET (ETag / 304)
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/html',
+                      'text/css', 'text/plain')
+
+# Statik dosyalar: ad -> {'sig', 'data', 'gzip', 'etag'} (dosya değişene kadar)
+_static_cache = {}
+_static_lock = threading.Lock()
+
+def accepts_gzip():
+    """İstemci gzip kabul ediyor mu"""
+    return request.accept_encodings.quality('gzip') > 0
+
+def not_modified(*parts):
+    """Veri sürümüne bağlı ETag belirle; istemcinin kopyası güncelse 304 döndür
+
+    Cevap gövdesi hiç oluşturulmadan 304 dönebilmek için endpoint'lerin
+    başında çağrılır. ETag, after_request'te cevaba eklenir.
+    """
+    etag = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    g.etag = etag
+    
+    variant = etag + '-gz' if accepts_gzip() else etag
+    if request.if_none_match.contains(variant):
+        response = Response(status=304)
+        response.set_etag(variant)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    return None
+
+def serve_static(filename, mimetype):
+    """Statik dosyayı içerik özeti ETag'i ve önceden sıkıştırılmış kopyayla sun"""
+    path = os.path.join(app.root_path, filename)
+    sig = _file_signature(path)
+    if sig is None:
+        return jsonify({'success': False, 'error': 'Dosya bulunamadı'}), 404
     
-    return wireless
+    with _static_lock:
+        cached = _static_cache.get(filename)
+        if cached is None or cached['sig'] != sig:
+            with open(path, 'rb') as f:
+                data = f.read()
+            cached = _static_cache[filename] = {
+                'sig': sig,
+                'data': data,
+                'gzip': gzip.compress(data, 9),
+                'etag': hashlib.md5(data).hexdigest()
+            }
+    
+    use_gzip = accepts_gzip()
+    etag = cached['etag'] + '-gz' if use_gzip else cached['etag']
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(cached['gzip'] if use_gzip else cached['data'], mimetype=mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-def get_processes():
-    """Çalışan process listesi"""
-    processes = []
+@app.after_request
+def compress_response(response):
+    """JSON/metin cevaplarına güçlü ETag ekle, 304 ve gzip uygula"""
+    if (request.method not in ('GET', 'HEAD') or response.status_code != 200
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.get_etag()[0] is not None
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
     
-    try:
-        # Önce ps aux dene
-        result = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
-        
-        # Eğer boşsa veya hata varsa, alternatif ps komutunu dene
-        if not result.stdout or result.returncode != 0:
-            result = subprocess.run(['ps', '-w'], capture_output=True, text=True, timeout=5)
-        
-        lines = result.stdout.split('\n')
-        
-        # Header'ı bul ve atla
-        start_idx = 0
-        for i, line in enumerate(lines):
-            if 'PID' in line or 'USER' in line:
-                start_idx = i + 1
-                break
-        
-        for line in lines[start_idx:]:
-            if not line.strip():
-                continue
-            
-            # Farklı ps formatlarını destekle
-            parts = line.split(None, 10)
-            
-            if len(parts) >= 11:
-                # Standard ps aux format
-                processes.append({
-                    'user': parts[0],
-                    'pid': parts[1],
-                    'cpu': parts[2],
-                    'mem': parts[3],
-                    'vsz': parts[4],
-                    'rss': parts[5],
-                    'command': parts[10]
-                })
-            elif len(parts) >= 5:
-                # BusyBox ps format (PID USER VSZ STAT COMMAND)
-                processes.append({
-                    'user': parts[1] if len(parts) > 1 else 'root',
-                    'pid': parts[0],
-                    'cpu': '0.0',
-                    'mem': '0.0',
-                    'vsz': parts[2] if len(parts) > 2 else '0',
-                    'rss': '0',
-                    'command': ' '.join(parts[4:]) if len(parts) > 4 else parts[-1]
-                })
-    except subprocess.TimeoutExpired:
-        print(f"Process list zaman aşımı")
-    except Exception as e:
-        print(f"Process list hatası: {e}")
+    data = response.get_data()
+    use_gzip = len(data) >= GZIP_MIN_SIZE and accepts_gzip()
+    
+    # Endpoint veri nesli vermediyse ETag gövdenin özetidir
+    etag = getattr(g, 'etag', None) or hashlib.md5(data).hexdigest()
+    if use_gzip:
+        etag += '-gz'
+    
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers.setdefault('Cache-Control', 'no-cache')
     
-    return processes
+    if request.if_none_match.contains(etag):
+        # Gövde gönderilmez, sıkıştırma da yapılmaz
+        response.status_code = 304
+        response.set_data(b'')
+        return response
+    
+    if use_gzip:
+        response.set_data(gzip.compress(data, GZIP_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    
+    return response
 
-def get_kernel_log(lines=50):
-    """Kernel log mesajları (dmesg)"""
-    try:
-        result = subprocess.run(['dmesg', '-T'], capture_output=True, text=True, timeout=5)
-        log_lines = result.stdout.split('\n')
-        return log_lines[-lines:] if len(log_lines) > lines else log_lines
-    except:
-        return []
+# Büyük listeler için sütunlu (columnar) JSON formatı
+def wants_columnar():
+    """İstemci format=columnar istedi mi"""
+    return request.args.get('format') == 'columnar'
 
-def get_system_log(lines=50):
-    """System log (logread or syslog)"""
-    try:
-        # OpenWRT logread
-        result = subprocess.run(['logread'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            log_lines = result.stdout.split('\n')
-            return log_lines[-lines:] if len(log_lines) > lines else log_lines
-    except:
-        pass
+def to_columnar(items, fields, dict_fields=()):
+    """Sözlük listesini alan başına paralel dizilere çevir
+
+    dict_fields içindeki alanlarda tekrar eden değerler sözlüğe alınır,
+    sütunda sadece sözlük sırası tutulur. Boolean'lar 0/1 olarak yazılır.
+    """
+    columns = {}
+    dictionaries = {}
     
-    # Alternatif: /var/log/messages
-    try:
-        with open('/var/log/messages', 'r') as f:
-            log_lines = f.readlines()
-            return [l.strip() for l in log_lines[-lines:]]
-    except:
-        return []
+    for field in fields:
+        values = [item.get(field) for item in items]
+        
+        if field in dict_fields:
+            lookup = {}
+            codes = []
+            for value in values:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes.append(code)
+            dictionaries[field] = list(lookup)
+            values = codes
+        elif values and isinstance(values[0], bool):
+            values = [int(value) for value in values]
+        
+        columns[field] = values
+    
+    return {
+        'format': 'columnar',
+        'count': len(items),
+        'fields': list(fields),
+        'columns': columns,
+        'dictionaries': dictionaries
+    }
+
+def list_payload(items, fields, dict_fields=()):
+    """İsteğe göre liste ya da sütunlu format döndür"""
+    if wants_columnar():
+        return to_columnar(items, fields, dict_fields)
+    return items
 
 @app.route('/')
 def index():
     """Ana sayfa"""
-    return send_from_directory('.', 'index.html')
+    return serve_static('index.html', 'text/html')
 
 @app.route('/app.js')
 def serve_js():
     """JavaScript dosyası"""
-    return send_from_directory('.', 'app.js', mimetype='application/javascript')
+    return serve_static('app.js', 'application/javascript')
 
 @app.route('/api-docs.html')
 def api_docs_page():
     """API dokümantasyon sayfası"""
-    return send_from_directory('.', 'api-docs.html')
+    return serve_static('api-docs.html', 'text/html')
 
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    """Sistem istatistikleri (CPU, RAM)"""
+    """Sistem istatistikleri (CPU, RAM) - örnekleyicinin son değeri
+
+    history=N: halka tampondaki son N örnek de döner
+    """
+    try:
+        sample = get_latest_sample()
+        result = {'success': True, 'interval': SAMPLER_INTERVAL}
+        result.update(sample)
+        
+        history = request.args.get('history', 0, type=int)
+        if history > 0:
+            result['history'] = [
+                {'time': s['time'], 'cpu': s['cpu'], 'iowait': s['iowait'],
+                 'memory': s['memory']['percent'], 'load': s['load'][0]}
+                for s in get_recent_samples(min(history, SAMPLER_HISTORY))
+            ]
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard_api():
+    """Genel bakış verileri tek istekte (fields=cpu,mem,load ile seçilebilir)"""
+    try:
+        fields = [f for f in request.args.get('fields', '').split(',') if f] or list(DASHBOARD_FIELDS)
+        unknown = [f for f in fields if f not in DASHBOARD_FIELDS]
+        if unknown:
+            return jsonify({'success': False, 'error': f'Bilinmeyen alan: {", ".join(unknown)}'}), 400
+        
+        result = {'success': True}
+        result.update(get_dashboard(fields))
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/stream/metrics', methods=['GET'])
+def stream_metrics_api():
+    """CPU/RAM/load/uptime örneklerini Server-Sent Events ile akıt
+
+    interval: gönderim aralığı (saniye, SAMPLER_INTERVAL..60)
+    """
+    interval = request.args.get('interval', SAMPLER_INTERVAL, type=float)
+    interval = min(max(interval, SAMPLER_INTERVAL), METRICS_MAX_INTERVAL)
+    
+    return Response(
+        stream_with_context(stream_metrics(interval)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/history', methods=['GET'])
+def get_history_api():
+    """Metrik geçmişi (min/avg/max noktaları)
+
+    metric: cpu, iowait, mem, load, rx, tx
+    from/to: unix zamanı (varsayılan: son 1 saat), step: saniye (0 = otomatik)
+    """
     try:
-        cpu = get_cpu_usage()
-        memory = get_memory_usage()
+        metric = request.args.get('metric', 'cpu')
+        if metric not in HISTORY_METRICS:
+            return jsonify({'success': False, 'error': f'Bilinmeyen metrik: {metric}'}), 400
+        
+        end = request.args.get('to', time.time(), type=float)
+        start = request.args.get('from', end - 3600, type=float)
+        step = request.args.get('step', 0, type=float)
+        if not all(math.isfinite(value) for value in (start, end, step)):
+            return jsonify({'success': False, 'error': 'from, to ve step sonlu sayı olmalı'}), 400
+        if start >= end:
+            return jsonify({'success': False, 'error': 'from, to değerinden küçük olmalı'}), 400
+        
+        start_history_recorder()
+        resolution, step, points = query_history(metric, start, end, max(step, 0))
         
         return jsonify({
             'success': True,
-            'cpu': cpu,
-            'memory': memory
+            'metric': metric,
+            'from': start,
+            'to': end,
+            'resolution': resolution,
+            'step': step,
+            'points': points
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/conntrack', methods=['GET'])
+def get_conntrack_api():
+    """Bağlantı izleme tablosu: özetler ve sayfalı satırlar
+
+    offset/limit: satır sayfası, top: boyut başına en çok konuşan sayısı,
+    by=connections|bytes, filtreler: proto, state, src, dst, dport
+    """
+    try:
+        weight = request.args.get('by', 'connections')
+        if weight not in ('connections', 'bytes'):
+            return jsonify({'success': False, 'error': f'Geçersiz ağırlık: {weight}'}), 400
+        
+        filters = {key: request.args[key] for key in ('proto', 'state', 'src', 'dst') if request.args.get(key)}
+        dport = request.args.get('dport')
+        if dport:
+            try:
+                filters['dport'] = int(dport)
+            except ValueError:
+                filters['dport'] = -1
+            if not 0 <= filters['dport'] <= 65535:
+                return jsonify({'success': False, 'error': f'Geçersiz port: {dport}'}), 400
+        
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', 100, type=int), 0), CONNTRACK_PAGE_MAX)
+        top = min(max(request.args.get('top', 10, type=int), 1), CONNTRACK_TOPK_CAPACITY)
+        
+        result = scan_conntrack(offset, limit, top, weight, filters)
+        if result is None:
+            return jsonify({'success': False, 'error': 'Conntrack tablosu bulunamadı (nf_conntrack yüklü değil)'}), 404
+        
+        result.update({'success': True, 'offset': offset, 'limit': limit, 'by': weight})
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/services', methods=['GET'])
 def get_services():
-    """Çalışan servisleri listele (netstat)"""
+    """Çalışan servisleri listele (/proc/net soket tabloları)"""
     try:
-        result = subprocess.run(
-            ['netstat', '-tulpn'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        services = get_listening_sockets()
+        return jsonify({
+            'success': True,
+            'tcp': services['tcp'],
+            'udp': services['udp']
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages', methods=['GET'])
+def get_packages():
+    """Tüm paketleri ve yüklü olanları listele"""
+    try:
+        query = request.args.get('q', '')
+        installed = request.args.get('installed', '').lower()
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', PACKAGE_PAGE_SIZE)), 1), PACKAGE_PAGE_MAX)
+        
+        if installed in ('1', 'true', 'yes'):
+            installed = True
+        elif installed in ('0', 'false', 'no'):
+            installed = False
+        else:
+            installed = None
         
-        tcp_services = []
-        udp_services = []
+        # opkg çağrılmaz; feed index ve status dosyaları doğrudan okunur
+        state = get_package_state()
         
-        lines = result.stdout.split('\n')
+        cached = not_modified('packages', state['version'], query, installed, offset, limit, wants_columnar())
+        if cached:
+            return cached
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('Active') or line.startswith('Proto'):
-                continue
-            
-            parts = line.split()
-            if len(parts) < 4:
-                continue
-            
-            proto = parts[0].lower()
-            local_address = parts[3] if len(parts) > 3 else ''
-            program = parts[-1] if len(parts) > 6 else '-'
-            
-            # Port numarasını çıkar
-            port = ''
-            if ':' in local_address:
-                port = local_address.split(':')[-1]
-            
-            # Program adını temizle (PID/Program formatı)
-            if '/' in program:
-                program = program.split('/')[-1]
-            
-            service_info = {
-                'proto': proto,
-                'port': port,
-                'address': local_address,
-                'program': program
-            }
-            
-            if proto in ['tcp', 'tcp6']:
-                tcp_services.append(service_info)
-            elif proto in ['udp', 'udp6']:
-                udp_services.append(service_info)
+        ids = search_packages(state, query, installed)
+        packages = state['packages']
         
         return jsonify({
             'success': True,
-            'tcp': tcp_services,
-            'udp': udp_services
+            'packages': list_payload([packages[i] for i in ids[offset:offset + limit]],
+                                     ('name', 'version', 'description', 'installed')),
+            'total': len(ids),
+            'offset': offset,
+            'limit': limit
         })
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Zaman aşımı'}), 500
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Geçersiz sayfalama parametresi'}), 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/packages', methods=['GET'])
-def get_packages():
-    """Tüm paketleri ve yüklü olanları listele"""
+@app.route('/api/packages/feeds', methods=['GET'])
+def get_feeds():
+    """Feed dosyaları ve son güncellenme zamanı"""
     try:
-        # Yüklü paketler
-        installed_result = subprocess.run(
-            ['opkg', 'list-installed'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        return jsonify({
+            'success': True,
+            'feeds': get_feed_info()
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/feeds/refresh', methods=['POST'])
+def refresh_feeds_api():
+    """Feed'leri şimdi güncelle (opkg update, düşük öncelikte)"""
+    try:
+        job = refresh_feeds()
         
-        installed = set()
-        for line in installed_result.stdout.split('\n'):
-            if line.strip():
-                pkg_name = line.split()[0] if line.split() else ''
-                if pkg_name:
-                    installed.add(pkg_name)
-        
-        # Tüm paketler
-        all_result = subprocess.run(
-            ['opkg', 'list'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'job': job_to_dict(job)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/feeds/settings', methods=['POST'])
+def feed_settings_api():
+    """Otomatik feed güncelleme aralığını ayarla (saniye, 0 = kapalı)"""
+    try:
+        data = request.get_json() or {}
+        interval = int(data.get('interval', -1))
         
-        packages = []
-        for line in all_result.stdout.split('\n'):
-            if line.strip():
-                parts = line.split(' - ')
-                if len(parts) >= 2:
-                    pkg_name = parts[0].strip()
-                    version = parts[1].strip() if len(parts) > 1 else ''
-                    description = parts[2].strip() if len(parts) > 2 else ''
-                    
-                    packages.append({
-                        'name': pkg_name,
-                        'version': version,
-                        'description': description,
-                        'installed': pkg_name in installed
-                    })
+        if interval != 0 and interval < FEED_MIN_INTERVAL:
+            return jsonify({'success': False, 'error': f'Aralık 0 veya en az {FEED_MIN_INTERVAL} saniye olmalı'}), 400
+        
+        save_settings({'feed_refresh_interval': interval})
+        start_feed_scheduler()
+        _feed_scheduler_wake.set()
         
         return jsonify({
             'success': True,
-            'packages': packages
+            'feeds': get_feed_info()
+        })
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Geçersiz aralık'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/upgradable', methods=['GET'])
+def get_upgradable():
+    """Güncellenebilir paketler (opkg list-upgradable çağrılmadan)"""
+    try:
+        state = get_package_state()
+        
+        cached = not_modified('upgradable', state['version'])
+        if cached:
+            return cached
+        
+        packages = get_upgradable_packages(state)
+        
+        return jsonify({
+            'success': True,
+            'packages': packages,
+            'count': len(packages)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/upgrade', methods=['POST'])
+def upgrade_packages():
+    """Paketleri tek opkg çağrısında güncelle (liste boşsa tümü)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        names = data.get('packages') or []
+        
+        if not isinstance(names, list):
+            return jsonify({'success': False, 'error': 'packages liste olmalı'}), 400
+        
+        upgradable = [pkg['name'] for pkg in get_upgradable_packages(get_package_state())]
+        
+        if names:
+            for name in names:
+                if not is_valid_package_name(name):
+                    return jsonify({'success': False, 'error': f'Geçersiz paket adı: {name}'}), 400
+            names = list(dict.fromkeys(names))
+        else:
+            names = upgradable
+        
+        if not names:
+            return jsonify({'success': False, 'error': 'Güncellenecek paket yok'}), 400
+        
+        job = submit_job('upgrade', [['opkg', 'upgrade'] + names], {'upgrade': names})
+        
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'job': job_to_dict(job)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/<name>/deps', methods=['GET'])
+def get_package_deps(name):
+    """Paket yüklenirse eklenecek bağımlılıklar ve toplam boyut"""
+    try:
+        state = get_package_state()
+        graph = get_dependency_graph(state)
+        
+        if graph['ids'].get(name, graph['package_count']) >= graph['package_count']:
+            return jsonify({'success': False, 'error': 'Paket bulunamadı'}), 404
+        
+        cached = not_modified('deps', state['version'], name)
+        if cached:
+            return cached
+        
+        return jsonify({
+            'success': True,
+            'preview': install_preview(state, name)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/<name>/rdeps', methods=['GET'])
+def get_package_rdeps(name):
+    """Pakete bağımlı yüklü paketler (kaldırılırsa bozulacaklar)"""
+    try:
+        state = get_package_state()
+        graph = get_dependency_graph(state)
+        
+        if graph['ids'].get(name, graph['package_count']) >= graph['package_count']:
+            return jsonify({'success': False, 'error': 'Paket bulunamadı'}), 404
+        
+        cached = not_modified('rdeps', state['version'], name)
+        if cached:
+            return cached
+        
+        return jsonify({
+            'success': True,
+            'rdeps': reverse_dependencies(state, name)
         })
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Zaman aşımı'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/packages/install', methods=['POST'])
 def install_package():
-    """Paket yükle"""
+    """Paket yükle (arka plan işi olarak)"""
     try:
         data = request.get_json()
         package_name = data.get('package', '')
@@ -515,25 +4279,22 @@ def install_package():
         if not package_name:
             return jsonify({'success': False, 'error': 'Paket adı gerekli'}), 400
         
-        result = subprocess.run(
-            ['opkg', 'install', package_name],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        if not is_valid_package_name(package_name):
+            return jsonify({'success': False, 'error': 'Geçersiz paket adı'}), 400
+        
+        job = submit_job('install', [['opkg', 'install', package_name]], {'install': [package_name]})
         
         return jsonify({
-            'success': result.returncode == 0,
-            'output': result.stdout + result.stderr
+            'success': True,
+            'job_id': job['id'],
+            'job': job_to_dict(job)
         })
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Zaman aşımı'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/packages/remove', methods=['POST'])
 def remove_package():
-    """Paket kaldır"""
+    """Paket kaldır (arka plan işi olarak)"""
     try:
         data = request.get_json()
         package_name = data.get('package', '')
@@ -541,25 +4302,138 @@ def remove_package():
         if not package_name:
             return jsonify({'success': False, 'error': 'Paket adı gerekli'}), 400
         
-        result = subprocess.run(
-            ['opkg', 'remove', package_name],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        if not is_valid_package_name(package_name):
+            return jsonify({'success': False, 'error': 'Geçersiz paket adı'}), 400
+        
+        job = submit_job('remove', [['opkg', 'remove', package_name]], {'remove': [package_name]})
         
         return jsonify({
-            'success': result.returncode == 0,
-            'output': result.stdout + result.stderr
+            'success': True,
+            'job_id': job['id'],
+            'job': job_to_dict(job)
         })
-    except subprocess.TimeoutExpired:
-        return jsonify({'success': False, 'error': 'Zaman aşımı'}), 500
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/packages/batch', methods=['POST'])
+def batch_packages():
+    """Birden çok paketi tek işte yükle/kaldır"""
+    try:
+        data = request.get_json() or {}
+        install = data.get('install', [])
+        remove = data.get('remove', [])
+        
+        if not isinstance(install, list) or not isinstance(remove, list):
+            return jsonify({'success': False, 'error': 'install ve remove liste olmalı'}), 400
+        
+        if not install and not remove:
+            return jsonify({'success': False, 'error': 'Paket listesi boş'}), 400
+        
+        if len(install) + len(remove) > BATCH_MAX_PACKAGES:
+            return jsonify({'success': False, 'error': f'En fazla {BATCH_MAX_PACKAGES} paket'}), 400
+        
+        for name in install + remove:
+            if not is_valid_package_name(name):
+                return jsonify({'success': False, 'error': f'Geçersiz paket adı: {name}'}), 400
+        
+        if set(install) & set(remove):
+            return jsonify({'success': False, 'error': 'Aynı paket hem yüklenip hem kaldırılamaz'}), 400
+        
+        # Tekrarları at, sırayı koru
+        install = list(dict.fromkeys(install))
+        remove = list(dict.fromkeys(remove))
+        
+        # opkg aynı çağrıda install ve remove yapamaz: eylem başına tek çağrı,
+        # önce kaldırma (çakışan paketler yer açsın), sonra yükleme
+        commands = []
+        if remove:
+            commands.append(['opkg', 'remove'] + remove)
+        if install:
+            commands.append(['opkg', 'install'] + install)
+        
+        job = submit_job('batch', commands, {'install': install, 'remove': remove})
+        
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'job': job_to_dict(job)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Kuyruktaki, çalışan ve biten paket işleri"""
+    try:
+        with _job_cond:
+            jobs = list(_jobs.values())
+        
+        return jsonify({
+            'success': True,
+            'jobs': [job_to_dict(job) for job in reversed(jobs)]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_api(job_id):
+    """İş durumu ve verilen sıradan (since) sonraki çıktı satırları"""
+    try:
+        job = get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+        
+        since = int(request.args.get('since', 0))
+        
+        return jsonify({
+            'success': True,
+            'job': job_to_dict(job, since)
+        })
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Geçersiz since parametresi'}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job_api(job_id):
+    """İş çıktısını Server-Sent Events ile canlı akıt"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+    
+    # Yeniden bağlanan istemci kaldığı yerden devam eder
+    try:
+        since = int(request.headers.get('Last-Event-ID') or request.args.get('since', 0))
+    except ValueError:
+        since = 0
+    
+    return Response(
+        stream_with_context(stream_job(job, since)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job_api(job_id):
+    """İşi iptal et"""
+    try:
+        job = get_job(job_id)
+        if job is None:
+            return jsonify({'success': False, 'error': 'İş bulunamadı'}), 404
+        
+        if not cancel_job(job):
+            return jsonify({'success': False, 'error': 'İş zaten tamamlandı'}), 400
+        
+        return jsonify({'success': True, 'job': job_to_dict(job)})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/files', methods=['GET'])
 def list_files():
-    """Dosya ve klasörleri listele"""
+    """Dosya ve klasörleri listele
+
+    sort=name|size|mtime|type, order=asc|desc, offset/limit: sayfalama (limit=0 = hepsi)
+    """
     try:
         path = request.args.get('path', '/opt')
         
@@ -570,39 +4444,25 @@ def list_files():
         if not os.path.exists(path):
             return jsonify({'success': False, 'error': 'Yol bulunamadı'}), 404
         
-        items = []
+        sort = request.args.get('sort', 'name')
+        if sort not in FILE_SORT_KEYS:
+            return jsonify({'success': False, 'error': f'Geçersiz sıralama: {sort}'}), 400
         
         try:
-            for item in os.listdir(path):
-                item_path = os.path.join(path, item)
-                is_dir = os.path.isdir(item_path)
-                size = 0
-                modified = ''
-                permissions = ''
-                
-                try:
-                    stat_info = os.stat(item_path)
-                    size = stat_info.st_size if not is_dir else 0
-                    modified = datetime.fromtimestamp(stat_info.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-                    permissions = oct(stat_info.st_mode)[-3:]
-                except:
-                    pass
-                
-                items.append({
-                    'name': item,
-                    'path': item_path,
-                    'is_dir': is_dir,
-                    'size': size,
-                    'modified': modified,
-                    'permissions': permissions
-                })
+            items = list_directory(path, sort, request.args.get('order') == 'desc')
         except PermissionError:
             return jsonify({'success': False, 'error': 'Erişim reddedildi'}), 403
         
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = max(request.args.get('limit', 0, type=int), 0)
+        page = items[offset:offset + limit] if limit else items[offset:]
+        
         return jsonify({
             'success': True,
             'path': path,
-            'items': sorted(items, key=lambda x: (not x['is_dir'], x['name'].lower()))
+            'items': list_payload(page, FILE_LIST_FIELDS, ('permissions',)),
+            'total': len(items),
+            'offset': offset
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1026,9 +4886,13 @@ def download_file():
 
 @app.route('/api/files/search', methods=['GET'])
 def search_files():
-    """Dosya ara"""
+    """Dosya ara (arka plandaki dosya adı indeksinden)
+
+    mode=substring|glob|regex, kind=file|dir, min_size/max_size: bayt,
+    newer/older: unix zamanı, limit: en fazla sonuç
+    """
     try:
-        query = request.args.get('query', '').lower()
+        query = request.args.get('query', '')
         search_path = request.args.get('path', '/opt')
         
         if not search_path.startswith('/opt'):
@@ -1037,45 +4901,31 @@ def search_files():
         if not query:
             return jsonify({'success': False, 'error': 'Arama sorgusu gerekli'}), 400
         
-        results = []
-        
-        for root, dirs, files in os.walk(search_path):
-            # Klasörleri kontrol et
-            for dir_name in dirs:
-                if query in dir_name.lower():
-                    full_path = os.path.join(root, dir_name)
-                    results.append({
-                        'name': dir_name,
-                        'path': full_path,
-                        'is_dir': True,
-                        'parent': root
-                    })
-            
-            # Dosyaları kontrol et
-            for file_name in files:
-                if query in file_name.lower():
-                    full_path = os.path.join(root, file_name)
-                    try:
-                        size = os.path.getsize(full_path)
-                    except:
-                        size = 0
-                    
-                    results.append({
-                        'name': file_name,
-                        'path': full_path,
-                        'is_dir': False,
-                        'size': size,
-                        'parent': root
-                    })
-            
-            # Çok fazla sonuç varsa kes
-            if len(results) > 500:
-                break
+        mode = request.args.get('mode', 'substring')
+        if mode not in ('substring', 'glob', 'regex'):
+            return jsonify({'success': False, 'error': f'Geçersiz arama modu: {mode}'}), 400
+        
+        filters = {
+            'kind': request.args.get('kind') or None,
+            'min_size': request.args.get('min_size', type=int),
+            'max_size': request.args.get('max_size', type=int),
+            'newer': request.args.get('newer', type=float),
+            'older': request.args.get('older', type=float)
+        }
+        limit = max(1, min(request.args.get('limit', 500, type=int), FILE_SEARCH_MAX_LIMIT))
+        
+        try:
+            results, count, index = search_files_indexed(query, mode, search_path.rstrip('/') or '/',
+                                                         filters, limit)
+        except re.error as e:
+            return jsonify({'success': False, 'error': f'Geçersiz regex: {e}'}), 400
         
         return jsonify({
             'success': True,
-            'results': results[:500],  # Max 500 sonuç
-            'count': len(results)
+            'results': list_payload(results, FILE_SEARCH_FIELDS, ('parent',)),
+            'count': count,
+            'indexed': index is not None,
+            'index_mode': index['mode'] if index is not None else None
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1161,54 +5011,56 @@ def get_storage_api():
     try:
         return jsonify({
             'success': True,
-            'storage': get_storage_info()
+            'storage': cached_collect('storage', get_storage_info)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/processes', methods=['GET'])
 def get_processes_api():
-    """Çalışan process listesi"""
+    """Çalışan process listesi
+
+    sort=cpu|mem|rss|pid, limit=N, user=kullanıcı, name=komutta geçen metin
+    """
     try:
-        processes = get_processes()
+        sort = request.args.get('sort', 'cpu')
+        if sort not in PROCESS_SORT_KEYS:
+            return jsonify({'success': False, 'error': f'Geçersiz sıralama: {sort}'}), 400
+        
+        processes, total = get_processes(
+            sort=sort,
+            limit=max(request.args.get('limit', 0, type=int), 0),
+            user=request.args.get('user') or None,
+            name=request.args.get('name') or None
+        )
         return jsonify({
             'success': True,
-            'processes': processes,
-            'count': len(processes)
+            'processes': list_payload(processes,
+                                      ('pid', 'ppid', 'user', 'state', 'cpu', 'mem', 'vsz', 'rss',
+                                       'threads', 'command'), ('user', 'state')),
+            'count': len(processes),
+            'total': total
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/debug/ps', methods=['GET'])
 def debug_ps():
-    """PS komutunu debug et"""
+    """İşlem toplayıcısını debug et (ps çalıştırmadan)"""
     try:
-        # ps aux dene
-        result1 = subprocess.run(['ps', 'aux'], capture_output=True, text=True, timeout=5)
-        
-        # ps -w dene
-        result2 = subprocess.run(['ps', '-w'], capture_output=True, text=True, timeout=5)
-        
-        # ps (sadece) dene
-        result3 = subprocess.run(['ps'], capture_output=True, text=True, timeout=5)
+        processes, total = get_processes(sort='pid', limit=5)
+        snapshot = _process_snapshot
         
         return jsonify({
             'success': True,
-            'ps_aux': {
-                'returncode': result1.returncode,
-                'stdout': result1.stdout[:500],  # İlk 500 karakter
-                'stderr': result1.stderr
-            },
-            'ps_w': {
-                'returncode': result2.returncode,
-                'stdout': result2.stdout[:500],
-                'stderr': result2.stderr
-            },
-            'ps': {
-                'returncode': result3.returncode,
-                'stdout': result3.stdout[:500],
-                'stderr': result3.stderr
-            }
+            'source': '/proc',
+            'clk_tck': CLK_TCK,
+            'page_size': PAGE_SIZE,
+            'process_count': total,
+            'snapshot_age': round(time.monotonic() - snapshot[0], 2) if snapshot else None,
+            'tracking': time.monotonic() - _process_demand <= PROCESS_TRACK_WINDOW,
+            'cached_cmdlines': len(_process_cmdlines),
+            'sample': processes
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1234,28 +5086,87 @@ def kill_process():
 
 @app.route('/api/logs/kernel', methods=['GET'])
 def get_kernel_log_api():
-    """Kernel log"""
+    """Kernel log (?since=imleç ile sadece yeni satırlar)"""
     try:
-        lines = int(request.args.get('lines', 50))
-        return jsonify({
-            'success': True,
-            'logs': get_kernel_log(lines)
-        })
+        lines = max(1, min(request.args.get('lines', 50, type=int), LOG_MAX_LINES))
+        return jsonify({'success': True, **get_kernel_log(lines, request.args.get('since'))})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/logs/system', methods=['GET'])
 def get_system_log_api():
-    """System log"""
+    """System log (?since=imleç ile sadece yeni satırlar)"""
     try:
-        lines = int(request.args.get('lines', 50))
-        return jsonify({
-            'success': True,
-            'logs': get_system_log(lines)
-        })
+        lines = max(1, min(request.args.get('lines', 50, type=int), LOG_MAX_LINES))
+        return jsonify({'success': True, **get_system_log(lines, request.args.get('since'))})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/logs/query', methods=['GET'])
+def query_log_api():
+    """Syslog dosyasında sunucu tarafı filtreleme
+
+    from/to: unix zamanı, severity: en düşük önem (emerg..debug; bu ve daha önemlileri),
+    facility, program, q: regex, limit: sayfa boyutu, cursor: önceki yanıttaki cursor
+    """
+    try:
+        path = next((p for p in SYSTEM_LOG_FILES if os.path.isfile(p)), None)
+        if path is None:
+            return jsonify({'success': False, 'error': 'Syslog dosyası bulunamadı'}), 404
+        
+        severity = request.args.get('severity') or None
+        if severity:
+            severity = SYSLOG_SEVERITY_ALIASES.get(severity, severity)
+            if severity not in SYSLOG_SEVERITIES:
+                return jsonify({'success': False, 'error': f'Geçersiz önem derecesi: {severity}'}), 400
+        
+        pattern = request.args.get('q') or None
+        if pattern:
+            try:
+                pattern = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                return jsonify({'success': False, 'error': f'Geçersiz regex: {e}'}), 400
+        
+        result = query_log(
+            path,
+            start=request.args.get('from', type=float),
+            end=request.args.get('to', type=float),
+            severity=severity,
+            facility=request.args.get('facility') or None,
+            program=request.args.get('program') or None,
+            pattern=pattern,
+            cursor=request.args.get('cursor') or None,
+            limit=max(1, min(request.args.get('limit', 100, type=int), LOG_QUERY_MAX_LIMIT))
+        )
+        result['count'] = len(result['logs'])
+        result['logs'] = list_payload(result['logs'], LOG_QUERY_FIELDS,
+                                      ('host', 'facility', 'severity', 'program'))
+        return jsonify({'success': True, 'source': path, **result})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/stream/logs', methods=['GET'])
+def stream_logs_api():
+    """Kernel/system log satırlarını Server-Sent Events ile canlı akıt
+
+    source: kernel (/dev/kmsg) veya system (syslog dosyası, yoksa logread -f)
+    since: /api/logs yanıtındaki imleç; yeniden bağlanırken Last-Event-ID kullanılır
+    """
+    source = request.args.get('source', 'kernel')
+    if source not in ('kernel', 'system'):
+        return jsonify({'success': False, 'error': f'Bilinmeyen kaynak: {source}'}), 400
+    
+    resolved = resolve_log_source(source)
+    if resolved is None:
+        return jsonify({'success': False, 'error': 'Log kaynağı okunamıyor'}), 404
+    
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    return Response(
+        stream_with_context(stream_logs(source, *resolved, since)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/network/restart', methods=['POST'])
 def restart_network():
     """Network'ü yeniden başlat"""
@@ -1305,30 +5216,17 @@ def get_firewall_rules():
 
 @app.route('/api/bandwidth', methods=['GET'])
 def get_bandwidth():
-    """Bandwidth kullanımı (interface bazlı)"""
+    """Bandwidth kullanımı (interface bazlı sayaçlar ve hızlar)
+
+    history=N: arayüz başına son N hız örneği [zaman, rx_rate, tx_rate]
+    """
     try:
-        interfaces = {}
-        
-        with open('/proc/net/dev', 'r') as f:
-            lines = f.readlines()[2:]  # İlk 2 satırı atla
-        
-        for line in lines:
-            if ':' in line:
-                parts = line.split(':')
-                iface = parts[0].strip()
-                stats = parts[1].split()
-                
-                if len(stats) >= 9:
-                    interfaces[iface] = {
-                        'rx_bytes': int(stats[0]),
-                        'rx_packets': int(stats[1]),
-                        'tx_bytes': int(stats[8]),
-                        'tx_packets': int(stats[9])
-                    }
+        history = min(request.args.get('history', 0, type=int), BANDWIDTH_HISTORY)
         
         return jsonify({
             'success': True,
-            'interfaces': interfaces
+            'interval': SAMPLER_INTERVAL,
+            'interfaces': get_bandwidth_info(history)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1424,4 +5322,10 @@ if __name__ == '__main__':
     print("🌐 Tarayıcıda açın ve kullanmaya başlayın!")
     print("\n" + "=" * 60 + "\n")
     
+    start_system_sampler()
+    start_history_recorder()
+    start_job_worker()
+    start_feed_scheduler()
+    start_file_indexer()
+    
     app.run(host='0.0.0.0', port=5000)